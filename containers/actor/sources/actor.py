@@ -24,7 +24,8 @@ class Actor:
             masterAddr,
             remoteLoggerAddr,
             logLevel=logging.DEBUG,
-            containerName=''):
+            containerName='',
+            taskExecutorPoolSize: int = 0):
         self.basicComponent = BasicComponent(
             ignoreSocketError=True,
             role=ComponentRole.ACTOR,
@@ -46,7 +47,8 @@ class Actor:
             basicComponent=self.basicComponent,
             isContainerMode=self.containerManager.isContainerMode,
             dockerClient=self.containerManager.dockerClient,
-            cpu=self.profiler.resources.cpu)
+            cpu=self.profiler.resources.cpu,
+            taskExecutorPoolSize=taskExecutorPoolSize)
         self.messageHandler = ActorMessageHandler(
             resourcesDiscovery=self.resourcesDiscovery,
             containerManager=self.containerManager,
@@ -175,6 +177,14 @@ def parseArg():
         default=10,
         type=int,
         help='Reference python logging level, from 0 to 50 integer to show log')
+    parser.add_argument(
+        '--taskExecutorPoolSize',
+        metavar='TaskExecutorPoolSize',
+        nargs='?',
+        default=int(os.environ.get('TASK_EXECUTOR_POOL_SIZE', 0)),
+        type=int,
+        help='Idle TaskExecutor processes kept ready when running on host, '
+             '0 to start one per placement')
 
     return parser.parse_args()
 
@@ -186,5 +196,6 @@ if __name__ == '__main__':
         masterAddr=(args.masterIP, args.masterPort),
         remoteLoggerAddr=(args.remoteLoggerIP, args.remoteLoggerPort),
         containerName=args.containerName,
-        logLevel=args.verbose)
+        logLevel=args.verbose,
+        taskExecutorPoolSize=args.taskExecutorPoolSize)
     actor_.run()
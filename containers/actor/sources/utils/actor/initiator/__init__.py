@@ -3,3 +3,4 @@ from .base import BaseInitiator
 from .complete import Initiator
 from .master import MasterInitiator
 from .taskExecutor import TaskExecutorInitiator
+from .taskExecutorPool import TaskExecutorPool
@@ -58,6 +58,7 @@ class ActorInitiator(BaseInitiator):
                 auto_remove=True,
                 image=imageName,
                 network_mode='host',
+                ipc_mode='host',
                 working_dir='/workplace',
                 volumes={
                     '/var/run/docker.sock':
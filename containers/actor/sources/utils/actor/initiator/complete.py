@@ -14,7 +14,8 @@ class Initiator(TaskExecutorInitiator, ActorInitiator, MasterInitiator):
             basicComponent: BasicComponent,
             isContainerMode: bool,
             dockerClient: DockerClient,
-            cpu: CPU):
+            cpu: CPU,
+            taskExecutorPoolSize: int = 0):
         self.basicComponent = basicComponent
         self.dockerClient = dockerClient
         TaskExecutorInitiator.__init__(
@@ -22,7 +23,8 @@ class Initiator(TaskExecutorInitiator, ActorInitiator, MasterInitiator):
             basicComponent=basicComponent,
             isContainerMode=isContainerMode,
             dockerClient=dockerClient,
-            cpu=cpu)
+            cpu=cpu,
+            taskExecutorPoolSize=taskExecutorPoolSize)
         ActorInitiator.__init__(
             self,
             basicComponent=basicComponent,
@@ -57,6 +57,7 @@ class MasterInitiator(BaseInitiator):
                 auto_remove=True,
                 image=imageName,
                 network_mode='host',
+                ipc_mode='host',
                 working_dir='/workplace',
                 volumes={
                     '/var/run/docker.sock':
@@ -7,6 +7,7 @@ from docker.client import DockerClient
 from docker.errors import APIError
 
 from .base import BaseInitiator
+from .taskExecutorPool import TaskExecutorPool
 from ...component.basic import BasicComponent
 from ...tools import camelToSnake
 from ...tools import filterIllegalCharacter
@@ -20,13 +21,19 @@ class TaskExecutorInitiator(BaseInitiator):
             basicComponent: BasicComponent,
             isContainerMode: bool,
             dockerClient: DockerClient,
-            cpu: CPU):
+            cpu: CPU,
+            taskExecutorPoolSize: int = 0):
         BaseInitiator.__init__(
             self,
             basicComponent=basicComponent,
             isContainerMode=isContainerMode,
             dockerClient=dockerClient)
         self.cpu = cpu
+        self.taskExecutorPool = None
+        if not isContainerMode and taskExecutorPoolSize > 0:
+            self.taskExecutorPool = TaskExecutorPool(
+                basicComponent=basicComponent,
+                size=taskExecutorPoolSize)
 
     def initTaskExecutor(
             self,
@@ -35,7 +42,8 @@ class TaskExecutorInitiator(BaseInitiator):
             taskName: str,
             taskToken: str,
             childTaskTokens: List[str],
-            isContainerMode: bool):
+            isContainerMode: bool,
+            fusedStages: List[Tuple[str, str, List[str]]] = None):
         baseTaskName, label = self.covertTaskName(taskName)
         actor = self.basicComponent.me
         master = self.basicComponent.master
@@ -54,6 +62,8 @@ class TaskExecutorInitiator(BaseInitiator):
                ' --totalCPUCores %d' % self.cpu.cores + \
                ' --cpuFrequency %f' % self.cpu.frequency + \
                ' --verbose %d' % self.basicComponent.debugLogger.level
+        if fusedStages:
+            args += self.fusedStagesArgs(fusedStages)
         if not isContainerMode:
             self.initTaskExecutorOnHost(args=args)
             return
@@ -70,6 +80,11 @@ class TaskExecutorInitiator(BaseInitiator):
             imageName=imageName, containerName=containerName, args=args)
 
     def initTaskExecutorOnHost(self, args: str):
+        if self.taskExecutorPool is not None \
+                and self.taskExecutorPool.assign(args=args):
+            self.basicComponent.debugLogger.debug(
+                'Init TaskExecutor from idle process:\n %s', args)
+            return
         system('cd ../../taskExecutor/sources/ &&'
                ' python taskExecutor.py %s &' % args)
         self.basicComponent.debugLogger.debug(
@@ -84,6 +99,7 @@ class TaskExecutorInitiator(BaseInitiator):
                 auto_remove=True,
                 image=imageName,
                 network_mode='host',
+                ipc_mode='host',
                 working_dir='/workplace',
                 volumes={
                     '/var/run/docker.sock':
@@ -107,6 +123,22 @@ class TaskExecutorInitiator(BaseInitiator):
             return 'None'
         return ','.join(childrenTaskTokens)
 
+    def fusedStagesArgs(
+            self, fusedStages: List[Tuple[str, str, List[str]]]) -> str:
+        # Stages are separated by '/', tokens of one stage by ','
+        fusedTaskNames = []
+        fusedTaskTokens = []
+        fusedChildrenTaskTokens = []
+        for taskName, taskToken, childTaskTokens in fusedStages:
+            baseTaskName, _ = self.covertTaskName(taskName)
+            fusedTaskNames.append(baseTaskName)
+            fusedTaskTokens.append(taskToken)
+            fusedChildrenTaskTokens.append(self.serialize(childTaskTokens))
+        return ' --fusedTaskNames %s' % '/'.join(fusedTaskNames) + \
+               ' --fusedTaskTokens %s' % '/'.join(fusedTaskTokens) + \
+               ' --fusedChildrenTaskTokens %s' % \
+               '/'.join(fusedChildrenTaskTokens)
+
     @staticmethod
     def covertTaskName(taskName: str) -> Tuple[str, str]:
         dashIndex = taskName.find('-')
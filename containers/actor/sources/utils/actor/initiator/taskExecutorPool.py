@@ -0,0 +1,59 @@
+from subprocess import PIPE
+from subprocess import Popen
+from threading import Lock
+from threading import Thread
+from typing import List
+
+from ...component.basic import BasicComponent
+
+
+class TaskExecutorPool:
+    # Keeps TaskExecutor processes that have already started Python and
+    # imported every task. Each one waits on its stdin for the arguments of
+    # a placement, and exits when the Actor closes it without any
+
+    def __init__(
+            self,
+            basicComponent: BasicComponent,
+            size: int,
+            sourcesPath: str = '../../taskExecutor/sources/'):
+        self.basicComponent = basicComponent
+        self.size = size
+        self.sourcesPath = sourcesPath
+        self.idle: List[Popen] = []
+        self.lock: Lock = Lock()
+        self.refill()
+
+    def assign(self, args: str) -> bool:
+        isAssigned = False
+        with self.lock:
+            while self.idle and not isAssigned:
+                process = self.idle.pop(0)
+                if process.poll() is not None:
+                    continue
+                try:
+                    process.stdin.write(('%s\n' % args).encode())
+                    process.stdin.close()
+                except OSError:
+                    continue
+                # Reaps the process once its TaskExecutor exits
+                Thread(target=process.wait, daemon=True).start()
+                isAssigned = True
+        Thread(target=self.refill, name='TaskExecutorPool').start()
+        return isAssigned
+
+    def refill(self):
+        with self.lock:
+            self.idle = [
+                process for process in self.idle if process.poll() is None]
+            while len(self.idle) < self.size:
+                try:
+                    process = Popen(
+                        ['python', 'taskExecutor.py', '--standby'],
+                        cwd=self.sourcesPath,
+                        stdin=PIPE)
+                except OSError as e:
+                    self.basicComponent.debugLogger.warning(
+                        'Cannot start idle TaskExecutor: %s', str(e))
+                    return
+                self.idle.append(process)
@@ -109,13 +109,17 @@ class ActorMessageHandler:
         taskName = data['taskName']
         taskToken = data['taskToken']
         childTaskTokens = data['childrenTaskTokens']
+        fusedStages = []
+        if 'fusedStages' in data:
+            fusedStages = data['fusedStages']
         self.initiator.initTaskExecutor(
             userID=userID,
             userName=userName,
             taskName=taskName,
             taskToken=taskToken,
             childTaskTokens=childTaskTokens,
-            isContainerMode=self.containerManager.isContainerMode)
+            isContainerMode=self.containerManager.isContainerMode,
+            fusedStages=fusedStages)
 
     def canInitComponent(
             self,
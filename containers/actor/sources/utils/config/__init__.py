@@ -3,3 +3,4 @@ from .configMaster import ConfigMaster
 from .configRemoteLogger import ConfigRemoteLogger
 from .configUser import ConfigUser
 from .taskExecutor import ConfigTaskExecutor
+from .transport import ConfigTransport
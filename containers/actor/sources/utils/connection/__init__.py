@@ -1,6 +1,11 @@
 from .basicMessageHandler import BasicMessageHandler
+from .bufferPool import BufferPool
+from .connectionPool import ConnectionPool
 from .handlerReturn import HandlerReturn
 from .message import MessageReceived
 from .message import MessageToSend
 from .messageReceiver import MessageReceiver
 from .messageSender import MessageSender
+from .receiveQueue import DropPolicy
+from .receiveQueue import MessagePriority
+from .receiveQueue import ReceivedMessagesQueue
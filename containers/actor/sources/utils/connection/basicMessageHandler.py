@@ -2,12 +2,17 @@ from abc import ABC
 from pprint import pformat
 from time import time
 from traceback import print_exc
+from typing import Dict
 from typing import Tuple
 
+from .codec import CodecType
+from .codec import getCodec
 from .message import MessageReceived
 from .messageReceiver import MessageReceiver
+from .receiveQueue import MessagePriority
 from ..tools.terminate import terminate
 from ..types import Address
+from ..types import Component
 from ..types import ComponentRole
 from ..types import MessageSubSubType
 from ..types import MessageSubType
@@ -38,33 +43,84 @@ class BasicMessageHandler(MessageReceiver, ABC):
         self.delays: PairsMedian[str, SequenceMedian] = PairsMedian()
         self.lastTimeTestDiff = .0
         self.testDiffInterval = 10
+        # Until when peers asked for fewer messages, by their addresses
+        self.backpressuredUntil: Dict[Address, float] = {}
 
-    def handle(self):
+    def handle(self, priority: MessagePriority = None):
         while True:
-            try:
-                message, packetSize = self.messagesReceivedQueue.get()
-                message.receivedAtLocalTimestamp = time() * 1000
-                if message.typeIs(MessageType.PROFILING,
-                                  MessageSubType.TIME_DIFFERENCE):
-                    self.handleTimeDiff(message)
-                    continue
-                elif message.typeIs(messageType=MessageType.TERMINATION):
-                    if self.role is not ComponentRole.MASTER:
-                        self.handleTermination(message)
-                        continue
-                elif message.typeIs(
-                        messageType=MessageType.RESOURCE_DISCOVERY,
-                        messageSubType=MessageSubType.PROBE,
-                        messageSubSubType=MessageSubSubType.TRY):
-                    self.handleProbeTry(message)
-                    continue
-                else:
-                    self.testTimeDiff(message)
-                self.handlePacketSize(message, packetSize)
-                self.handleMessage(message)
-            except Exception:
-                print_exc()
-                self.debugLogger.warning('Exception above has been ignored')
+            message, packetSize = self.messagesReceivedQueue.get(priority)
+            self.handleReceivedMessage(message, packetSize)
+
+    def handleReceivedMessage(
+            self,
+            message: MessageReceived,
+            packetSize: int):
+        try:
+            message.receivedAtLocalTimestamp = time() * 1000
+            if message.typeIs(MessageType.PROFILING,
+                              MessageSubType.TIME_DIFFERENCE):
+                self.handleTimeDiff(message)
+                return
+            elif message.typeIs(MessageType.PROFILING,
+                                MessageSubType.BACKPRESSURE):
+                self.handleBackpressure(message)
+                return
+            elif message.typeIs(MessageType.PROFILING,
+                                MessageSubType.SHARED_MEMORY):
+                self.handleSharedMemoryProbe(message)
+                return
+            elif message.typeIs(messageType=MessageType.TERMINATION):
+                if self.role is not ComponentRole.MASTER:
+                    self.handleTermination(message)
+                    return
+            elif message.typeIs(
+                    messageType=MessageType.RESOURCE_DISCOVERY,
+                    messageSubType=MessageSubType.PROBE,
+                    messageSubSubType=MessageSubSubType.TRY):
+                self.handleProbeTry(message)
+                return
+            else:
+                self.testTimeDiff(message)
+            self.handlePacketSize(message, packetSize)
+            self.handleMessage(message)
+        except Exception:
+            print_exc()
+            self.debugLogger.warning('Exception above has been ignored')
+
+    def handleBackpressure(self, message: MessageReceived):
+        sourceAddr = (message.source.addr[0], message.source.addr[1])
+        self.backpressuredUntil[sourceAddr] = \
+            time() + message.data['interval']
+
+    def handleSharedMemoryProbe(self, message: MessageReceived):
+        data = message.data
+        if message.typeIs(messageSubSubType=MessageSubSubType.RESULT):
+            self.sharedMemoryChannel.handleProbeResult(
+                destAddr=message.source.addr,
+                name=data['segmentName'],
+                isAttached=data['isAttached'])
+            return
+        codec = getCodec(CodecType.SHARED_MEMORY)
+        data['isAttached'] = codec.attach(
+            name=data.get('segmentName'),
+            slots=data.get('slots'),
+            slotSize=data.get('slotSize'))
+        self.sendMessage(
+            messageType=MessageType.PROFILING,
+            messageSubType=MessageSubType.SHARED_MEMORY,
+            messageSubSubType=MessageSubSubType.RESULT,
+            data=data,
+            destination=message.source,
+            ignoreSocketError=True,
+            showFailure=False)
+
+    def isBackpressured(self, destination: Component) -> bool:
+        # Whether the destination recently dropped messages from here, so
+        # senders of frames can skip or slow down
+        destAddr = (destination.addr[0], destination.addr[1])
+        if destAddr not in self.backpressuredUntil:
+            return False
+        return time() < self.backpressuredUntil[destAddr]
 
     def handleProbeTry(self, message: MessageReceived):
         data = message.data
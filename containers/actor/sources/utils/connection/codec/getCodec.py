@@ -0,0 +1,19 @@
+from typing import Dict
+
+from .base import Codec
+from .messagePackCodec import MessagePackCodec
+from .pickleCodec import PickleCodec
+from .pickleOutOfBandCodec import PickleOutOfBandCodec
+from .sharedMemoryCodec import SharedMemoryCodec
+from .type import CodecType
+
+# Codecs are stateless, one instance of each is shared
+codecs: Dict[CodecType, Codec] = {
+    CodecType.PICKLE: PickleCodec(),
+    CodecType.MESSAGE_PACK: MessagePackCodec(),
+    CodecType.PICKLE_OUT_OF_BAND: PickleOutOfBandCodec()}
+codecs[CodecType.SHARED_MEMORY] = SharedMemoryCodec(codecs=dict(codecs))
+
+
+def getCodec(codecType: CodecType) -> Codec:
+    return codecs[codecType]
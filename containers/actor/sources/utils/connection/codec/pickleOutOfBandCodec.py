@@ -0,0 +1,60 @@
+from pickle import dumps
+from pickle import loads
+from pickle import PickleBuffer
+from struct import calcsize
+from struct import pack
+from struct import unpack_from
+from typing import Any
+from typing import List
+
+from .base import Buffer
+from .base import Codec
+from .type import CodecType
+
+# Pickle length and buffer count, followed by one length per buffer
+PREFIX_FORMAT = '>LL'
+PREFIX_SIZE = calcsize(PREFIX_FORMAT)
+BUFFER_LENGTH_FORMAT = '>Q'
+BUFFER_LENGTH_SIZE = calcsize(BUFFER_LENGTH_FORMAT)
+
+
+class PickleOutOfBandCodec(Codec):
+
+    def __init__(self):
+        super().__init__(
+            codecType=CodecType.PICKLE_OUT_OF_BAND,
+            keepsBuffer=True)
+
+    def encode(self, obj: Any) -> bytes:
+        return b''.join(self.encodeBuffers(obj))
+
+    def encodeBuffers(self, obj: Any) -> List[Buffer]:
+        # Large contiguous buffers, e.g. numpy arrays, are kept out of the
+        # pickle stream and referenced instead of copied
+        pickleBuffers: List[PickleBuffer] = []
+        pickled = dumps(obj, protocol=5, buffer_callback=pickleBuffers.append)
+        views = [pickleBuffer.raw() for pickleBuffer in pickleBuffers]
+        prefix = pack(PREFIX_FORMAT, len(pickled), len(views))
+        for view in views:
+            prefix += pack(BUFFER_LENGTH_FORMAT, view.nbytes)
+        return [prefix, pickled, *views]
+
+    def decode(self, data: Buffer) -> Any:
+        view = memoryview(data)
+        if view.readonly:
+            # Arrays rebuilt from an immutable buffer would be read-only
+            view = memoryview(bytearray(view))
+        pickledSize, bufferCount = unpack_from(PREFIX_FORMAT, view)
+        offset = PREFIX_SIZE
+        bufferSizes = []
+        for _ in range(bufferCount):
+            bufferSizes.append(
+                unpack_from(BUFFER_LENGTH_FORMAT, view, offset)[0])
+            offset += BUFFER_LENGTH_SIZE
+        pickled = view[offset:offset + pickledSize]
+        offset += pickledSize
+        buffers = []
+        for bufferSize in bufferSizes:
+            buffers.append(view[offset:offset + bufferSize])
+            offset += bufferSize
+        return loads(pickled, buffers=buffers)
@@ -0,0 +1,140 @@
+from threading import Lock
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from .codec import Buffer
+from .codec import CodecType
+from .codec import getCodec
+from .codec.sharedMemoryCodec import MAX_SLOTS
+from .sharedMemoryRing import SharedMemoryRing
+from ..types import Address
+
+LOOPBACK_IPS = {'127.0.0.1', 'localhost'}
+
+
+class SharedMemoryChannel:
+    # Large frames to components on the same host are written to a shared
+    # memory ring of the destination. The socket only carries a descriptor
+    # of the slot, so the frame is not copied through the kernel. A ring is
+    # allocated with the first large frame to a destination, and is only
+    # used once the destination has confirmed that it can attach it, as
+    # components sharing an IP may not share /dev/shm
+
+    def __init__(
+            self,
+            hostIP: str,
+            probe: Callable[[Address, str, int, int], None],
+            minSize: int = 65536,
+            slots: int = 4,
+            slotSize: int = 1024 * 1024,
+            idleTimeout: float = 60):
+        self.hostIP = hostIP
+        # Asks the destination to attach the segment of the given name,
+        # slots and slot size
+        self.probe = probe
+        # 0 disables the channel
+        self.minSize = minSize
+        self.slots = slots
+        self.slotSize = slotSize
+        self.idleTimeout = idleTimeout
+        self.codec = getCodec(CodecType.SHARED_MEMORY)
+        self.isEnabled = minSize > 0 and 0 < slots <= MAX_SLOTS \
+            and slotSize > 0 and self.codec.isAvailable()
+        self.rings: Dict[Address, SharedMemoryRing] = {}
+        self.ringsByName: Dict[str, SharedMemoryRing] = {}
+        # Destinations that cannot attach rings of this component
+        self.detached: Set[Address] = set()
+        self.lock: Lock = Lock()
+
+    def isSameHost(self, destAddr: Address) -> bool:
+        # Components of one host share its IP, which is also the default
+        # hostID of a component
+        if destAddr[0] == self.hostIP:
+            return True
+        return destAddr[0] in LOOPBACK_IPS and self.hostIP in LOOPBACK_IPS
+
+    def wrap(
+            self,
+            codecType: CodecType,
+            buffers: List[Buffer],
+            destAddr: Address) -> Tuple[CodecType, List[Buffer]]:
+        # Frames that do not fit, or find the ring full, use the socket
+        if not self.isEnabled or not self.isSameHost(destAddr):
+            return codecType, buffers
+        views = [memoryview(buffer).cast('B') for buffer in buffers]
+        size = sum(view.nbytes for view in views)
+        if size < self.minSize or size > self.slotSize:
+            return codecType, buffers
+        ring = self.ringOf(destAddr)
+        if ring is None:
+            return codecType, buffers
+        written = ring.write(views, size)
+        if written is None:
+            return codecType, buffers
+        slot, offset = written
+        descriptor = self.codec.encode(
+            (codecType, size, ring.name, slot, offset))
+        return CodecType.SHARED_MEMORY, [descriptor]
+
+    def ringOf(self, destAddr: Address) -> Optional[SharedMemoryRing]:
+        destAddr = (destAddr[0], destAddr[1])
+        with self.lock:
+            self.closeIdleRings()
+            if destAddr in self.detached:
+                return None
+            if destAddr in self.rings:
+                ring = self.rings[destAddr]
+                if not ring.isAttached:
+                    return None
+                return ring
+            try:
+                ring = SharedMemoryRing(
+                    slots=self.slots, slotSize=self.slotSize)
+            except OSError:
+                # E.g. /dev/shm is full, the socket still works
+                return None
+            self.rings[destAddr] = ring
+            self.ringsByName[ring.name] = ring
+        # Frames use the socket until the destination answers
+        self.probe(destAddr, ring.name, ring.slots, ring.slotSize)
+        return None
+
+    def handleProbeResult(
+            self,
+            destAddr: Address,
+            name: str,
+            isAttached: bool):
+        destAddr = (destAddr[0], destAddr[1])
+        with self.lock:
+            if name not in self.ringsByName:
+                return
+            ring = self.ringsByName[name]
+            if isAttached:
+                ring.isAttached = True
+                return
+            self.detached.add(destAddr)
+            del self.ringsByName[name]
+            if self.rings.get(destAddr) is ring:
+                del self.rings[destAddr]
+        ring.close()
+
+    def closeIdleRings(self):
+        for destAddr, ring in list(self.rings.items()):
+            if not ring.isIdle(self.idleTimeout):
+                continue
+            del self.rings[destAddr]
+            del self.ringsByName[ring.name]
+            ring.close()
+
+    def discard(self, codecType: CodecType, buffers: List[Buffer]):
+        # Frees the slot of a frame that was never delivered
+        if codecType is not CodecType.SHARED_MEMORY:
+            return
+        _, _, name, slot, _ = self.codec.decodeDescriptor(buffers[0])
+        with self.lock:
+            if name in self.ringsByName:
+                self.ringsByName[name].free(slot)
@@ -0,0 +1,3 @@
+from .asyncioTransport import AsyncioTransport
+from .frameProtocol import FrameProtocol
+from .type import TransportType
@@ -0,0 +1,119 @@
+from asyncio import BufferedProtocol
+from asyncio import Transport
+from time import time
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from ..bufferPool import BufferPool
+from ..codec import Codec
+from ..codec import getCodec
+from ..codec import HEADER_SIZE
+from ..codec import unpackHeader
+
+
+class FrameProtocol(BufferedProtocol):
+    # Reads the same frames as MessageReceiver.receiveMessage, the event loop
+    # writes straight into the header and body buffers
+
+    def __init__(
+            self,
+            onMessage: Callable[['FrameProtocol', Any, int], None],
+            onConnectionLost: Callable[['FrameProtocol'], None],
+            bufferPool: BufferPool):
+        self.onMessage = onMessage
+        self.onConnectionLost = onConnectionLost
+        self.bufferPool = bufferPool
+        self.transport: Optional[Transport] = None
+        self.header: bytearray = bytearray(HEADER_SIZE)
+        self.buffer: Optional[bytearray] = None
+        self.isPooled: bool = False
+        self.view: memoryview = memoryview(self.header)
+        self.received: int = 0
+        self.codec: Optional[Codec] = None
+        self.dataSize: int = 0
+        self.lastActiveTime: float = time()
+
+    def connection_made(self, transport: Transport):
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self.releaseBuffer()
+        self.onConnectionLost(self)
+
+    def get_buffer(self, sizeHint: int) -> memoryview:
+        return self.view[self.received:]
+
+    def buffer_updated(self, nbytes: int):
+        self.lastActiveTime = time()
+        self.received += nbytes
+        if self.received < self.view.nbytes:
+            return
+        if self.codec is None:
+            self.expectBody()
+            return
+        self.decodeBody()
+
+    def expectHeader(self):
+        self.codec = None
+        self.dataSize = 0
+        self.view = memoryview(self.header)
+        self.received = 0
+
+    def expectBody(self):
+        try:
+            codecType, self.dataSize = unpackHeader(self.header)
+        except ValueError:
+            self.transport.close()
+            return
+        if self.dataSize == 0:
+            # The threaded receiver treats an empty frame as a closed peer
+            self.transport.close()
+            return
+        self.codec = getCodec(codecType)
+        if self.codec.keepsBuffer \
+                or self.dataSize < self.bufferPool.minBufferSize:
+            self.buffer = bytearray(self.dataSize)
+            self.isPooled = False
+        else:
+            self.buffer = self.bufferPool.acquire(self.dataSize)
+            self.isPooled = True
+        self.view = memoryview(self.buffer)[:self.dataSize]
+        self.received = 0
+
+    def decodeBody(self):
+        try:
+            result = self.codec.decodeFrame(self.view)
+            dataSize = self.codec.encodedSizeOf(self.view)
+        except ValueError:
+            result = None
+            dataSize = 0
+        self.releaseBuffer()
+        self.expectHeader()
+        if result is None:
+            self.transport.close()
+            return
+        self.onMessage(self, result, dataSize)
+
+    def releaseBuffer(self):
+        if self.buffer is None:
+            return
+        if self.isPooled:
+            self.bufferPool.release(self.buffer)
+        self.buffer = None
+        self.isPooled = False
+
+    def pauseReading(self):
+        if self.transport is None or self.transport.is_closing():
+            return
+        self.transport.pause_reading()
+
+    def resumeReading(self):
+        if self.transport is None or self.transport.is_closing():
+            return
+        self.transport.resume_reading()
+
+    def close(self):
+        if self.transport is None:
+            return
+        self.transport.close()
@@ -0,0 +1,10 @@
+from enum import Enum
+from enum import unique
+
+
+@unique
+class TransportType(Enum):
+    # One thread per receiver, sender and handler
+    THREADS = 'THREADS'
+    # One event loop thread and a bounded pool of handler threads
+    ASYNCIO = 'ASYNCIO'
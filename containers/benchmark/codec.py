@@ -0,0 +1,101 @@
+import argparse
+from pickle import dumps
+from pickle import loads
+
+from common import median
+from common import printTable
+from common import saveJson
+from common import timeIt
+from common import useComponentSources
+from payloads import payloads
+
+useComponentSources()
+
+from utils.connection import MessageToSend
+from utils.connection.codec import CodecType
+from utils.connection.codec import getCodec
+from utils.types import Component
+from utils.types import ComponentRole
+from utils.types import MessageSubType
+from utils.types import MessageType
+
+
+def wrapAsMessage(data):
+    # What MessageSender actually encodes
+    source = Component(role=ComponentRole.USER, addr=('127.0.0.1', 50101))
+    destination = Component(
+        role=ComponentRole.TASK_EXECUTOR, addr=('127.0.0.1', 50201))
+    message = MessageToSend(
+        messageType=MessageType.DATA,
+        messageSubType=MessageSubType.INTERMEDIATE_DATA,
+        data=data,
+        destination=destination)
+    messageInDict = message.toDict()
+    messageInDict['source'] = source.toDict()
+    return messageInDict
+
+
+def legacyEncode(obj):
+    return dumps(obj, 0)
+
+
+def run(repeat: int, payloadNames):
+    rows = []
+    for payloadName in payloadNames:
+        messageInDict = wrapAsMessage(payloads[payloadName]())
+        coders = [('pickle-0 (legacy)', legacyEncode, loads)]
+        for codecType in CodecType:
+            if codecType is CodecType.SHARED_MEMORY:
+                # Only describes where another codec put the frame, which
+                # transport.py measures between components
+                continue
+            codec = getCodec(codecType)
+            if not codec.isAvailable():
+                continue
+            coders.append((codecType.name, codec.encode, codec.decode))
+        for coderName, encode, decode in coders:
+            encoded = encode(messageInDict)
+            encodeCost = timeIt(lambda: encode(messageInDict), repeat)
+            decodeCost = timeIt(lambda: decode(encoded), repeat)
+            rows.append({
+                'payload': payloadName,
+                'codec': coderName,
+                'bytes': len(encoded),
+                'encodeMs': round(median(encodeCost), 3),
+                'decodeMs': round(median(decodeCost), 3)})
+    return rows
+
+
+def parseArg():
+    parser = argparse.ArgumentParser(
+        description='Compare bytes on the wire and encode/decode time of '
+                    'message codecs')
+    parser.add_argument(
+        '--repeat',
+        metavar='Repeat',
+        nargs='?',
+        default=20,
+        type=int,
+        help='How many times each payload is encoded and decoded')
+    parser.add_argument(
+        '--payloads',
+        metavar='Payloads',
+        nargs='?',
+        default='FaceDetection,GameOfLife,NaiveFormula',
+        type=str,
+        help='Comma separated payload names: %s' % ','.join(payloads))
+    parser.add_argument(
+        '--json',
+        metavar='Json',
+        nargs='?',
+        default=None,
+        type=str,
+        help='/path/to/result.json')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseArg()
+    result = run(args.repeat, args.payloads.split(','))
+    printTable(result, ['payload', 'codec', 'bytes', 'encodeMs', 'decodeMs'])
+    saveJson(result, args.json)
@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+from time import perf_counter
+from typing import Callable
+from typing import Dict
+from typing import List
+
+absDir = os.path.abspath(
+    __file__[:-len(os.path.basename(__file__))])
+# Every component ships the same utils, the Master's copy is used here
+sourcesPath = os.path.abspath(os.path.join(absDir, '../master/sources'))
+
+
+def useComponentSources():
+    # utils reads .env from the working directory when imported
+    os.chdir(sourcesPath)
+    if sourcesPath not in sys.path:
+        sys.path.insert(0, sourcesPath)
+
+
+def median(values: List[float]) -> float:
+    if not len(values):
+        return .0
+    sortedValues = sorted(values)
+    return sortedValues[len(sortedValues) >> 1]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not len(values):
+        return .0
+    sortedValues = sorted(values)
+    index = int(round(percent / 100 * (len(sortedValues) - 1)))
+    return sortedValues[index]
+
+
+def timeIt(runner: Callable, repeat: int) -> List[float]:
+    # Milliseconds of each run
+    costs = []
+    for _ in range(repeat):
+        startTime = perf_counter()
+        runner()
+        costs.append((perf_counter() - startTime) * 1000)
+    return costs
+
+
+def printTable(rows: List[Dict], columns: List[str]):
+    widths = {
+        column: max([len(column)] + [len(str(row[column])) for row in rows])
+        for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(
+            str(row[column]).ljust(widths[column]) for column in columns))
+
+
+def saveJson(result, filename: str):
+    if filename is None:
+        return
+    with open(filename, 'w+') as f:
+        json.dump(result, f, indent=2)
+    print('[*] Saved to %s' % filename)
@@ -0,0 +1,53 @@
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+import numpy as np
+
+
+def videoFrame(height: int = 480, width: int = 640):
+    # Smooth gradients with noise, roughly what a camera produces
+    rows = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    columns = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    base = (rows + columns) / 2
+    frame = np.stack([base, base[::-1], base[:, ::-1]], axis=2)
+    noise = np.random.default_rng(0).integers(
+        0, 16, frame.shape, dtype=np.uint8)
+    return (frame.astype(np.uint8) + noise).astype(np.uint8)
+
+
+def faceDetection() -> Dict:
+    return {
+        'userID': '1',
+        'sensoryData': videoFrame()}
+
+
+def gameOfLife(targetHeight: int = 640) -> Dict:
+    # The first generation of GameOfLifeSerialized, which sends the whole
+    # world
+    t = targetHeight // 128 * 128
+    height = t // 4
+    width = t * 2 // 4
+    world = np.zeros((height, width, 1), np.uint8)
+    world[height // 3:height // 2, width // 4:width * 3 // 4] = 255
+    noCells = np.empty(0, dtype=np.uint32)
+    return {
+        'userID': '1',
+        'intermediateData': (1, height, width, world, noCells, noCells)}
+
+
+def naiveFormula() -> Dict:
+    return {
+        'userID': '1',
+        'intermediateData': {'a': 1, 'b': 2, 'c': 3}}
+
+
+def controlMessage() -> Dict:
+    return {'taskToken': 'f' * 64}
+
+
+payloads: Dict[str, Callable[[], Any]] = {
+    'FaceDetection': faceDetection,
+    'GameOfLife': gameOfLife,
+    'NaiveFormula': naiveFormula,
+    'Control': controlMessage}
@@ -0,0 +1,122 @@
+import argparse
+from socket import create_server
+from socket import socket
+from threading import Thread
+from time import perf_counter
+
+from common import printTable
+from common import saveJson
+from common import useComponentSources
+
+useComponentSources()
+
+from utils.connection import BufferPool
+from utils.connection import MessageReceiver
+from utils.connection.codec import CodecType
+from utils.connection.codec import getCodec
+from utils.connection.codec import HEADER_SIZE
+from utils.connection.codec import packHeader
+from utils.connection.codec import unpackHeader
+
+
+def legacyReceiveMessage(clientSocket: socket, bufferPool=None):
+    # The receive loop before recv_into, kept here as the baseline
+    buffer = b''
+    while len(buffer) < HEADER_SIZE:
+        buffer += clientSocket.recv(HEADER_SIZE - len(buffer))
+    codecType, dataSize = unpackHeader(buffer)
+    buffer = b''
+    while len(buffer) < dataSize:
+        buffer += clientSocket.recv(min(4096, dataSize - len(buffer)))
+    return getCodec(codecType).decode(buffer), dataSize
+
+
+def prepareFrame(payloadSize: int) -> bytes:
+    codec = getCodec(CodecType.PICKLE)
+    messageInBytes = codec.encode({'data': b'\x00' * payloadSize})
+    return packHeader(codec.codecType, len(messageInBytes)) + messageInBytes
+
+
+def sendFrames(clientSocket: socket, frame: bytes, count: int):
+    for _ in range(count):
+        clientSocket.sendall(frame)
+
+
+def measure(receiver, payloadSize: int, count: int, bufferPool):
+    frame = prepareFrame(payloadSize)
+    server = create_server(('127.0.0.1', 0))
+    clientSocket = socket()
+    clientSocket.connect(server.getsockname())
+    serverSideSocket, _ = server.accept()
+    serverSideSocket.settimeout(30)
+    sender = Thread(target=sendFrames, args=(clientSocket, frame, count))
+    startTime = perf_counter()
+    sender.start()
+    receivedSize = 0
+    for _ in range(count):
+        _, dataSize = receiver(serverSideSocket, bufferPool)
+        receivedSize += dataSize
+    cost = perf_counter() - startTime
+    sender.join()
+    clientSocket.close()
+    serverSideSocket.close()
+    server.close()
+    return {
+        'messagesPerSecond': round(count / cost, 1),
+        'MBPerSecond': round(receivedSize / cost / 1e6, 1)}
+
+
+def run(sizes, totalBytes: int):
+    rows = []
+    receivers = [
+        ('legacy', legacyReceiveMessage, None),
+        ('recv_into', MessageReceiver.receiveMessage, None),
+        ('recv_into+pool', MessageReceiver.receiveMessage, BufferPool())]
+    for payloadSize in sizes:
+        count = max(totalBytes // payloadSize, 20)
+        for receiverName, receiver, bufferPool in receivers:
+            result = measure(receiver, payloadSize, count, bufferPool)
+            rows.append({
+                'payloadBytes': payloadSize,
+                'receiver': receiverName,
+                'messages': count,
+                **result})
+    return rows
+
+
+def parseArg():
+    parser = argparse.ArgumentParser(
+        description='Receive throughput of MessageReceiver over loopback TCP')
+    parser.add_argument(
+        '--sizes',
+        metavar='Sizes',
+        nargs='?',
+        default='1024,102400,5242880',
+        type=str,
+        help='Comma separated payload sizes in bytes')
+    parser.add_argument(
+        '--totalBytes',
+        metavar='TotalBytes',
+        nargs='?',
+        default=200 * 1024 * 1024,
+        type=int,
+        help='Roughly how many bytes to receive for each payload size')
+    parser.add_argument(
+        '--json',
+        metavar='Json',
+        nargs='?',
+        default=None,
+        type=str,
+        help='/path/to/result.json')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseArg()
+    sizes_ = [int(size) for size in args.sizes.split(',')]
+    result = run(sizes_, args.totalBytes)
+    printTable(
+        result,
+        ['payloadBytes', 'receiver', 'messages', 'messagesPerSecond',
+         'MBPerSecond'])
+    saveJson(result, args.json)
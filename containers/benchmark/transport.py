@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+from threading import Event
+from threading import Lock
+from threading import Thread
+from time import perf_counter
+from time import sleep
+from time import time
+
+import psutil
+
+from common import percentile
+from common import printTable
+from common import saveJson
+from common import useComponentSources
+from payloads import payloads
+
+useComponentSources()
+
+from utils.config import ConfigTransport
+from utils.connection import BasicMessageHandler
+from utils.connection import DropPolicy
+from utils.connection import MessageReceived
+from utils.types import Component
+from utils.types import ComponentRole
+from utils.types import MessageSubType
+from utils.types import MessageType
+
+columns = [
+    'transport', 'payload', 'senders', 'messages', 'received', 'dropped',
+    'seconds', 'msgsPerSecond', 'MBPerSecond', 'p50Ms', 'p95Ms', 'p99Ms',
+    'cpuPercent', 'threads', 'maxRssMB']
+
+
+class BenchmarkHandler(BasicMessageHandler):
+
+    def __init__(self, expected: int):
+        BasicMessageHandler.__init__(
+            self,
+            role=ComponentRole.USER,
+            addr=('127.0.0.1', 0),
+            logLevel=40,
+            portRange=(50101, 60000),
+            ignoreSocketError=True)
+        self.serveEvent.wait()
+        self.expected = expected
+        self.latencies = []
+        self.receivedBytes = 0
+        self.lastReceivedTime = .0
+        self.statsLock = Lock()
+        self.receivedAll = Event()
+
+    def handleReceivedMessage(
+            self,
+            message: MessageReceived,
+            packetSize: int):
+        with self.statsLock:
+            self.receivedBytes += packetSize
+        BasicMessageHandler.handleReceivedMessage(self, message, packetSize)
+
+    def handleMessage(self, message: MessageReceived):
+        # Both ends share the clock of this host
+        latency = time() * 1000 - message.sentAtSourceTimestamp
+        with self.statsLock:
+            self.latencies.append(latency)
+            self.lastReceivedTime = perf_counter()
+            if len(self.latencies) == self.expected:
+                self.receivedAll.set()
+
+
+def messageTypesOf(payloadName: str):
+    if payloadName == 'Control':
+        return MessageType.EXPERIMENTAL, MessageSubType.EXPERIMENTAL
+    return MessageType.DATA, MessageSubType.INTERMEDIATE_DATA
+
+
+def sendAll(
+        sender: BenchmarkHandler,
+        destination: Component,
+        payloadName: str,
+        data,
+        count: int,
+        rate: float):
+    messageType, messageSubType = messageTypesOf(payloadName)
+    interval = 1 / rate if rate > 0 else 0
+    startTime = perf_counter()
+    for i in range(count):
+        if interval:
+            delay = startTime + i * interval - perf_counter()
+            if delay > 0:
+                sleep(delay)
+        sender.sendMessage(
+            messageType=messageType,
+            messageSubType=messageSubType,
+            data=data,
+            destination=destination)
+
+
+def runWorker(args) -> dict:
+    # Handler threads never exit, so each case runs in its own process
+    ConfigTransport.transportType = args.transport
+    total = args.messages * args.senders
+    receiver = BenchmarkHandler(expected=total)
+    # Measures what the transport sustains rather than how soon the
+    # receiver's data queue fills up
+    receiver.setReceiveQueuePolicy(MessageType.DATA, 1024, DropPolicy.BLOCK)
+    senders = [BenchmarkHandler(expected=0) for _ in range(args.senders)]
+    destination = Component(addr=receiver.addr)
+    data = payloads[args.payload]()
+    process = psutil.Process()
+    cpuTimes = process.cpu_times()
+    startTime = perf_counter()
+    threads = [
+        Thread(
+            target=sendAll,
+            args=(sender, destination, args.payload, data, args.messages,
+                  args.rate))
+        for sender in senders]
+    for thread in threads:
+        thread.start()
+    receiver.receivedAll.wait(args.timeout)
+    with receiver.statsLock:
+        latencies = list(receiver.latencies)
+        receivedBytes = receiver.receivedBytes
+        lastReceivedTime = receiver.lastReceivedTime
+    seconds = max(lastReceivedTime - startTime, 1e-9)
+    cpuTimesEnd = process.cpu_times()
+    cpuSeconds = cpuTimesEnd.user + cpuTimesEnd.system \
+                 - cpuTimes.user - cpuTimes.system
+    dropped = receiver.messagesReceivedQueue.droppedFrameCount
+    return {
+        'transport': args.transport,
+        'payload': args.payload,
+        'senders': args.senders,
+        'messages': total,
+        'received': len(latencies),
+        'dropped': dropped,
+        'seconds': round(seconds, 3),
+        'msgsPerSecond': round(len(latencies) / seconds, 1),
+        'MBPerSecond': round(receivedBytes / seconds / 1e6, 1),
+        'p50Ms': round(percentile(latencies, 50), 2),
+        'p95Ms': round(percentile(latencies, 95), 2),
+        'p99Ms': round(percentile(latencies, 99), 2),
+        'cpuPercent': round(cpuSeconds / seconds * 100, 1),
+        'threads': process.num_threads(),
+        'maxRssMB': round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+
+
+def runCase(args, transport: str, payloadName: str) -> dict:
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        '--worker',
+        '--transport', transport,
+        '--payload', payloadName,
+        '--messages', str(args.messages or defaultMessages[payloadName]),
+        '--senders', str(args.senders),
+        '--rate', str(args.rate),
+        '--timeout', str(args.timeout)]
+    output = subprocess.run(
+        command, stdout=subprocess.PIPE, check=True).stdout
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+defaultMessages = {
+    'Control': 5000,
+    'FaceDetection': 500,
+    'GameOfLife': 50,
+    'NaiveFormula': 5000}
+
+
+def parseArg():
+    parser = argparse.ArgumentParser(
+        description='Loopback throughput and latency of the connection '
+                    'layer between BasicMessageHandlers')
+    parser.add_argument(
+        '--transports',
+        metavar='Transports',
+        nargs='?',
+        default='THREADS,ASYNCIO',
+        type=str,
+        help='Comma separated transports, THREADS and/or ASYNCIO')
+    parser.add_argument(
+        '--payloads',
+        metavar='Payloads',
+        nargs='?',
+        default='Control,FaceDetection,GameOfLife',
+        type=str,
+        help='Comma separated names from benchmark/payloads.py')
+    parser.add_argument(
+        '--messages',
+        metavar='Messages',
+        nargs='?',
+        default=0,
+        type=int,
+        help='Messages per sender, 0 for the default of each payload')
+    parser.add_argument(
+        '--senders',
+        metavar='Senders',
+        nargs='?',
+        default=1,
+        type=int,
+        help='How many BasicMessageHandlers send to the receiver')
+    parser.add_argument(
+        '--rate',
+        metavar='Rate',
+        nargs='?',
+        default=0,
+        type=float,
+        help='Messages per second of each sender, 0 for as fast as possible')
+    parser.add_argument(
+        '--timeout',
+        metavar='Timeout',
+        nargs='?',
+        default=120,
+        type=float,
+        help='Seconds to wait for every message of one case')
+    parser.add_argument(
+        '--json',
+        metavar='Json',
+        nargs='?',
+        default=None,
+        type=str,
+        help='/path/to/result.json')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--transport', default='THREADS', help=argparse.SUPPRESS)
+    parser.add_argument('--payload', default='Control', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args_ = parseArg()
+    if args_.worker:
+        print(json.dumps(runWorker(args_)), flush=True)
+        os._exit(0)
+    result = []
+    for transport_ in args_.transports.split(','):
+        for payloadName_ in args_.payloads.split(','):
+            result.append(runCase(args_, transport_, payloadName_))
+    printTable(result, columns)
+    saveJson(result, args_.json)
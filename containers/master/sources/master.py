@@ -39,7 +39,8 @@ class Master:
             logLevel=logging.DEBUG,
             containerName: str = '',
             parsedArgs=None,
-            waitTimeout: int = 0):
+            waitTimeout: int = 0,
+            fuseColocatedTasks: bool = True):
         self.parsedArgs = parsedArgs
 
         self.basicComponent = BasicComponent(
@@ -82,7 +83,8 @@ class Master:
             scheduler=self.scheduler,
             systemPerformance=self.loggerManager.systemPerformance,
             profiler=self.profiler,
-            waitTimeout=waitTimeout)
+            waitTimeout=waitTimeout,
+            fuseColocatedTasks=fuseColocatedTasks)
         self.resourcesDiscovery = MasterResourcesDiscovery(
             registry=self.registry,
             basicComponent=self.basicComponent,
@@ -286,6 +288,14 @@ def parseArg():
         default=0,
         type=int,
         help='How many seconds does task executor wait after finishes task')
+    parser.add_argument(
+        '--fuseColocatedTasks',
+        metavar='FuseColocatedTasks',
+        nargs='?',
+        default=1,
+        type=int,
+        help='Set to 0 to run every task in its own TaskExecutor even when '
+             'a chain of tasks is placed on one host')
     parser.add_argument(
         '--containerName',
         metavar='ContainerName',
@@ -310,5 +320,6 @@ if __name__ == '__main__':
         minActors=args_.minimumActors,
         databaseType=args_.databaseType,
         parsedArgs=args_,
-        logLevel=args_.verbose)
+        logLevel=args_.verbose,
+        fuseColocatedTasks=bool(args_.fuseColocatedTasks))
     master_.run()
@@ -12,3 +12,5 @@ portRange = portRangeStr.split('-')
 
 class ConfigTaskExecutor(Config):
     portRange: Tuple[int, int] = (int(portRange[0]), int(portRange[1]) + 1)
+    # Worker processes that run the task, 0 to run it on handler threads
+    processPoolSize: int = int(environment.get('PROCESS_POOL_SIZE', 0))
@@ -0,0 +1,25 @@
+from struct import calcsize
+from struct import pack
+from struct import unpack
+from typing import Tuple
+
+from .type import CodecType
+
+FORMAT = '>L'
+HEADER_SIZE = calcsize(FORMAT)
+CODEC_SHIFT = 28
+MAX_FRAME_SIZE = (1 << CODEC_SHIFT) - 1
+
+
+def packHeader(codecType: CodecType, frameSize: int) -> bytes:
+    if frameSize > MAX_FRAME_SIZE:
+        raise ValueError(
+            'Frame of %d bytes exceeds %d bytes' % (frameSize, MAX_FRAME_SIZE))
+    return pack(FORMAT, (codecType.value << CODEC_SHIFT) | frameSize)
+
+
+def unpackHeader(header: bytes) -> Tuple[CodecType, int]:
+    value = unpack(FORMAT, header)[0]
+    codecType = CodecType(value >> CODEC_SHIFT)
+    frameSize = value & MAX_FRAME_SIZE
+    return codecType, frameSize
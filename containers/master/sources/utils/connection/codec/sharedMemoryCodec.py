@@ -0,0 +1,180 @@
+from ctypes import c_char
+from os import getpid
+from struct import calcsize
+from struct import error
+from struct import pack
+from struct import unpack_from
+from threading import Lock
+from time import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from weakref import finalize
+
+from .base import Buffer
+from .base import Codec
+from .type import CodecType
+
+try:
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    SharedMemory = None
+
+# Codec and size of the frame in the segment, the slot holding it and its
+# offset, followed by the segment name
+DESCRIPTOR_FORMAT = '>BQHQ'
+DESCRIPTOR_SIZE = calcsize(DESCRIPTOR_FORMAT)
+# Flag of each slot in the first bytes of a segment
+SLOT_FREE = 0
+SLOT_IN_USE = 1
+# The slot is an unsigned short in the descriptor
+MAX_SLOTS = 0xFFFF
+SEGMENT_NAME_PREFIX = 'fogbus_'
+
+SharedMemoryDescriptor = Tuple[CodecType, int, str, int, int]
+
+
+def segmentNameOf(pid: int, token: str) -> str:
+    return '%s%d_%s' % (SEGMENT_NAME_PREFIX, pid, token)
+
+
+def headerSizeOf(slots: int) -> int:
+    # Flags of the slots come first, the slots start at the next cache line
+    return (slots + 63) // 64 * 64
+
+
+def attachSegment(name: str) -> 'SharedMemory':
+    # The sender owns the segment, so the resource tracker of the receiver
+    # must not unlink it when the receiver exits
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        segment = SharedMemory(name=name)
+        # Unless the sender is this process, which shares the tracker
+        if not name.startswith(segmentNameOf(getpid(), '')):
+            resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+class SharedMemoryCodec(Codec):
+    # The frame on the socket only describes where in a shared memory
+    # segment the frame encoded by another codec is
+
+    def __init__(
+            self,
+            codecs: Dict[CodecType, Codec],
+            idleTimeout: float = 120):
+        super().__init__(codecType=CodecType.SHARED_MEMORY)
+        self.codecs = codecs
+        # Longer than the sender side idle timeout, after which the sender
+        # unlinks the segment
+        self.idleTimeout = idleTimeout
+        self.segments: Dict[str, List] = {}
+        # Slots and slot size of each segment negotiated with its sender,
+        # no other segment is ever attached for a descriptor
+        self.layouts: Dict[str, Tuple[int, int]] = {}
+        self.lock: Lock = Lock()
+
+    @staticmethod
+    def isAvailable() -> bool:
+        return SharedMemory is not None
+
+    def encode(self, obj: SharedMemoryDescriptor) -> bytes:
+        codecType, size, name, slot, offset = obj
+        return pack(
+            DESCRIPTOR_FORMAT, codecType.value, size, slot, offset) \
+            + name.encode()
+
+    def decode(self, data: Buffer) -> Any:
+        codecType, size, name, slot, offset = self.decodeDescriptor(data)
+        with self.lock:
+            layout = self.layouts.get(name)
+        if layout is None:
+            raise ValueError('Shared memory %s was not negotiated' % name)
+        slots, slotSize = layout
+        start = headerSizeOf(slots) + slot * slotSize
+        if slot >= slots or offset < start \
+                or offset + size > start + slotSize:
+            raise ValueError('Invalid slot of shared memory %s' % name)
+        try:
+            segment = self.segmentOf(name)
+        except OSError:
+            raise ValueError('Shared memory %s is not available' % name)
+        if offset + size > len(segment.buf):
+            raise ValueError('Invalid slot of shared memory %s' % name)
+        codec = self.codecs.get(codecType)
+        if codec is None:
+            raise ValueError('Invalid codec in shared memory %s' % name)
+        if codec.keepsBuffer:
+            # Decoded in place, e.g. arrays of out-of-band frames point
+            # into the slot, which is freed once they are all gone
+            slotBuffer = (c_char * size).from_buffer(segment.buf, offset)
+            finalize(slotBuffer, self.freeSlot, segment, slot)
+            return codec.decode(memoryview(slotBuffer).cast('B'))
+        # Copied out so that the sender can reuse the slot at once
+        buffer = bytearray(segment.buf[offset:offset + size])
+        self.freeSlot(segment, slot)
+        return codec.decode(buffer)
+
+    def attach(self, name: str, slots: int, slotSize: int) -> bool:
+        # Asked by a sender before it uses the segment. Only segments of
+        # senders of this framework that are large enough for their slots
+        # are accepted
+        if not self.isAvailable() \
+                or not isinstance(name, str) \
+                or not name.startswith(SEGMENT_NAME_PREFIX) \
+                or not isinstance(slots, int) \
+                or not isinstance(slotSize, int) \
+                or not 0 < slots <= MAX_SLOTS or slotSize <= 0:
+            return False
+        try:
+            segment = self.segmentOf(name)
+        except (OSError, ValueError):
+            return False
+        if len(segment.buf) < headerSizeOf(slots) + slots * slotSize:
+            return False
+        with self.lock:
+            self.layouts[name] = (slots, slotSize)
+        return True
+
+    @staticmethod
+    def freeSlot(segment: 'SharedMemory', slot: int):
+        segment.buf[slot] = SLOT_FREE
+
+    def encodedSizeOf(self, data: Buffer) -> int:
+        _, size, _, _, _ = self.decodeDescriptor(data)
+        return size
+
+    def segmentOf(self, name: str) -> 'SharedMemory':
+        # Segments stay attached while their senders keep using them
+        currentTime = time()
+        with self.lock:
+            for attachedName in list(self.segments.keys()):
+                segment, lastUsed = self.segments[attachedName]
+                if currentTime - lastUsed < self.idleTimeout:
+                    continue
+                try:
+                    segment.close()
+                except BufferError:
+                    # Decoded objects still point into it
+                    continue
+                del self.segments[attachedName]
+                self.layouts.pop(attachedName, None)
+            if name not in self.segments:
+                self.segments[name] = [attachSegment(name), currentTime]
+            attached = self.segments[name]
+            attached[1] = currentTime
+            return attached[0]
+
+    @staticmethod
+    def decodeDescriptor(data: Buffer) -> SharedMemoryDescriptor:
+        view = memoryview(data)
+        try:
+            codecValue, size, slot, offset = unpack_from(
+                DESCRIPTOR_FORMAT, view)
+        except error:
+            raise ValueError('Invalid shared memory descriptor')
+        name = bytes(view[DESCRIPTOR_SIZE:]).decode()
+        return CodecType(codecValue), size, name, slot, offset
@@ -0,0 +1,130 @@
+from collections import defaultdict
+from select import select
+from socket import AF_INET
+from socket import IPPROTO_TCP
+from socket import MSG_DONTWAIT
+from socket import MSG_PEEK
+from socket import SO_KEEPALIVE
+from socket import SOCK_STREAM
+from socket import socket
+from socket import SOL_SOCKET
+from socket import TCP_NODELAY
+from threading import Lock
+from threading import Thread
+from time import sleep
+from time import time
+from typing import DefaultDict
+from typing import List
+from typing import Tuple
+
+from ..types import Address
+
+
+class ConnectionPool:
+
+    def __init__(
+            self,
+            connectTimeout: float = 10,
+            idleTimeout: float = 60,
+            maxIdlePerDestination: int = 8):
+        self.connectTimeout = connectTimeout
+        self.idleTimeout = idleTimeout
+        self.maxIdlePerDestination = maxIdlePerDestination
+        self.idle: DefaultDict[
+            Address, List[Tuple[socket, float]]] = defaultdict(list)
+        self.lock: Lock = Lock()
+        Thread(
+            target=self.evictIdlePeriodically,
+            name='ConnectionPoolEviction',
+            daemon=True).start()
+
+    def acquire(self, destAddr: Address) -> Tuple[socket, bool]:
+        # Returns a connected socket and whether it was reused
+        destAddr = (destAddr[0], destAddr[1])
+        while True:
+            with self.lock:
+                connections = self.idle[destAddr]
+                if not len(connections):
+                    break
+                clientSocket, _ = connections.pop()
+            if self.isAlive(clientSocket):
+                return clientSocket, True
+            self.close(clientSocket)
+        return self.connect(destAddr), False
+
+    def release(self, destAddr: Address, clientSocket: socket):
+        destAddr = (destAddr[0], destAddr[1])
+        with self.lock:
+            connections = self.idle[destAddr]
+            if len(connections) < self.maxIdlePerDestination:
+                connections.append((clientSocket, time()))
+                return
+        self.close(clientSocket)
+
+    def discard(self, clientSocket: socket):
+        self.close(clientSocket)
+
+    def connect(self, destAddr: Address) -> socket:
+        clientSocket = socket(AF_INET, SOCK_STREAM)
+        try:
+            clientSocket.settimeout(self.connectTimeout)
+            clientSocket.setsockopt(SOL_SOCKET, SO_KEEPALIVE, 1)
+            clientSocket.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+            clientSocket.connect(destAddr)
+        except OSError:
+            clientSocket.close()
+            raise
+        return clientSocket
+
+    @staticmethod
+    def isAlive(clientSocket: socket) -> bool:
+        # The receiver never writes back, so a readable idle socket means
+        # the peer has closed or reset the connection
+        try:
+            readable, _, _ = select([clientSocket], [], [], 0)
+            if not readable:
+                return True
+            return clientSocket.recv(1, MSG_PEEK | MSG_DONTWAIT) != b''
+        except (OSError, ValueError):
+            return False
+
+    @staticmethod
+    def close(clientSocket: socket):
+        try:
+            clientSocket.close()
+        except OSError:
+            pass
+
+    def evictIdle(self):
+        expired = []
+        deadline = time() - self.idleTimeout
+        with self.lock:
+            for destAddr in list(self.idle.keys()):
+                connections = self.idle[destAddr]
+                alive = []
+                for clientSocket, lastUsed in connections:
+                    if lastUsed < deadline:
+                        expired.append(clientSocket)
+                        continue
+                    alive.append((clientSocket, lastUsed))
+                if len(alive):
+                    self.idle[destAddr] = alive
+                    continue
+                del self.idle[destAddr]
+        for clientSocket in expired:
+            self.close(clientSocket)
+
+    def evictIdlePeriodically(self):
+        while True:
+            sleep(max(self.idleTimeout / 4, 1))
+            self.evictIdle()
+
+    def closeAll(self):
+        with self.lock:
+            connections = [
+                clientSocket
+                for pooled in self.idle.values()
+                for clientSocket, _ in pooled]
+            self.idle.clear()
+        for clientSocket in connections:
+            self.close(clientSocket)
@@ -0,0 +1,73 @@
+from threading import Condition
+from threading import Thread
+from time import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from .message import MessageToSend
+
+# Destination ip and port, ignoreSocketError and showFailure
+BatchKey = Tuple[str, int, bool, bool]
+
+
+class MessageBatcher:
+    # Holds messages to the same destination for up to a window, or until
+    # there are maxMessages of them, and hands them to flush together
+
+    def __init__(
+            self,
+            flush: Callable[[List[MessageToSend], bool, bool], None],
+            window: float = 0.05,
+            maxMessages: int = 32):
+        self.flush = flush
+        self.window = window
+        self.maxMessages = maxMessages
+        self.pending: Dict[BatchKey, List[MessageToSend]] = {}
+        self.deadlines: Dict[BatchKey, float] = {}
+        self.condition: Condition = Condition()
+        Thread(
+            target=self.flushPeriodically,
+            name='MessageBatcher',
+            daemon=True).start()
+
+    def add(
+            self,
+            messageToSend: MessageToSend,
+            ignoreSocketError: bool = None,
+            showFailure: bool = True):
+        destAddr = messageToSend.destination.addr
+        key = (destAddr[0], destAddr[1], ignoreSocketError, showFailure)
+        with self.condition:
+            if key not in self.pending:
+                self.pending[key] = []
+                self.deadlines[key] = time() + self.window
+                self.condition.notify()
+            messages = self.pending[key]
+            messages.append(messageToSend)
+            if len(messages) < self.maxMessages:
+                return
+            del self.pending[key]
+            del self.deadlines[key]
+        self.flush(messages, ignoreSocketError, showFailure)
+
+    def flushPeriodically(self):
+        while True:
+            with self.condition:
+                while not len(self.deadlines):
+                    self.condition.wait()
+                currentTime = time()
+                dueKeys = [
+                    key for key, deadline in self.deadlines.items()
+                    if deadline <= currentTime]
+                if not len(dueKeys):
+                    self.condition.wait(
+                        min(self.deadlines.values()) - currentTime)
+                    continue
+                batches = []
+                for key in dueKeys:
+                    batches.append((key, self.pending.pop(key)))
+                    del self.deadlines[key]
+            for (_, _, ignoreSocketError, showFailure), messages in batches:
+                self.flush(messages, ignoreSocketError, showFailure)
@@ -1,29 +1,42 @@
 from abc import abstractmethod
 from queue import Queue
+from selectors import DefaultSelector
+from selectors import EVENT_READ
 from socket import AF_INET
 from socket import error
 from socket import SO_REUSEADDR
 from socket import SOCK_STREAM
 from socket import socket
 from socket import SOL_SOCKET
-from struct import calcsize
-from struct import unpack
 from threading import Event
+from threading import get_ident
+from threading import Lock
 from threading import Thread
+from time import time
 from traceback import print_exc
 from typing import Any
+from typing import Dict
+from typing import List
 from typing import Tuple
 
+from .bufferPool import BufferPool
+from .codec import getCodec
+from .codec import HEADER_SIZE
+from .codec import unpackHeader
 from .message import MessageReceived
-from .messageSender import FORMAT
 from .messageSender import MessageSender
+from .receiveQueue import DropPolicy
+from .receiveQueue import MessagePriority
+from .receiveQueue import ReceivedMessagesQueue
 from .request import ConnectionRequest
-from ..tools import decrypt
+from .transport import AsyncioTransport
+from .transport import TransportType
+from ..config import ConfigTransport
 from ..tools.terminate import terminate
 from ..types import Address
 from ..types import ComponentRole
-
-PAYLOAD_SIZE = calcsize(FORMAT)
+from ..types import MessageSubType
+from ..types import MessageType
 
 
 class MessageReceiver(MessageSender):
@@ -35,9 +48,11 @@ class MessageReceiver(MessageSender):
             portRange: Tuple[int, int],
             logLevel: int,
             ignoreSocketError: bool = False,
-            messagesReceivedQueue: Queue[
-                Tuple[MessageReceived, int]] = Queue(),
-            threadNumber: int = 8):
+            messagesReceivedQueue: ReceivedMessagesQueue = None,
+            threadNumber: int = 8,
+            connectionIdleTimeout: float = 300,
+            transportType: TransportType = None,
+            handlerNumber: int = 4):
         MessageSender.__init__(
             self,
             role=role,
@@ -48,27 +63,116 @@ class MessageReceiver(MessageSender):
         self.serverSocket = socket(
             AF_INET,
             SOCK_STREAM)
-        self.messagesReceivedQueue: Queue[
-            Tuple[MessageReceived, int]] = messagesReceivedQueue
+        if messagesReceivedQueue is None:
+            messagesReceivedQueue = ReceivedMessagesQueue()
+        self.messagesReceivedQueue: ReceivedMessagesQueue = \
+            messagesReceivedQueue
+        self.lastBackpressureTime: Dict[Address, float] = {}
+        self.backpressureInterval: float = 1
         self.threadsNumber: int = threadNumber
+        # Each connection is in here at most once, so it is bounded by the
+        # number of open connections
         self.requests: Queue[ConnectionRequest] = Queue()
+        self.bufferPool: BufferPool = BufferPool()
+        # Connections kept open by peers wait here between frames
+        self.selector: DefaultSelector = DefaultSelector()
+        self.selectorLock: Lock = Lock()
+        # Longer than the sender side idle timeout so that the sender closes
+        # idle connections first and never writes to a half-closed socket
+        self.connectionIdleTimeout = connectionIdleTimeout
         self.serveEvent: Event = Event()
+        if transportType is None:
+            transportType = TransportType(
+                ConfigTransport.transportType.upper())
+        self.transportType = transportType
+        # Threads handling messages with the asyncio transport
+        self.handlerNumber = handlerNumber
         self.autoListen()
         self.prepareThreadsPool()
 
     def prepareThreadsPool(self):
+        if self.transportType is TransportType.ASYNCIO:
+            self.startAsyncioTransport()
+            self.startWorkers(self.handlerNumber, self.handlerNumber)
+            return
         for i in range(self.threadsNumber):
             Thread(
                 target=self.messageReceiver,
                 name="MessageReceiver-%d" % i).start()
+        self.startWorkers(self.threadsNumber, self.threadsNumber * 2)
+        Thread(target=self.serve, name="ConnectionServer").start()
+
+    def startWorkers(self, senderNumber: int, handlerNumber: int):
+        for i in range(senderNumber):
             Thread(
                 target=self.messageSender,
                 name="MessageSender-%d" % i).start()
-            for _ in range(2):
-                Thread(
-                    target=self.handle,
-                    name="BasicMessageHandler-%d" % i).start()
-        Thread(target=self.serve, name="ConnectionServer").start()
+        for i in range(handlerNumber):
+            Thread(
+                target=self.handle,
+                name="BasicMessageHandler-%d" % i).start()
+        # Control messages get handled even when every other handler is busy
+        # with slow data messages
+        Thread(
+            target=self.handle,
+            args=(MessagePriority.CONTROL,),
+            name="ControlMessageHandler").start()
+
+    def startAsyncioTransport(self):
+        asyncioTransport = AsyncioTransport(
+            serverSocket=self.serverSocket,
+            unpack=self.unpackReceivedContent,
+            put=self.putReceivedMessage,
+            bufferPool=self.bufferPool,
+            sendIdleTimeout=self.connectionPool.idleTimeout,
+            receiveIdleTimeout=self.connectionIdleTimeout)
+        asyncioTransport.start()
+        self.drainingThreads.add(asyncioTransport.thread.ident)
+        self.asyncioTransport = asyncioTransport
+        self.serveEvent.set()
+
+    def putReceivedContent(self, content: Any, packetSize: int):
+        # Messages from either transport wait in the same queue
+        for message, size in self.unpackReceivedContent(content, packetSize):
+            self.putReceivedMessage(message, size)
+
+    def unpackReceivedContent(
+            self,
+            content: Any,
+            packetSize: int) -> List[Tuple[MessageReceived, int]]:
+        try:
+            return self.unpackMessages(content, packetSize)
+        except Exception:
+            print_exc()
+            return []
+
+    def putReceivedMessage(
+            self,
+            message: MessageReceived,
+            packetSize: int,
+            block: bool = True):
+        # Raises Full when the queue has no room for the message and block
+        # is not set
+        dropped = self.messagesReceivedQueue.put(message, packetSize, block)
+        if dropped is None:
+            return
+        self.signalBackpressure(dropped)
+        self.handleDroppedMessage(dropped)
+
+    @staticmethod
+    def unpackMessages(
+            content: Dict,
+            packetSize: int) -> List[Tuple[MessageReceived, int]]:
+        if content['type'] != MessageType.BATCH.value:
+            return [(MessageReceived.fromDict(content), packetSize)]
+        messagesInDict = content['data']['messages']
+        # Each message in the envelope is counted as an equal share of it
+        size = packetSize // max(len(messagesInDict), 1)
+        messages = []
+        for messageInDict in messagesInDict:
+            messageInDict['source'] = content['source']
+            messages.append((MessageReceived.fromDict(messageInDict), size))
+        return messages
 
     def autoListen(self):
 
@@ -82,12 +186,54 @@ class MessageReceiver(MessageSender):
             terminate()
 
     def serve(self):
-
+        self.selector.register(self.serverSocket, EVENT_READ)
         self.serveEvent.set()
+        lastIdleCheckTime = time()
         while True:
+            events = self.selector.select(timeout=1)
+            for key, _ in events:
+                if key.fileobj is self.serverSocket:
+                    self.acceptConnection()
+                    continue
+                with self.selectorLock:
+                    self.selector.unregister(key.fileobj)
+                self.requests.put(key.data)
+            if time() - lastIdleCheckTime < 1:
+                continue
+            lastIdleCheckTime = time()
+            self.closeIdleConnections()
+
+    def acceptConnection(self):
+        try:
             clientSocket, clientAddress = self.serverSocket.accept()
-            request = ConnectionRequest(clientSocket, clientAddress)
-            self.requests.put(request)
+        except OSError:
+            return
+        request = ConnectionRequest(clientSocket, clientAddress)
+        self.waitForNextMessage(request)
+
+    def waitForNextMessage(self, request: ConnectionRequest):
+        request.touch()
+        try:
+            with self.selectorLock:
+                self.selector.register(
+                    request.clientSocket, EVENT_READ, data=request)
+        except (OSError, ValueError):
+            request.close()
+
+    def closeIdleConnections(self):
+        deadline = time() - self.connectionIdleTimeout
+        idleRequests = []
+        with self.selectorLock:
+            for key in list(self.selector.get_map().values()):
+                request = key.data
+                if request is None:
+                    continue
+                if request.lastActiveTime > deadline:
+                    continue
+                self.selector.unregister(key.fileobj)
+                idleRequests.append(request)
+        for request in idleRequests:
+            request.close()
 
     def tryListeningOn(self, addr: Address, portRange: Tuple[int, int]) -> bool:
         ip, targetPort = addr[0], addr[1]
@@ -126,41 +272,121 @@ class MessageReceiver(MessageSender):
             return False
 
     def messageReceiver(self):
+        self.drainingThreads.add(get_ident())
         while True:
+            request = self.requests.get()
             try:
-                request = self.requests.get()
-                content, packetSize = self.receiveMessage(request.clientSocket)
+                content, packetSize = self.receiveMessage(
+                    request.clientSocket, self.bufferPool)
                 if packetSize == 0:
+                    request.close()
                     continue
-                message = MessageReceived.fromDict(content)
-                self.messagesReceivedQueue.put((message, packetSize))
+                # The peer may send more messages on the same connection
+                self.waitForNextMessage(request)
+                self.putReceivedContent(content, packetSize)
             except OSError:
+                request.close()
                 continue
 
+    def receiveLocalMessage(self, messageInDict: Dict):
+        # Handles a message from a component in the same process as if it
+        # has been received, without encoding it or using a socket
+        self.putReceivedContent(messageInDict, 0)
+
+    def setReceiveQueuePolicy(
+            self,
+            messageType: MessageType,
+            maxSize: int,
+            dropPolicy: DropPolicy = DropPolicy.BLOCK):
+        self.messagesReceivedQueue.setPolicy(messageType, maxSize, dropPolicy)
+
+    def setReceiveQueueFramePolicy(
+            self,
+            maxSize: int,
+            dropPolicy: DropPolicy):
+        self.messagesReceivedQueue.setFramePolicy(maxSize, dropPolicy)
+
+    def handleDroppedMessage(self, droppedMessage: MessageReceived):
+        # Overridden by components that tell others about dropped frames
+        pass
+
+    def signalBackpressure(self, droppedMessage: MessageReceived):
+        # Tells the source that its messages are being dropped, at most once
+        # per interval
+        source = droppedMessage.source
+        sourceAddr = (source.addr[0], source.addr[1])
+        currentTime = time()
+        lastTime = self.lastBackpressureTime.get(sourceAddr, .0)
+        if currentTime - lastTime < self.backpressureInterval:
+            return
+        self.lastBackpressureTime[sourceAddr] = currentTime
+        data = {
+            'messageType': droppedMessage.type.value,
+            'interval': self.backpressureInterval}
+        self.sendMessage(
+            messageType=MessageType.PROFILING,
+            messageSubType=MessageSubType.BACKPRESSURE,
+            data=data,
+            destination=source,
+            ignoreSocketError=True,
+            showFailure=False)
+
     @staticmethod
-    def receiveMessage(clientSocket: socket) -> Tuple[Any, int]:
+    def receiveMessage(
+            clientSocket: socket,
+            bufferPool: BufferPool = None) -> Tuple[Any, int]:
         result = None
-        buffer = b''
+        dataSize = 0
         try:
             clientSocket.settimeout(3)
-            while len(buffer) < PAYLOAD_SIZE:
-                buffer += clientSocket.recv(4096)
-            packedDataSize = buffer[:PAYLOAD_SIZE]
-            buffer = buffer[PAYLOAD_SIZE:]
-            dataSize = unpack(FORMAT, packedDataSize)[0]
-            while len(buffer) < dataSize:
-                buffer += clientSocket.recv(4096)
-            data = buffer[:dataSize]
-            result = data
-        except (OSError, error):
+            header = bytearray(HEADER_SIZE)
+            MessageReceiver.receiveInto(clientSocket, memoryview(header))
+            codecType, dataSize = unpackHeader(header)
+            codec = getCodec(codecType)
+            if codec.keepsBuffer or bufferPool is None \
+                    or dataSize < bufferPool.minBufferSize:
+                # Arrays decoded out-of-band keep pointing to this buffer and
+                # small messages are cheaper to allocate than to pool
+                buffer = bytearray(dataSize)
+                MessageReceiver.receiveInto(clientSocket, memoryview(buffer))
+                result = codec.decodeFrame(buffer)
+                dataSize = codec.encodedSizeOf(buffer)
+            else:
+                buffer = bufferPool.acquire(dataSize)
+                try:
+                    with memoryview(buffer)[:dataSize] as view:
+                        MessageReceiver.receiveInto(clientSocket, view)
+                        result = codec.decodeFrame(view)
+                        dataSize = codec.encodedSizeOf(view)
+                finally:
+                    bufferPool.release(buffer)
+        except (OSError, error, ValueError):
             pass
-        clientSocket.close()
         if result is None:
             return {}, 0
-        return decrypt(result), len(result)
+        return result, dataSize
+
+    @staticmethod
+    def receiveInto(clientSocket: socket, view: memoryview):
+        # Never reads past the end of view, the next frame may follow on the
+        # same connection
+        received = 0
+        while received < view.nbytes:
+            receivedSize = clientSocket.recv_into(view[received:])
+            if receivedSize == 0:
+                # Peer closed the connection
+                raise ConnectionResetError
+            received += receivedSize
 
     @abstractmethod
-    def handle(self):
+    def handle(self, priority: MessagePriority = None):
+        pass
+
+    @abstractmethod
+    def handleReceivedMessage(
+            self,
+            message: MessageReceived,
+            packetSize: int):
         pass
 
     @abstractmethod
@@ -0,0 +1,224 @@
+from asyncio import AbstractEventLoop
+from asyncio import Lock
+from asyncio import new_event_loop
+from asyncio import open_connection
+from asyncio import run_coroutine_threadsafe
+from asyncio import StreamReader
+from asyncio import StreamWriter
+from asyncio import TimeoutError
+from asyncio import wait_for
+from collections import defaultdict
+from collections import deque
+from queue import Full
+from socket import socket
+from socket import SO_KEEPALIVE
+from socket import SOL_SOCKET
+from threading import Event
+from threading import Thread
+from time import time
+from typing import Any
+from typing import Callable
+from typing import DefaultDict
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+
+from .frameProtocol import FrameProtocol
+from ..bufferPool import BufferPool
+from ..codec import Buffer
+from ..codec import CodecType
+from ..codec import packHeader
+from ...types import Address
+
+
+class AsyncioTransport:
+    # Receives and sends every frame of a component on one event loop
+    # thread, which puts received messages into the received messages queue
+    # without ever waiting for room. Messages of a type whose lane is full
+    # are held back per connection, in order, while the other messages of
+    # the connection are still queued, and the connection stops being read
+    # once too many are held back
+
+    def __init__(
+            self,
+            serverSocket: socket,
+            unpack: Callable[[Any, int], List[Tuple[Any, int]]],
+            put: Callable[[Any, int, bool], None],
+            bufferPool: BufferPool,
+            maxPendingMessages: int = 64,
+            retryInterval: float = 0.005,
+            connectTimeout: float = 10,
+            sendIdleTimeout: float = 60,
+            receiveIdleTimeout: float = 300):
+        self.serverSocket = serverSocket
+        self.unpack = unpack
+        # Raises Full when there is no room and it is not asked to block
+        self.put = put
+        self.bufferPool = bufferPool
+        # Per connection
+        self.maxPendingMessages = maxPendingMessages
+        self.retryInterval = retryInterval
+        self.connectTimeout = connectTimeout
+        self.sendIdleTimeout = sendIdleTimeout
+        self.receiveIdleTimeout = receiveIdleTimeout
+        self.loop: AbstractEventLoop = new_event_loop()
+        self.protocols: Set[FrameProtocol] = set()
+        # Held back messages of each connection, kept after it is lost
+        self.pendingMessages: Dict[
+            FrameProtocol, Deque[Tuple[Any, int]]] = {}
+        self.writers: Dict[
+            Address, Tuple[StreamReader, StreamWriter, float]] = {}
+        self.sendLocks: DefaultDict[Address, Lock] = defaultdict(Lock)
+        self.thread: Thread = Thread(target=self.run, name='AsyncioTransport')
+        self.startedEvent: Event = Event()
+
+    def start(self):
+        self.thread.start()
+        self.startedEvent.wait()
+
+    def run(self):
+        self.loop.run_until_complete(self.startServing())
+        self.loop.run_forever()
+
+    async def startServing(self):
+        await self.loop.create_server(
+            self.createProtocol, sock=self.serverSocket)
+        self.loop.call_later(1, self.closeIdleConnections)
+        self.startedEvent.set()
+
+    def createProtocol(self) -> FrameProtocol:
+        protocol = FrameProtocol(
+            onMessage=self.dispatchMessage,
+            onConnectionLost=self.protocols.discard,
+            bufferPool=self.bufferPool)
+        self.protocols.add(protocol)
+        return protocol
+
+    def dispatchMessage(
+            self,
+            protocol: FrameProtocol,
+            content: Any,
+            packetSize: int):
+        messages = self.unpack(content, packetSize)
+        if protocol not in self.pendingMessages:
+            pending = deque(messages)
+            self.putPendingMessages(pending)
+            if not len(pending):
+                return
+            self.pendingMessages[protocol] = pending
+            if len(self.pendingMessages) == 1:
+                self.loop.call_later(
+                    self.retryInterval, self.retryPendingMessages)
+        else:
+            pending = self.pendingMessages[protocol]
+            pending.extend(messages)
+            self.putPendingMessages(pending)
+        if len(pending) >= self.maxPendingMessages:
+            # The peer blocks on its send buffer until handlers catch up
+            protocol.pauseReading()
+
+    def putPendingMessages(self, pending: Deque[Tuple[Any, int]]):
+        # Messages behind one of the same type that is held back stay
+        # behind it
+        heldBack = deque()
+        fullTypes = set()
+        while len(pending):
+            message, packetSize = pending.popleft()
+            if message.type in fullTypes:
+                heldBack.append((message, packetSize))
+                continue
+            try:
+                self.put(message, packetSize, False)
+            except Full:
+                fullTypes.add(message.type)
+                heldBack.append((message, packetSize))
+        pending.extend(heldBack)
+
+    def retryPendingMessages(self):
+        for protocol, pending in list(self.pendingMessages.items()):
+            self.putPendingMessages(pending)
+            if len(pending) >= self.maxPendingMessages // 2:
+                continue
+            protocol.resumeReading()
+            if not len(pending):
+                del self.pendingMessages[protocol]
+        if not len(self.pendingMessages):
+            return
+        self.loop.call_later(self.retryInterval, self.retryPendingMessages)
+
+    def send(
+            self,
+            buffers: List[Buffer],
+            destAddr: Address,
+            codecType: CodecType):
+        # Called by the sender threads, which wait until the event loop has
+        # written the frame. Raises OSError when it could not be sent, so
+        # that retrying is left to the queue of the destination
+        future = run_coroutine_threadsafe(
+            self.sendFrame(buffers, destAddr, codecType), self.loop)
+        future.result()
+
+    async def sendFrame(
+            self,
+            buffers: List[Buffer],
+            destAddr: Address,
+            codecType: CodecType):
+        destAddr = (destAddr[0], destAddr[1])
+        frameSize = sum(memoryview(buffer).nbytes for buffer in buffers)
+        header = packHeader(codecType, frameSize)
+        async with self.sendLocks[destAddr]:
+            while True:
+                isReused = destAddr in self.writers
+                try:
+                    writer = await self.writerOf(destAddr)
+                    # write() sends at once while the socket keeps up,
+                    # writelines() would join the buffers into one copy first
+                    for buffer in [header, *buffers]:
+                        writer.write(buffer)
+                    await writer.drain()
+                    return
+                except (OSError, TimeoutError) as e:
+                    self.closeWriter(destAddr)
+                    if isReused:
+                        # The kept connection went stale, try a fresh one
+                        continue
+                    raise OSError('Cannot send to %s:%d' % destAddr) from e
+
+    async def writerOf(self, destAddr: Address) -> StreamWriter:
+        if destAddr in self.writers:
+            reader, writer, _ = self.writers[destAddr]
+            # The receiver never writes back, so EOF means it has closed
+            if not writer.is_closing() and not reader.at_eof():
+                self.writers[destAddr] = (reader, writer, time())
+                return writer
+            self.closeWriter(destAddr)
+        reader, writer = await wait_for(
+            open_connection(destAddr[0], destAddr[1]),
+            timeout=self.connectTimeout)
+        clientSocket = writer.get_extra_info('socket')
+        if clientSocket is not None:
+            clientSocket.setsockopt(SOL_SOCKET, SO_KEEPALIVE, 1)
+        self.writers[destAddr] = (reader, writer, time())
+        return writer
+
+    def closeWriter(self, destAddr: Address):
+        if destAddr not in self.writers:
+            return
+        _, writer, _ = self.writers.pop(destAddr)
+        writer.close()
+
+    def closeIdleConnections(self):
+        currentTime = time()
+        for destAddr, (_, _, lastUsed) in list(self.writers.items()):
+            if currentTime - lastUsed < self.sendIdleTimeout:
+                continue
+            if self.sendLocks[destAddr].locked():
+                continue
+            self.closeWriter(destAddr)
+        for protocol in list(self.protocols):
+            if currentTime - protocol.lastActiveTime < self.receiveIdleTimeout:
+                continue
+            protocol.close()
+        self.loop.call_later(1, self.closeIdleConnections)
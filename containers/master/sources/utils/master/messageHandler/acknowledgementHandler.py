@@ -1,3 +1,6 @@
+from time import time
+from typing import List
+
 from .tools import terminateMessage
 from .tools.waitMessage import waitMessage
 from ..registry.base import Registry
@@ -6,6 +9,7 @@ from ..registry.roles.user import User
 from ...component import BasicComponent
 from ...connection import HandlerReturn
 from ...connection import MessageReceived
+from ...types import Address
 from ...types import ComponentRole
 from ...types import MessageSubType
 from ...types import MessageType
@@ -43,6 +47,11 @@ class AcknowledgementHandler:
 
         user.lock.acquire()
         user.taskNameToExecutor[taskExecutor.task.nameLabeled] = taskExecutor
+        placedAt = user.placedAt.pop(taskExecutor.task.nameLabeled, None)
+        if placedAt is not None:
+            self.basicComponent.debugLogger.debug(
+                '%s is ready %.0f ms after placement',
+                taskExecutor.nameLogPrinting, (time() - placedAt) * 1000)
         if not len(user.taskNameToExecutor) == len(user.taskNameList):
             user.lock.release()
             return
@@ -52,19 +61,35 @@ class AcknowledgementHandler:
                 user.lock.release()
                 return
         if user.isReady:
+            if taskExecutor.task.nameLabeled in user.entryTaskNameList:
+                # An entry task is served by another TaskExecutor now
+                self.basicComponent.sendMessage(
+                    messageType=MessageType.PLACEMENT,
+                    messageSubType=MessageSubType.ENTRY_TASK_EXECUTORS,
+                    data={
+                        'entryTaskExecutors':
+                            self.entryTaskExecutorsAddrOf(user)},
+                    destination=user)
             user.lock.release()
             return
         user.isReady = True
+        # User sends its sensory data to these TaskExecutors directly
         self.basicComponent.sendMessage(
             messageType=MessageType.ACKNOWLEDGEMENT,
             messageSubType=MessageSubType.SERVICE_READY,
-            data={},
+            data={'entryTaskExecutors': self.entryTaskExecutorsAddrOf(user)},
             destination=user)
         self.basicComponent.debugLogger.debug(
             '%s is ready to run. ' % user.nameLogPrinting)
         user.lock.release()
         return
 
+    @staticmethod
+    def entryTaskExecutorsAddrOf(user: User) -> List[Address]:
+        return [
+            user.taskNameToExecutor[taskName].addr
+            for taskName in user.entryTaskNameList]
+
     def handleTaskExecutorWaiting(
             self, message: MessageReceived) -> HandlerReturn:
         source = message.source
@@ -1,3 +1,8 @@
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
 from .acknowledgementHandler import AcknowledgementHandler
 from .dataHandler import DataHandler
 from .experimentalHandler import ExperimentalHandler
@@ -19,6 +24,11 @@ from ...types import MessageSubSubType
 from ...types import MessageSubType
 from ...types import MessageType
 
+# The message type, sub type and sub sub type a handler is registered for
+DispatchKey = Tuple[
+    MessageType, Optional[MessageSubType], Optional[MessageSubSubType]]
+Handler = Callable[[MessageReceived], HandlerReturn]
+
 
 class MasterMessageHandler:
 
@@ -31,7 +41,6 @@ class MasterMessageHandler:
             resourcesDiscovery: MasterResourcesDiscovery):
         self.registry = registry
         self.basicComponent = basicComponent
-        self.basicComponent.handleMessage = self.handleMessage
         self.profiler = profiler
         self.loggerManager = loggerManager
         self.resourcesDiscovery = resourcesDiscovery
@@ -63,105 +72,75 @@ class MasterMessageHandler:
         self.scalingHandler: ScalingHandler = ScalingHandler(
             basicComponent=self.basicComponent,
             profiler=self.profiler)
+        self.handlers: Dict[DispatchKey, Handler] = self.prepareHandlers()
+        self.basicComponent.handleMessage = self.handleMessage
+
+    def prepareHandlers(self) -> Dict[DispatchKey, Handler]:
+        # None matches any sub type or sub sub type
+        return {
+            (MessageType.ACKNOWLEDGEMENT, MessageSubType.READY, None):
+                self.acknowledgementHandler.handleReady,
+            (MessageType.ACKNOWLEDGEMENT, MessageSubType.WAITING, None):
+                self.acknowledgementHandler.handleTaskExecutorWaiting,
+            (MessageType.DATA, MessageSubType.SENSORY_DATA, None):
+                self.dataHandler.handleSensoryData,
+            (MessageType.DATA, MessageSubType.FINAL_RESULT, None):
+                self.dataHandler.handleResult,
+            (MessageType.EXPERIMENTAL, MessageSubType.ACTORS_COUNT, None):
+                self.experimentalHandler.handleActorsCount,
+            (MessageType.LOG, MessageSubType.ALL_RESOURCES_PROFILES, None):
+                self.logHandler.handleProfiles,
+            (MessageType.PLACEMENT, MessageSubType.LOOKUP, None):
+                self.placementHandler.handleLookup,
+            (MessageType.PROFILING,
+             MessageSubType.DATA_RATE_TEST,
+             MessageSubSubType.RECEIVE):
+                self.profilingHandler.handleDataRateReceive,
+            (MessageType.PROFILING,
+             MessageSubType.DATA_RATE_TEST,
+             MessageSubSubType.SEND):
+                self.profilingHandler.handleDataRateSend,
+            (MessageType.PROFILING,
+             MessageSubType.DATA_RATE_TEST,
+             MessageSubSubType.RESULT):
+                self.profilingHandler.handleDataRateResult,
+            (MessageType.PROFILING,
+             MessageSubType.LATENCY_TEST,
+             MessageSubSubType.RESULT):
+                self.profilingHandler.handleLatencyResult,
+            (MessageType.REGISTRATION, MessageSubType.REGISTER, None):
+                self.registrationHandler.handleRegister,
+            (MessageType.RESOURCE_DISCOVERY,
+             MessageSubType.REQUEST_ACTORS_INFO,
+             None):
+                self.resourcesDiscoveryHandler.handleActorsAddr,
+            (MessageType.RESOURCE_DISCOVERY, MessageSubType.ACTORS_INFO, None):
+                self.resourcesDiscoveryHandler.handleActorsAddrResult,
+            (MessageType.RESOURCE_DISCOVERY, None, None):
+                self.resourcesDiscovery.handleMessage,
+            (MessageType.SCALING, MessageSubType.GET_PROFILES, None):
+                self.scalingHandler.handleGetProfiler,
+            (MessageType.SCALING, MessageSubType.PROFILES_INFO, None):
+                self.scalingHandler.handleProfilerInfo,
+            (MessageType.TERMINATION, MessageSubType.EXIT, None):
+                self.terminationHandler.handleExit}
 
     def handleMessage(self, message: MessageReceived):
-        messageToRespond = None
-        if message.typeIs(MessageType.ACKNOWLEDGEMENT):
-            messageToRespond = self.handleAcknowledgement(message)
-        elif message.typeIs(MessageType.DATA):
-            messageToRespond = self.handleData(message)
-        elif message.typeIs(MessageType.EXPERIMENTAL):
-            messageToRespond = self.handleExperimental(message)
-        elif message.typeIs(MessageType.LOG):
-            messageToRespond = self.handleLog(message)
-        elif message.typeIs(MessageType.PLACEMENT):
-            messageToRespond = self.handlePlacement(message)
-        elif message.typeIs(MessageType.PROFILING):
-            messageToRespond = self.handleProfiling(message)
-        elif message.typeIs(MessageType.REGISTRATION):
-            messageToRespond = self.handleRegistration(message)
-        elif message.typeIs(MessageType.RESOURCE_DISCOVERY):
-            messageToRespond = self.handleResourcesDiscovery(message)
-        elif message.typeIs(MessageType.SCALING):
-            messageToRespond = self.handleScaling(message)
-        elif message.typeIs(MessageType.TERMINATION):
-            messageToRespond = self.handleTermination(message)
+        handler = self.handlerOf(message)
+        if handler is None:
+            return
+        messageToRespond = handler(message)
         if messageToRespond is None:
             return
         self.basicComponent.sendMessage(messageToSend=messageToRespond)
 
-    def handleLog(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.ALL_RESOURCES_PROFILES):
-            return self.logHandler.handleProfiles(message)
-        return
-
-    def handleAcknowledgement(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.READY):
-            return self.acknowledgementHandler.handleReady(message)
-        elif message.typeIs(messageSubType=MessageSubType.WAITING):
-            return self.acknowledgementHandler.handleTaskExecutorWaiting(
-                message)
-        return
-
-    def handleData(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.SENSORY_DATA):
-            return self.dataHandler.handleSensoryData(message)
-        elif message.typeIs(messageSubType=MessageSubType.FINAL_RESULT):
-            return self.dataHandler.handleResult(message)
-        return
-
-    def handleExperimental(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.ACTORS_COUNT):
-            return self.experimentalHandler.handleActorsCount(message)
-        return
-
-    def handlePlacement(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.LOOKUP):
-            return self.placementHandler.handleLookup(message)
-        return
-
-    def handleProfiling(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(
-                messageSubType=MessageSubType.DATA_RATE_TEST,
-                messageSubSubType=MessageSubSubType.RECEIVE):
-            return self.profilingHandler.handleDataRateReceive(message)
-        elif message.typeIs(
-                messageSubType=MessageSubType.DATA_RATE_TEST,
-                messageSubSubType=MessageSubSubType.SEND):
-
-            return self.profilingHandler.handleDataRateSend(message)
-        elif message.typeIs(
-                messageSubType=MessageSubType.DATA_RATE_TEST,
-                messageSubSubType=MessageSubSubType.RESULT):
-            return self.profilingHandler.handleDataRateResult(message)
-        elif message.typeIs(
-                messageSubType=MessageSubType.LATENCY_TEST,
-                messageSubSubType=MessageSubSubType.RESULT):
-            return self.profilingHandler.handleLatencyResult(message)
-        return
-
-    def handleRegistration(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.REGISTER):
-            return self.registrationHandler.handleRegister(message)
-        return
-
-    def handleResourcesDiscovery(
-            self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.REQUEST_ACTORS_INFO):
-            return self.resourcesDiscoveryHandler.handleActorsAddr(message)
-        elif message.typeIs(messageSubType=MessageSubType.ACTORS_INFO):
-            return self.resourcesDiscoveryHandler.handleActorsAddrResult(
-                message)
-        return self.resourcesDiscovery.handleMessage(message)
-
-    def handleScaling(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.GET_PROFILES, ):
-            return self.scalingHandler.handleGetProfiler(message)
-        elif message.typeIs(messageSubType=MessageSubType.PROFILES_INFO):
-            return self.scalingHandler.handleProfilerInfo(message)
-        return
-
-    def handleTermination(self, message: MessageReceived) -> HandlerReturn:
-        if message.typeIs(messageSubType=MessageSubType.EXIT):
-            return self.terminationHandler.handleExit(message)
-        return
+    def handlerOf(self, message: MessageReceived) -> Optional[Handler]:
+        # The most specific key wins
+        keys = (
+            (message.type, message.subType, message.subSubType),
+            (message.type, message.subType, None),
+            (message.type, None, None))
+        for key in keys:
+            if key in self.handlers:
+                return self.handlers[key]
+        return None
@@ -26,13 +26,14 @@ class DataHandler:
         user: User = self.registry.registeredManager.users[userID]
         data['intermediateData'] = data['sensoryData']
         del data['sensoryData']
-        for taskName in user.application.entryTaskNameList:
-            taskExecutor = user.taskNameToExecutor[taskName]
-            self.basicComponent.sendMessage(
-                messageType=MessageType.DATA,
-                messageSubType=MessageSubType.INTERMEDIATE_DATA,
-                data=data,
-                destination=taskExecutor)
+        entryTaskExecutors = [
+            user.taskNameToExecutor[taskName]
+            for taskName in user.application.entryTaskNameList]
+        self.basicComponent.multicastMessage(
+            messageType=MessageType.DATA,
+            messageSubType=MessageSubType.INTERMEDIATE_DATA,
+            data=data,
+            destinations=entryTaskExecutors)
 
     def handleResult(self, message: MessageReceived) -> HandlerReturn:
         source = message.source
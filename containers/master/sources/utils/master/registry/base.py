@@ -9,6 +9,7 @@ from traceback import print_exc
 from typing import DefaultDict
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 from .idManager import IDManager
 from .registered import RegisteredManager
@@ -47,7 +48,8 @@ class Registry(ABC):
             scheduler: BaseScheduler,
             systemPerformance: AllSystemPerformance,
             profiler: MasterProfiler,
-            waitTimeout: int = 0):
+            waitTimeout: int = 0,
+            fuseColocatedTasks: bool = True):
         self.profiler = profiler
         self.systemPerformance = systemPerformance
         self.applicationManager = applicationManager
@@ -70,6 +72,9 @@ class Registry(ABC):
         self.requestQueue = Queue()
         self.scheduleLock = Lock()
         self.waitTimeout = waitTimeout
+        # A stopped stage ends the whole process, so fused stages must not
+        # be kept cool for other users
+        self.fuseColocatedTasks = fuseColocatedTasks and waitTimeout <= 0
 
     def registerClient(self, message: MessageReceived):
         source = message.source
@@ -241,7 +246,8 @@ class Registry(ABC):
             'name': taskExecutor.name,
             'nameLogPrinting': taskExecutor.nameLogPrinting,
             'nameConsistent': taskExecutor.nameConsistent,
-            'actorHostID': actor.hostID}
+            'actorHostID': actor.hostID,
+            'userAddr': user.addr}
         self.basicComponent.sendMessage(
             messageType=MessageType.REGISTRATION,
             messageSubType=MessageSubType.REGISTERED,
@@ -381,6 +387,7 @@ class Registry(ABC):
 
     def resourcePlace(self, user: User):
         user.lock.acquire()
+        tasksToInit = {}
         for compactedKey in user.unclaimedTasks:
             hostID, taskNameLabeled, taskToken = compactedKey
             coolTaskExecutors = self.registeredManager.coolTaskExecutors
@@ -396,14 +403,61 @@ class Registry(ABC):
                             taskToken=taskToken,
                             childrenTaskTokens=childrenTaskTokens)
                         continue
+            tasksToInit[compactedKey] = childrenTaskTokens
+        for chain in self.colocatedChains(user, tasksToInit):
+            hostID, taskNameLabeled, taskToken = chain[0]
+            fusedStages = []
+            for stageKey in chain[1:]:
+                _, stageNameLabeled, stageToken = stageKey
+                fusedStages.append(
+                    (stageNameLabeled, stageToken, tasksToInit[stageKey]))
             self.sendInitTaskExecutorMsg(
                 hostID=hostID,
                 user=user,
                 taskNameLabeled=taskNameLabeled,
                 taskToken=taskToken,
-                childrenTaskTokens=childrenTaskTokens)
+                childrenTaskTokens=tasksToInit[chain[0]],
+                fusedStages=fusedStages)
         user.lock.release()
 
+    def colocatedChains(
+            self,
+            user: User,
+            tasksToInit: Dict[Tuple[str, str, str], List[str]]) \
+            -> List[List[Tuple[str, str, str]]]:
+        # A task whose only child runs on the same host, and is the only
+        # parent of that child, hands its outputs over in the same process
+        if not self.fuseColocatedTasks:
+            return [[compactedKey] for compactedKey in tasksToInit]
+        keyOfToken = {
+            compactedKey[2]: compactedKey for compactedKey in tasksToInit}
+        tasksWithDependency = user.application.tasksWithDependency
+        fusedChildOf = {}
+        for compactedKey, childrenTaskTokens in tasksToInit.items():
+            if len(childrenTaskTokens) != 1:
+                continue
+            if childrenTaskTokens[0] not in keyOfToken:
+                continue
+            childKey = keyOfToken[childrenTaskTokens[0]]
+            if childKey[0] != compactedKey[0]:
+                continue
+            childTaskName = childKey[1]
+            if user.application.label != '':
+                childTaskName = childTaskName[:childTaskName.find('-')]
+            if len(tasksWithDependency[childTaskName].parents) != 1:
+                continue
+            fusedChildOf[compactedKey] = childKey
+        fusedChildren = set(fusedChildOf.values())
+        chains = []
+        for compactedKey in tasksToInit:
+            if compactedKey in fusedChildren:
+                continue
+            chain = [compactedKey]
+            while chain[-1] in fusedChildOf:
+                chain.append(fusedChildOf[chain[-1]])
+            chains.append(chain)
+        return chains
+
     def sendReuseTaskExecutorMsg(
             self,
             hostID: str,
@@ -434,7 +488,8 @@ class Registry(ABC):
             user: User,
             taskNameLabeled: str,
             taskToken: str,
-            childrenTaskTokens: List[str]):
+            childrenTaskTokens: List[str],
+            fusedStages: List[Tuple[str, str, List[str]]] = None):
         actor = self.registeredManager.actors[hostID]
         data = {
             'userName': user.name,
@@ -443,6 +498,9 @@ class Registry(ABC):
             'label': user.application.label,
             'userID': user.componentID,
             'childrenTaskTokens': childrenTaskTokens}
+        if fusedStages:
+            # Each stage is (taskName, taskToken, childrenTaskTokens)
+            data['fusedStages'] = fusedStages
         self.basicComponent.sendMessage(
             messageType=MessageType.PLACEMENT,
             messageSubType=MessageSubType.RUN_TASK_EXECUTOR,
@@ -1,4 +1,5 @@
 from threading import Lock
+from time import time
 from typing import Dict
 from typing import List
 from typing import Tuple
@@ -45,6 +46,8 @@ class User(Component):
             self.taskNameToExecutor: Dict[str, TaskExecutor] = {}
 
         self.unclaimedTasks: Dict[Tuple[str, str, str], List[str]] = {}
+        # When each task was placed, to time how long it takes to be ready
+        self.placedAt: Dict[str, float] = {}
         self.lock: Lock = Lock()
         self.isReady = False
 
@@ -63,6 +66,7 @@ class User(Component):
         compactedKey = (actor.hostID, taskNameLabeled, taskToken)
         self.lock.acquire()
         self.unclaimedTasks[compactedKey] = childrenTaskTokens
+        self.placedAt[taskNameLabeled] = time()
         self.lock.release()
 
     def claimTask(self, hostID: str, taskNameLabeled: str, taskToken: str) \
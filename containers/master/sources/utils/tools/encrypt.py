@@ -1,6 +1,7 @@
 from pickle import dumps
+from pickle import HIGHEST_PROTOCOL
 
 
 def encrypt(obj) -> bytes:
-    data = dumps(obj, 0)
+    data = dumps(obj, HIGHEST_PROTOCOL)
     return data
@@ -1,6 +1,11 @@
 from abc import ABC
 from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
+from ..codec import Buffer
+from ..codec import CodecType
 from ...types import Component
 from ...types import Message
 from ...types import MessageSubSubType
@@ -24,6 +29,10 @@ class MessageToSend(Message, ABC):
             messageSubSubType=messageSubSubType,
             data=data)
         self.destination = destination
+        # Set when one encoding is shared by several destinations
+        self.encoded: Optional[Tuple[CodecType, List[Buffer]]] = None
+        # Where the message goes instead when the destination is down
+        self.fallback: Optional[Component] = None
 
     @staticmethod
     def fromDict(messageInDict: Dict):
@@ -0,0 +1,12 @@
+from enum import Enum
+from enum import unique
+
+
+@unique
+class CircuitState(Enum):
+    # Messages are sent
+    CLOSED = 'Closed'
+    # The destination is considered down and nothing is sent
+    OPEN = 'Open'
+    # One message is sent to find out whether the destination is back
+    HALF_OPEN = 'HalfOpen'
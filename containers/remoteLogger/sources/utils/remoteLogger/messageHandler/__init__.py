@@ -57,6 +57,10 @@ class RemoteLoggerMessageHandler:
                 messageSubType=MessageSubType.RESPONSE_TIME):
             self.logHandler.handleResponseTime(message)
             return
+        if message.typeIs(
+                messageSubType=MessageSubType.SHED_FRAMES):
+            self.logHandler.handleShedFrames(message)
+            return
         if message.typeIs(
                 messageSubType=MessageSubType.DELAYS):
             self.logHandler.handleDelays(message)
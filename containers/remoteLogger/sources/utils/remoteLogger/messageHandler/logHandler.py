@@ -1,4 +1,5 @@
 from logging import Logger
+from typing import Dict
 
 from ..logger import LoggerManager
 from ...component import BasicComponent
@@ -22,6 +23,8 @@ class LogHandler:
         self.basicComponent = basicComponent
         self.debugLogger = debugLogger
         self.loggerManager = loggerManager
+        # Frames TaskExecutors did not run, by their names
+        self.shedFrames: Dict[str, Dict[str, int]] = {}
 
     def handleHostResources(self, message: MessageReceived) -> HandlerReturn:
         data = message.data
@@ -87,6 +90,18 @@ class LogHandler:
         self.loggerManager.mergeResponseTime(toMerge)
         return None
 
+    def handleShedFrames(self, message: MessageReceived) -> HandlerReturn:
+        data = message.data
+        sourceName = message.source.nameLogPrinting
+        self.shedFrames[sourceName] = {
+            'dropped': data['dropped'],
+            'late': data['late']}
+        self.debugLogger.debug(
+            '%s (%s) dropped %d frames after their deadlines and %d late '
+            'frames', sourceName, data['taskName'], data['dropped'],
+            data['late'])
+        return None
+
     def handleRequestProfiles(self, message: MessageReceived):
         self._handleRequestProfiles(
             self, message=message, attributeName='loggerManager')
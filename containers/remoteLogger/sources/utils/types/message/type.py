@@ -15,3 +15,5 @@ class MessageType(Enum):
     RESOURCE_DISCOVERY = 'resourceDiscovery'
     SCALING = 'scaling'
     TERMINATION = 'termination'
+    # Envelope of several messages to the same destination
+    BATCH = 'batch'
@@ -1,8 +1,11 @@
 import argparse
 import logging
+import sys
 import threading
+from typing import Dict
 from typing import List
 
+from utils import Address
 from utils import BasicComponent
 from utils import ComponentRole
 from utils import ConfigTaskExecutor
@@ -34,7 +37,9 @@ class TaskExecutor:
             totalCPUCores: int,
             cpuFreq: float,
             containerName: str = '',
-            logLevel=logging.DEBUG):
+            logLevel=logging.DEBUG,
+            localStages: Dict[Address, BasicComponent] = None,
+            processPoolSize: int = 0):
         self.basicComponent = BasicComponent(
             role=ComponentRole.TASK_EXECUTOR,
             addr=addr,
@@ -71,7 +76,9 @@ class TaskExecutor:
             containerManager=self.containerManager,
             basicComponent=self.basicComponent,
             task=self.task,
-            registrationManager=self.registrationManager)
+            registrationManager=self.registrationManager,
+            localStages=localStages,
+            processPoolSize=processPoolSize)
         periodicTasks = self.preparePeriodTasks()
         self.periodicTaskRunner = PeriodicTaskRunner(
             basicComponent=self.basicComponent,
@@ -90,6 +97,21 @@ class TaskExecutor:
             data=data,
             destination=self.basicComponent.remoteLogger)
 
+    def uploadShedFrames(self):
+        droppedCount = self.messageHandler.droppedCount
+        lateCount = self.messageHandler.frameSequencer.lateCount
+        if droppedCount == 0 and lateCount == 0:
+            return
+        data = {
+            'taskName': self.task.taskName,
+            'dropped': droppedCount,
+            'late': lateCount}
+        self.basicComponent.sendMessage(
+            messageType=MessageType.LOG,
+            messageSubType=MessageSubType.SHED_FRAMES,
+            data=data,
+            destination=self.basicComponent.remoteLogger)
+
     def run(self):
         self.register()
 
@@ -105,11 +127,12 @@ class TaskExecutor:
     def preparePeriodTasks(self) -> PeriodicTasks:
         periodicTasks = [
             (self.uploadMedianProcessTime, 30),
+            (self.uploadShedFrames, 30),
             (self.updateResources, 60)]
         return periodicTasks
 
 
-def parseArg():
+def parseArg(argv: List[str] = None):
     parser = argparse.ArgumentParser(
         description='TaskExecutor')
     parser.add_argument(
@@ -179,6 +202,37 @@ def parseArg():
         default=10,
         type=int,
         help='Reference python logging level, from 0 to 50 integer to show log')
+    parser.add_argument(
+        '--processPoolSize',
+        metavar='ProcessPoolSize',
+        nargs='?',
+        default=ConfigTaskExecutor.processPoolSize,
+        type=int,
+        help='Worker processes that run the task, 0 to run it on the '
+             'threads handling messages')
+    parser.add_argument(
+        '--fusedTaskNames',
+        metavar='FusedTaskNames',
+        nargs='?',
+        default='None',
+        type=str,
+        help='Tasks run in this process after taskName, each as the only '
+             'child of the previous one. E.g. name0/name1')
+    parser.add_argument(
+        '--fusedTaskTokens',
+        metavar='FusedTaskTokens',
+        nargs='?',
+        default='None',
+        type=str,
+        help='Task tokens of fusedTaskNames. E.g. token0/token1')
+    parser.add_argument(
+        '--fusedChildrenTaskTokens',
+        metavar='FusedChildrenTaskTokens',
+        nargs='?',
+        default='None',
+        type=str,
+        help='Children task tokens of fusedTaskNames. '
+             'E.g. token1/token2,token3')
     parser.add_argument(
         '--containerName',
         metavar='ContainerName',
@@ -186,28 +240,66 @@ def parseArg():
         default='',
         type=str,
         help='container name')
-    return parser.parse_args()
+    parser.add_argument(
+        '--standby',
+        action='store_true',
+        help='Wait for the arguments of a placement on stdin, '
+             'used by the Actor to keep idle TaskExecutors')
+    return parser.parse_args(argv)
+
+
+def splitTaskTokens(taskTokens: str) -> List[str]:
+    if taskTokens == 'None':
+        return []
+    return taskTokens.split(',')
+
+
+def runStages(args) -> List[TaskExecutor]:
+    # The first stage is taskName, the others are fused stages on the same
+    # host which get the outputs of their parents in memory
+    stages = [(args.taskName, args.taskToken, args.childrenTaskTokens)]
+    if args.fusedTaskNames != 'None':
+        stages += zip(
+            args.fusedTaskNames.split('/'),
+            args.fusedTaskTokens.split('/'),
+            [splitTaskTokens(taskTokens) for taskTokens in
+             args.fusedChildrenTaskTokens.split('/')])
+    localStages: Dict[Address, BasicComponent] = {}
+    taskExecutors = []
+    for i, (taskName, taskToken, childTaskTokens) in enumerate(stages):
+        taskExecutor = TaskExecutor(
+            # Only the first stage renames the container
+            containerName=args.containerName if i == 0 else '',
+            addr=(args.bindIP, 0),
+            masterAddr=(args.masterIP, args.masterPort),
+            remoteLoggerAddr=(args.remoteLoggerIP, args.remoteLoggerPort),
+            userID=args.userID,
+            taskName=taskName,
+            taskToken=taskToken,
+            childTaskTokens=childTaskTokens,
+            actorID=args.actorID,
+            totalCPUCores=args.totalCPUCores,
+            cpuFreq=args.cpuFrequency,
+            logLevel=args.verbose,
+            localStages=localStages,
+            processPoolSize=args.processPoolSize)
+        addr = taskExecutor.basicComponent.addr
+        localStages[addr[0], addr[1]] = taskExecutor.basicComponent
+        taskExecutors.append(taskExecutor)
+    for taskExecutor in taskExecutors:
+        threading.Thread(
+            target=taskExecutor.run,
+            name='Register-%s' % taskExecutor.task.taskName).start()
+    return taskExecutors
 
 
 if __name__ == '__main__':
-    args = parseArg()
-
-    if args.childrenTaskTokens == 'None':
-        args.childrenTaskTokens = []
-    elif isinstance(args.childrenTaskTokens, str):
-        args.childrenTaskTokens = args.childrenTaskTokens.split(',')
-
-    taskExecutor_ = TaskExecutor(
-        containerName=args.containerName,
-        addr=(args.bindIP, 0),
-        masterAddr=(args.masterIP, args.masterPort),
-        remoteLoggerAddr=(args.remoteLoggerIP, args.remoteLoggerPort),
-        userID=args.userID,
-        taskName=args.taskName,
-        taskToken=args.taskToken,
-        childTaskTokens=args.childrenTaskTokens,
-        actorID=args.actorID,
-        totalCPUCores=args.totalCPUCores,
-        cpuFreq=args.cpuFrequency,
-        logLevel=args.verbose)
-    taskExecutor_.run()
+    args_ = parseArg()
+    if args_.standby:
+        line = sys.stdin.readline()
+        if not line.strip():
+            # The Actor has exited
+            sys.exit(0)
+        args_ = parseArg(line.split())
+    args_.childrenTaskTokens = splitTaskTokens(args_.childrenTaskTokens)
+    runStages(args_)
@@ -0,0 +1,19 @@
+from dotenv import dotenv_values
+
+from .base import Config
+
+environment = dotenv_values(".env")
+
+
+class ConfigTransport(Config):
+    # THREADS or ASYNCIO, see utils/connection/transport
+    transportType: str = environment.get('TRANSPORT', 'THREADS')
+    # Frames of at least this many bytes to components on the same host go
+    # through shared memory, 0 to always use sockets
+    sharedMemoryMinSize: int = int(
+        environment.get('SHARED_MEMORY_MIN_SIZE', 65536))
+    # Each sender keeps a ring of this many slots per destination on the
+    # same host, allocated with the first large frame to it
+    sharedMemorySlots: int = int(environment.get('SHARED_MEMORY_SLOTS', 4))
+    sharedMemorySlotSize: int = int(
+        environment.get('SHARED_MEMORY_SLOT_SIZE', 1024 * 1024))
@@ -0,0 +1,49 @@
+from abc import abstractmethod
+from typing import Any
+from typing import List
+from typing import Union
+
+from .type import CodecType
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class Codec:
+
+    def __init__(self, codecType: CodecType, keepsBuffer: bool = False):
+        self.codecType = codecType
+        # Whether decoded objects may still refer to the received buffer,
+        # in which case the buffer must not be reused
+        self.keepsBuffer = keepsBuffer
+
+    @staticmethod
+    def isAvailable() -> bool:
+        return True
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        pass
+
+    def encodeBuffers(self, obj: Any) -> List[Buffer]:
+        # Codecs that can avoid copying large buffers return them separately
+        return [self.encode(obj)]
+
+    @abstractmethod
+    def decode(self, data: Buffer) -> Any:
+        pass
+
+    def decodeFrame(self, data: Buffer) -> Any:
+        # Frames come from the network, so whatever a malformed one makes
+        # the codec raise is reported as a ValueError
+        try:
+            return self.decode(data)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(
+                'Malformed %s frame: %r' % (self.codecType.name, e))
+
+    def encodedSizeOf(self, data: Buffer) -> int:
+        # Size of the encoded message carried by the frame, which is what
+        # the data rate between components is estimated with
+        return memoryview(data).nbytes
@@ -0,0 +1,75 @@
+from typing import Any
+
+from .base import Codec
+from .type import CodecType
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EXT_NUMPY_ARRAY = 1
+EXT_TUPLE = 2
+EXT_SET = 3
+
+
+class MessagePackCodec(Codec):
+
+    def __init__(self):
+        super().__init__(codecType=CodecType.MESSAGE_PACK)
+
+    @staticmethod
+    def isAvailable() -> bool:
+        return msgpack is not None
+
+    def encode(self, obj: Any) -> bytes:
+        return msgpack.packb(
+            obj,
+            default=self.encodeExtension,
+            use_bin_type=True,
+            strict_types=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(
+            data,
+            ext_hook=self.decodeExtension,
+            raw=False,
+            strict_map_key=False)
+
+    def encodeExtension(self, obj: Any):
+        # strict_types sends tuples here so that they are not turned into lists
+        if isinstance(obj, tuple):
+            return msgpack.ExtType(EXT_TUPLE, self.encode(list(obj)))
+        if isinstance(obj, (set, frozenset)):
+            return msgpack.ExtType(EXT_SET, self.encode(list(obj)))
+        if np is not None and isinstance(obj, np.ndarray):
+            array = np.ascontiguousarray(obj)
+            header = self.encode([array.dtype.str, list(array.shape)])
+            return msgpack.ExtType(
+                EXT_NUMPY_ARRAY,
+                len(header).to_bytes(4, 'big') + header + array.tobytes())
+        if np is not None and isinstance(obj, np.generic):
+            return obj.item()
+        # Subclasses of the basic types, e.g. bool, IntEnum or OrderedDict
+        for basicType in (bool, int, float, str, bytes, list, dict):
+            if isinstance(obj, basicType):
+                return basicType(obj)
+        raise TypeError('Cannot serialize %s' % type(obj))
+
+    def decodeExtension(self, code: int, data: bytes):
+        if code == EXT_TUPLE:
+            return tuple(self.decode(data))
+        if code == EXT_SET:
+            return set(self.decode(data))
+        if code == EXT_NUMPY_ARRAY:
+            headerSize = int.from_bytes(data[:4], 'big')
+            dtype, shape = self.decode(data[4:4 + headerSize])
+            # Copy into a bytearray so that the array is writable
+            buffer = bytearray(data[4 + headerSize:])
+            return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+        return msgpack.ExtType(code, data)
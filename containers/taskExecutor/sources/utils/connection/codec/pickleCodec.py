@@ -0,0 +1,18 @@
+from typing import Any
+
+from .base import Codec
+from .type import CodecType
+from ...tools import decrypt
+from ...tools import encrypt
+
+
+class PickleCodec(Codec):
+
+    def __init__(self):
+        super().__init__(codecType=CodecType.PICKLE)
+
+    def encode(self, obj: Any) -> bytes:
+        return encrypt(obj)
+
+    def decode(self, data: bytes) -> Any:
+        return decrypt(data)
@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from .getCodec import getCodec
+from .header import MAX_FRAME_SIZE
+from .header import packHeader
+from .header import unpackHeader
+from .type import CodecType
+from ..sharedMemoryRing import SharedMemoryRing
+
+MESSAGE = {
+    'type': 'data',
+    'subType': 'sensoryData',
+    'data': {
+        'sequenceNumber': 3,
+        'timeBudget': 12.5,
+        'tuple': (1, 'a'),
+        'set': {1, 2},
+        'nested': [{'b': b'bytes'}, None, True]}}
+
+MALFORMED_FRAMES = [
+    b'',
+    b'\x00' * 3,
+    b'\xff' * 40,
+    b'\x00\x00\x00\x05\x00\x00\x00\x00garbage',
+    b'\x00\x00\x00\x10\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00\xff\xff']
+
+
+class MyTestCase(unittest.TestCase):
+
+    @staticmethod
+    def availableCodecs():
+        # Shared memory frames only describe where another codec put them
+        return [
+            getCodec(codecType) for codecType in CodecType
+            if codecType is not CodecType.SHARED_MEMORY
+            and getCodec(codecType).isAvailable()]
+
+    def testRoundTrip(self):
+        for codec in self.availableCodecs():
+            encoded = b''.join(
+                bytes(buffer) for buffer in codec.encodeBuffers(MESSAGE))
+            self.assertEqual(codec.decodeFrame(encoded), MESSAGE)
+            self.assertEqual(
+                codec.decodeFrame(bytearray(encoded)), MESSAGE)
+
+    def testRoundTripArray(self):
+        frame = np.arange(480 * 640 * 3, dtype=np.uint8).reshape(480, 640, 3)
+        for codec in self.availableCodecs():
+            encoded = bytearray(b''.join(
+                bytes(buffer)
+                for buffer in codec.encodeBuffers({'frame': frame})))
+            decoded = codec.decodeFrame(encoded)['frame']
+            self.assertTrue(np.array_equal(decoded, frame))
+            self.assertTrue(decoded.flags.writeable)
+
+    def testMalformedFrame(self):
+        for codec in self.availableCodecs():
+            for frame in MALFORMED_FRAMES:
+                try:
+                    result = codec.decodeFrame(frame)
+                except ValueError:
+                    continue
+                # PICKLE reports a malformed frame as None
+                self.assertIsNone(result)
+
+    def testHeader(self):
+        for codecType in CodecType:
+            header = packHeader(codecType, 1234)
+            self.assertEqual(unpackHeader(header), (codecType, 1234))
+        self.assertRaises(
+            ValueError, packHeader, CodecType.PICKLE, MAX_FRAME_SIZE + 1)
+
+    def testSharedMemory(self):
+        codec = getCodec(CodecType.SHARED_MEMORY)
+        if not codec.isAvailable():
+            self.skipTest('No shared memory')
+        innerCodec = getCodec(CodecType.PICKLE_OUT_OF_BAND)
+        encoded = b''.join(
+            bytes(buffer) for buffer in innerCodec.encodeBuffers(MESSAGE))
+        ring = SharedMemoryRing(slots=100, slotSize=1024)
+        try:
+            slot, offset = ring.write([memoryview(encoded)], len(encoded))
+            descriptor = codec.encode((
+                CodecType.PICKLE_OUT_OF_BAND, len(encoded),
+                ring.name, slot, offset))
+            # Segments are only read once they have been negotiated
+            self.assertRaises(ValueError, codec.decodeFrame, descriptor)
+            self.assertFalse(codec.attach(
+                name='other', slots=100, slotSize=1024))
+            self.assertFalse(codec.attach(
+                name=ring.name, slots=100, slotSize=1 << 20))
+            self.assertTrue(codec.attach(
+                name=ring.name, slots=100, slotSize=1024))
+            self.assertEqual(codec.decodeFrame(descriptor), MESSAGE)
+            invalidDescriptors = [
+                (CodecType.PICKLE, 10, ring.name, 100, offset),
+                (CodecType.PICKLE, 2000, ring.name, slot, offset),
+                (CodecType.PICKLE, 10, ring.name, slot, 5),
+                (CodecType.SHARED_MEMORY, 10, ring.name, slot, offset)]
+            for invalidDescriptor in invalidDescriptors:
+                self.assertRaises(
+                    ValueError,
+                    codec.decodeFrame,
+                    codec.encode(invalidDescriptor))
+        finally:
+            ring.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
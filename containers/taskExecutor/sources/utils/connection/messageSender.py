@@ -1,19 +1,33 @@
-import struct
 from pprint import pformat
 from queue import Queue
-from socket import AF_INET
-from socket import SOCK_STREAM
 from socket import socket
+from threading import get_ident
+from threading import Lock
+from threading import Timer
 from time import sleep
 from time import time
 from traceback import print_exc as printExc
 from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
 from typing import Tuple
 
+from .codec import Buffer
+from .codec import Codec
+from .codec import CodecType
+from .codec import getCodec
+from .codec import packHeader
+from .connectionPool import ConnectionPool
 from .message import MessageToSend
+from .messageBatcher import MessageBatcher
+from .sendQueue import CircuitState
+from .sendQueue import DestinationQueue
+from .sendQueue import MessageToSendItem
+from .sharedMemoryChannel import SharedMemoryChannel
+from .transport import AsyncioTransport
+from ..config import ConfigTransport
 from ..debugLogPrinter import DebugLogPrinter
-from ..tools import encrypt
-from ..tools import terminate
 from ..types import Address
 from ..types import Component
 from ..types import ComponentRole
@@ -21,7 +35,8 @@ from ..types import MessageSubSubType
 from ..types import MessageSubType
 from ..types import MessageType
 
-FORMAT = '>L'
+# Upper bound of buffers per sendmsg call on common platforms
+IOV_MAX = 1024
 
 
 class MessageSender(Component, DebugLogPrinter):
@@ -31,44 +46,140 @@ class MessageSender(Component, DebugLogPrinter):
             role: ComponentRole,
             addr: Address,
             logLevel: int,
-            ignoreSocketError: bool = False):
+            ignoreSocketError: bool = False,
+            connectionIdleTimeout: float = 60,
+            codecType: CodecType = CodecType.PICKLE,
+            batchWindow: float = 0.05,
+            batchMaxMessages: int = 32,
+            sendRetries: int = 2):
         DebugLogPrinter.__init__(self, logLevel)
         Component.__init__(self, role=role, addr=addr)
-        self.messagesToSendQueue: Queue[
-            Tuple[MessageToSend, bool, bool]] = Queue()
+        self.destinationQueues: Dict[Address, DestinationQueue] = {}
+        self.destinationQueuesLock: Lock = Lock()
+        # Destination queues with messages wait here for a sender thread
+        self.readyDestinationQueues: Queue[DestinationQueue] = Queue()
+        # Threads that send queued messages or receive them, which never
+        # wait for room in a destination queue
+        self.drainingThreads: Set[int] = set()
         self.ignoreSocketError = ignoreSocketError
+        # Quick retries of one message before it counts as a failure of
+        # the destination
+        self.sendRetries = sendRetries
+        self.connectionPool = ConnectionPool(idleTimeout=connectionIdleTimeout)
+        # Set by MessageReceiver when the asyncio transport is used
+        self.asyncioTransport: Optional[AsyncioTransport] = None
+        self.codec: Codec = getCodec(CodecType.PICKLE)
+        self.codecsByMessageType: Dict[MessageType, Codec] = {}
+        self.setCodec(codecType)
+        # Frames in data messages are sent without being copied into the
+        # pickle stream
+        self.setCodec(CodecType.PICKLE_OUT_OF_BAND, MessageType.DATA)
+        # Small periodic messages to the same destination share one frame.
+        # Profiling messages are not batched as they measure delays
+        self.batchedMessageTypes: Set[MessageType] = {MessageType.LOG}
+        self.messageBatcher = MessageBatcher(
+            flush=self.sendBatch,
+            window=batchWindow,
+            maxMessages=batchMaxMessages)
+        self.sharedMemoryChannel = SharedMemoryChannel(
+            hostIP=addr[0],
+            probe=self.probeSharedMemory,
+            minSize=ConfigTransport.sharedMemoryMinSize,
+            slots=ConfigTransport.sharedMemorySlots,
+            slotSize=ConfigTransport.sharedMemorySlotSize)
+
+    def setCodec(
+            self,
+            codecType: CodecType,
+            messageType: MessageType = None):
+        # Receivers read the codec from the frame header, so each component
+        # or message type may use a different one
+        codec = getCodec(codecType)
+        if not codec.isAvailable():
+            self.debugLogger.warning(
+                'Codec %s is not available, keep using %s',
+                codecType.name, self.codecOf(messageType).codecType.name)
+            return
+        if messageType is None:
+            self.codec = codec
+            return
+        self.codecsByMessageType[messageType] = codec
+
+    def codecOf(self, messageType: MessageType = None) -> Codec:
+        if messageType in self.codecsByMessageType:
+            return self.codecsByMessageType[messageType]
+        return self.codec
 
     def sendBytes(
             self,
             messageInBytes: bytes,
             destAddr: Address,
-            retries: int = 5):
-        clientSocket = socket(AF_INET, SOCK_STREAM)
+            retries: int = 5,
+            codecType: CodecType = CodecType.PICKLE):
+        self.sendBuffers(
+            buffers=[messageInBytes],
+            destAddr=destAddr,
+            retries=retries,
+            codecType=codecType)
+
+    def sendBuffers(
+            self,
+            buffers: List[Buffer],
+            destAddr: Address,
+            retries: int = 5,
+            codecType: CodecType = CodecType.PICKLE):
+        # The buffers are written in order as one frame without being joined
+        isReused = False
+        clientSocket = None
         try:
-            clientSocket.settimeout(10)
-            clientSocket.connect(destAddr)
-            package = struct.pack(FORMAT, len(messageInBytes)) + messageInBytes
-            clientSocket.sendall(package)
-            clientSocket.close()
+            clientSocket, isReused = self.connectionPool.acquire(destAddr)
+            frameSize = sum(memoryview(buffer).nbytes for buffer in buffers)
+            header = packHeader(codecType, frameSize)
+            self.sendAll(clientSocket, [header, *buffers])
+            self.connectionPool.release(destAddr, clientSocket)
         except OSError:
-            clientSocket.close()
-            if retries > 0:
-                self.resendBytes(messageInBytes, destAddr, retries - 1)
+            if clientSocket is not None:
+                self.connectionPool.discard(clientSocket)
+            if isReused:
+                # The pooled connection went stale, try a fresh one
+                self.sendBuffers(buffers, destAddr, retries, codecType)
                 return
-            raise OSError
-        except ConnectionRefusedError:
-            clientSocket.close()
-            sleep(3)
             if retries > 0:
-                self.resendBytes(messageInBytes, destAddr, retries - 1)
+                self.resendBuffers(buffers, destAddr, retries - 1, codecType)
                 return
-            raise ConnectionRefusedError
+            raise OSError
 
-    def resendBytes(self, message: bytes, destination: Address, retries: int):
+    def resendBuffers(
+            self,
+            buffers: List[Buffer],
+            destination: Address,
+            retries: int,
+            codecType: CodecType = CodecType.PICKLE):
         sleep(0.1)
-        self.sendBytes(messageInBytes=message,
-                       destAddr=destination,
-                       retries=retries - 1)
+        self.sendBuffers(buffers=buffers,
+                         destAddr=destination,
+                         retries=retries - 1,
+                         codecType=codecType)
+
+    @staticmethod
+    def sendAll(clientSocket: socket, buffers: List[Buffer]):
+        if not hasattr(clientSocket, 'sendmsg'):
+            clientSocket.sendall(b''.join(buffers))
+            return
+        views = []
+        for buffer in buffers:
+            view = memoryview(buffer).cast('B')
+            if view.nbytes:
+                views.append(view)
+        # Scatter-gather write, sendmsg may send only part of the buffers
+        while len(views):
+            sentSize = clientSocket.sendmsg(views[:IOV_MAX])
+            while sentSize:
+                if sentSize < views[0].nbytes:
+                    views[0] = views[0][sentSize:]
+                    break
+                sentSize -= views[0].nbytes
+                views.pop(0)
 
     def sendMessage(
             self,
@@ -79,7 +190,8 @@ class MessageSender(Component, DebugLogPrinter):
             messageSubType: MessageSubType = MessageSubType.NONE,
             messageSubSubType: MessageSubSubType = MessageSubSubType.NONE,
             ignoreSocketError: bool = None,
-            showFailure: bool = True):
+            showFailure: bool = True,
+            fallback: Component = None):
 
         if messageToSend is None:
             messageToSend = MessageToSend(
@@ -89,38 +201,279 @@ class MessageSender(Component, DebugLogPrinter):
                 messageSubType=messageSubType,
                 messageSubSubType=messageSubSubType)
         messageToSend.sentAtSourceTimestamp = time() * 1000
+        if fallback is not None:
+            messageToSend.fallback = Component.fromDict(fallback.toDict())
 
         destination = messageToSend.destination
         component = Component.fromDict(destination.toDict())
         messageToSend.destination = component
 
-        self.messagesToSendQueue.put(
-            (messageToSend, ignoreSocketError, showFailure))
+        if messageToSend.type in self.batchedMessageTypes:
+            self.messageBatcher.add(
+                messageToSend, ignoreSocketError, showFailure)
+            return
+        self.putMessageToSend(messageToSend, ignoreSocketError, showFailure)
+
+    def multicastMessage(
+            self,
+            data: Dict,
+            destinations: List[Component],
+            messageType: MessageType = MessageType.NONE,
+            messageSubType: MessageSubType = MessageSubType.NONE,
+            messageSubSubType: MessageSubSubType = MessageSubSubType.NONE,
+            ignoreSocketError: bool = None,
+            showFailure: bool = True):
+        # The same message to several destinations is encoded only once.
+        # Each destination gets its own frame header over the shared buffers
+        if len(destinations) < 2 or messageType in self.batchedMessageTypes:
+            for destination in destinations:
+                self.sendMessage(
+                    data=data,
+                    destination=destination,
+                    messageType=messageType,
+                    messageSubType=messageSubType,
+                    messageSubSubType=messageSubSubType,
+                    ignoreSocketError=ignoreSocketError,
+                    showFailure=showFailure)
+            return
+        messagesToSend = [
+            MessageToSend(
+                messageType=messageType,
+                data=data,
+                destination=Component.fromDict(destination.toDict()),
+                messageSubType=messageSubType,
+                messageSubSubType=messageSubSubType)
+            for destination in destinations]
+        sentAtSourceTimestamp = time() * 1000
+        messageInDict = messagesToSend[0].toDict()
+        # Receivers do not read the destination
+        del messageInDict['destination']
+        messageInDict['sentAtSourceTimestamp'] = sentAtSourceTimestamp
+        messageInDict['source'] = self.toDict()
+        codec = self.codecOf(messageType)
+        encoded = (codec.codecType, codec.encodeBuffers(messageInDict))
+        for messageToSend in messagesToSend:
+            messageToSend.sentAtSourceTimestamp = sentAtSourceTimestamp
+            messageToSend.encoded = encoded
+            self.putMessageToSend(
+                messageToSend, ignoreSocketError, showFailure)
+
+    def sendBatch(
+            self,
+            messages: List[MessageToSend],
+            ignoreSocketError: bool = None,
+            showFailure: bool = True):
+        if len(messages) == 1:
+            self.putMessageToSend(messages[0], ignoreSocketError, showFailure)
+            return
+        # The receiver unpacks the envelope into the original messages
+        envelope = MessageToSend(
+            messageType=MessageType.BATCH,
+            data={'messages': [message.toDict() for message in messages]},
+            destination=messages[0].destination)
+        envelope.sentAtSourceTimestamp = time() * 1000
+        self.putMessageToSend(envelope, ignoreSocketError, showFailure)
 
-    def messageSender(self, retries: int = 10):
+    def putMessageToSend(
+            self,
+            messageToSend: MessageToSend,
+            ignoreSocketError: bool = None,
+            showFailure: bool = True):
+        destinationQueue = self.destinationQueueOf(
+            messageToSend.destination.addr)
+        if destinationQueue.put(
+                (messageToSend, ignoreSocketError, showFailure),
+                block=get_ident() not in self.drainingThreads):
+            self.readyDestinationQueues.put(destinationQueue)
+
+    def probeSharedMemory(
+            self,
+            destAddr: Address,
+            segmentName: str,
+            slots: int,
+            slotSize: int):
+        self.sendMessage(
+            messageType=MessageType.PROFILING,
+            messageSubType=MessageSubType.SHARED_MEMORY,
+            messageSubSubType=MessageSubSubType.TRY,
+            data={
+                'segmentName': segmentName,
+                'slots': slots,
+                'slotSize': slotSize},
+            destination=Component(addr=destAddr),
+            ignoreSocketError=True,
+            showFailure=False)
+
+    def destinationQueueOf(self, destAddr: Address) -> DestinationQueue:
+        destAddr = (destAddr[0], destAddr[1])
+        with self.destinationQueuesLock:
+            if destAddr not in self.destinationQueues:
+                self.destinationQueues[destAddr] = DestinationQueue(destAddr)
+            return self.destinationQueues[destAddr]
+
+    def destinationQueuesStatus(self) -> Dict[str, Dict]:
+        # Queue depth, sent, dropped and failed counts and circuit state of
+        # each peer
+        with self.destinationQueuesLock:
+            destinationQueues = list(self.destinationQueues.values())
+        return {
+            '%s:%d' % destinationQueue.destAddr: destinationQueue.status()
+            for destinationQueue in destinationQueues}
+
+    def encode(
+            self,
+            messageToSend: MessageToSend,
+            messageInDict: Dict) -> Tuple[CodecType, List[Buffer]]:
+        if messageToSend.encoded is not None:
+            codecType, buffers = messageToSend.encoded
+        else:
+            codec = self.codecOf(messageToSend.type)
+            codecType = codec.codecType
+            buffers = codec.encodeBuffers(messageInDict)
+        return self.sharedMemoryChannel.wrap(
+            codecType, buffers, messageToSend.destination.addr)
+
+    def handleSendFailure(
+            self,
+            messageInDict: Dict,
+            destination: Component,
+            ignoreSocketError: bool = None,
+            showFailure: bool = True):
+        # The circuit breaker of the destination decides when to try again,
+        # so a peer that is down does not stop this component
+        if ignoreSocketError is None:
+            ignoreSocketError = self.ignoreSocketError
+        if not ignoreSocketError:
+            self.debugLogger.warning(
+                'Failed to send message to %s', destination.nameLogPrinting)
+        if showFailure:
+            self.debugLogger.debug(
+                'Failed to send message: %s \n %s',
+                destination.nameLogPrinting,
+                pformat(messageInDict))
+
+    def messageSender(self, messagesPerTurn: int = 16):
+        self.drainingThreads.add(get_ident())
+        while True:
+            destinationQueue = self.readyDestinationQueues.get()
+            self.sendQueuedMessages(destinationQueue, messagesPerTurn)
+
+    def sendQueuedMessages(
+            self,
+            destinationQueue: DestinationQueue,
+            messagesPerTurn: int):
+        isHandedOver = False
+        try:
+            self.sendInTurn(destinationQueue, messagesPerTurn)
+            isHandedOver = True
+        except Exception:
+            printExc()
+        finally:
+            # Otherwise no sender thread would ever look at the queue again
+            if not isHandedOver and destinationQueue.reschedule():
+                self.readyDestinationQueues.put(destinationQueue)
+
+    def sendInTurn(
+            self,
+            destinationQueue: DestinationQueue,
+            messagesPerTurn: int):
+        circuitBreaker = destinationQueue.circuitBreaker
+        for _ in range(messagesPerTurn):
+            item = destinationQueue.get()
+            if item is None:
+                return
+            # Only asked with a message at hand, as a half open circuit lets
+            # one message through and waits for its outcome
+            if not circuitBreaker.allowRequest():
+                destinationQueue.putBack(item)
+                for item in destinationQueue.takeWithFallback():
+                    self.sendToFallback(item)
+                # Fail fast while the peer is down and look at the queue
+                # again once the circuit half opens
+                timer = Timer(
+                    circuitBreaker.remainingOpenTime(),
+                    self.readyDestinationQueues.put,
+                    (destinationQueue,))
+                timer.daemon = True
+                timer.start()
+                return
+            try:
+                isSent = self.sendQueuedMessage(item)
+            except Exception:
+                # E.g. data the codec cannot encode or a frame too large for
+                # the header, which would fail again
+                printExc()
+                self.debugLogger.warning(
+                    'Dropped message to %s:%d', *destinationQueue.destAddr)
+                destinationQueue.recordDropped()
+                # A trial message that never left would keep the circuit
+                # half open for good
+                if circuitBreaker.state is CircuitState.HALF_OPEN:
+                    circuitBreaker.recordFailure()
+                continue
+            if isSent:
+                destinationQueue.recordSent()
+                continue
+            destinationQueue.recordFailure()
+            if item[0].fallback is not None:
+                self.sendToFallback(item)
+                continue
+            destinationQueue.putBack(item)
+        # Take turns with other destinations
+        self.readyDestinationQueues.put(destinationQueue)
+
+    def sendToFallback(self, item: MessageToSendItem):
+        messageToSend, ignoreSocketError, showFailure = item
+        messageToSend.destination = messageToSend.fallback
+        messageToSend.fallback = None
+        self.putMessageToSend(messageToSend, ignoreSocketError, showFailure)
+
+    def sendQueuedMessage(self, item: MessageToSendItem) -> bool:
+        messageToSend, ignoreSocketError, showFailure = item
+        messageInDict = messageToSend.toDict()
+        messageInDict['source'] = self.toDict()
+        codecType, buffers = self.encode(messageToSend, messageInDict)
+        isSent = False
+        try:
+            self.sendFrame(
+                buffers=buffers,
+                destAddr=messageToSend.destination.addr,
+                codecType=codecType)
+            isSent = True
+        except OSError:
+            self.handleSendFailure(
+                messageInDict, messageToSend.destination,
+                ignoreSocketError, showFailure)
+        finally:
+            if not isSent:
+                # Encoded again when it is retried
+                self.sharedMemoryChannel.discard(codecType, buffers)
+        return isSent
+
+    def sendFrame(
+            self,
+            buffers: List[Buffer],
+            destAddr: Address,
+            codecType: CodecType):
+        # Only a few quick retries, further ones are left to the circuit
+        # breaker of the destination
+        retries = self.sendRetries
         while True:
-            messageToSend, ignoreSocketError, showFailure = self.messagesToSendQueue.get()
-            messageInDict = messageToSend.toDict()
-            messageInDict['source'] = self.toDict()
             try:
-                messageInBytes = encrypt(messageInDict)
-                self.sendBytes(
-                    messageInBytes=messageInBytes,
-                    destAddr=messageToSend.destination.addr,
-                    retries=retries)
-            except (ConnectionRefusedError, OSError):
-                if ignoreSocketError is None:
-                    ignoreSocketError = self.ignoreSocketError
-                if not ignoreSocketError:
-                    printExc()
-                if showFailure:
-                    self.debugLogger.debug(
-                        'Failed to send message: %s \n %s',
-                        messageToSend.destination.nameLogPrinting,
-                        pformat(messageInDict))
-                sleep(1)
-                self.messagesToSendQueue.put(
-                    (messageToSend, ignoreSocketError, showFailure))
-                if ignoreSocketError:
-                    continue
-                terminate()
+                if self.asyncioTransport is not None:
+                    self.asyncioTransport.send(
+                        buffers=buffers,
+                        destAddr=destAddr,
+                        codecType=codecType)
+                    return
+                self.sendBuffers(
+                    buffers=buffers,
+                    destAddr=destAddr,
+                    retries=0,
+                    codecType=codecType)
+                return
+            except OSError:
+                if retries <= 0:
+                    raise
+                retries -= 1
+                sleep(0.1)
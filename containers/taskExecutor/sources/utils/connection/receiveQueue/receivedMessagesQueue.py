@@ -0,0 +1,218 @@
+from collections import defaultdict
+from collections import deque
+from queue import Full
+from threading import Condition
+from threading import Lock
+from typing import DefaultDict
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from .dropPolicy import DropPolicy
+from .messagePriority import MessagePriority
+from ..message import MessageReceived
+from ...types import MessageSubType
+from ...types import MessageType
+
+# The maximum number of queued messages and what to do when it is reached
+QueuePolicy = Tuple[int, DropPolicy]
+# Message type and whether the lane holds droppable frames
+LaneKey = Tuple[MessageType, bool]
+FRAME_SUB_TYPES = {
+    MessageSubType.SENSORY_DATA,
+    MessageSubType.INTERMEDIATE_DATA}
+
+
+class ReceivedMessagesQueue:
+    # Bounded per message type. Message types are grouped into priorities
+    # which are drained by weighted round robin, so control messages do not
+    # wait behind frames. Within a priority, messages are handed out in the
+    # order they were received. Messages are never dropped unless a
+    # component sets a frame policy, which only applies to frames that have
+    # a deadline and are thus allowed to be shed
+
+    def __init__(
+            self,
+            policies: Dict[MessageType, QueuePolicy] = None,
+            defaultPolicy: QueuePolicy = (1024, DropPolicy.BLOCK),
+            weights: Dict[MessagePriority, int] = None):
+        if policies is None:
+            policies = {MessageType.DATA: (64, DropPolicy.BLOCK)}
+        for _, dropPolicy in list(policies.values()) + [defaultPolicy]:
+            self.checkLossless(dropPolicy)
+        if weights is None:
+            weights = {
+                MessagePriority.CONTROL: 8,
+                MessagePriority.DATA: 4,
+                MessagePriority.PROFILING: 1}
+        self.policies: Dict[MessageType, QueuePolicy] = dict(policies)
+        self.defaultPolicy = defaultPolicy
+        self.framePolicy: Optional[QueuePolicy] = None
+        self.weights: Dict[MessagePriority, int] = dict(weights)
+        self.currentWeights: DefaultDict[
+            MessagePriority, int] = defaultdict(int)
+        self.prioritySizes: DefaultDict[
+            MessagePriority, int] = defaultdict(int)
+        self.lanes: DefaultDict[
+            LaneKey,
+            Deque[Tuple[int, MessageReceived, int]]] = defaultdict(deque)
+        self.droppedFrameCount: int = 0
+        self.sequence: int = 0
+        self.size: int = 0
+        self.lock: Lock = Lock()
+        self.notEmpty: Condition = Condition(self.lock)
+        # For threads that only handle one priority
+        self.notEmptyOf: Dict[MessagePriority, Condition] = {
+            priority: Condition(self.lock) for priority in MessagePriority}
+        self.notFull: Condition = Condition(self.lock)
+
+    @staticmethod
+    def priorityOf(messageType: MessageType) -> MessagePriority:
+        if messageType is MessageType.DATA:
+            return MessagePriority.DATA
+        if messageType in {MessageType.PROFILING, MessageType.LOG}:
+            return MessagePriority.PROFILING
+        return MessagePriority.CONTROL
+
+    @staticmethod
+    def checkLossless(dropPolicy: DropPolicy):
+        if dropPolicy is DropPolicy.BLOCK:
+            return
+        raise ValueError(
+            'Only frames may be dropped, see ReceivedMessagesQueue.'
+            'setFramePolicy')
+
+    def setPolicy(
+            self,
+            messageType: MessageType,
+            maxSize: int,
+            dropPolicy: DropPolicy = DropPolicy.BLOCK):
+        self.checkLossless(dropPolicy)
+        with self.lock:
+            self.policies[messageType] = (maxSize, dropPolicy)
+            self.notFull.notify_all()
+
+    def setFramePolicy(self, maxSize: int, dropPolicy: DropPolicy):
+        # For components whose task may skip frames, e.g. one that only
+        # looks at the latest frame
+        with self.lock:
+            self.framePolicy = (maxSize, dropPolicy)
+            self.notFull.notify_all()
+
+    def laneOf(self, message: MessageReceived) -> LaneKey:
+        if self.framePolicy is None \
+                or message.type is not MessageType.DATA \
+                or message.subType not in FRAME_SUB_TYPES:
+            return message.type, False
+        # Frames the User allows to be shed once their deadline is over
+        isDroppable = 'sequenceNumber' in message.data \
+            and 'timeBudget' in message.data
+        return message.type, isDroppable
+
+    def policyOf(self, lane: LaneKey) -> QueuePolicy:
+        messageType, isDroppable = lane
+        if isDroppable and self.framePolicy is not None:
+            return self.framePolicy
+        if messageType in self.policies:
+            return self.policies[messageType]
+        return self.defaultPolicy
+
+    def put(
+            self,
+            message: MessageReceived,
+            packetSize: int,
+            block: bool = True) -> Optional[MessageReceived]:
+        # Returns the message dropped to make room, if any. Raises Full
+        # instead of waiting for room unless block is set
+        with self.lock:
+            laneKey = self.laneOf(message)
+            lane = self.lanes[laneKey]
+            maxSize, dropPolicy = self.policyOf(laneKey)
+            while len(lane) >= maxSize and dropPolicy is DropPolicy.BLOCK:
+                if not block:
+                    raise Full
+                self.notFull.wait()
+                maxSize, dropPolicy = self.policyOf(laneKey)
+            priority = self.priorityOf(message.type)
+            dropped = None
+            if len(lane) >= maxSize:
+                self.droppedFrameCount += 1
+                if dropPolicy is DropPolicy.DROP_NEWEST:
+                    return message
+                _, dropped, _ = lane.popleft()
+                self.size -= 1
+                self.prioritySizes[priority] -= 1
+            lane.append((self.sequence, message, packetSize))
+            self.sequence += 1
+            self.size += 1
+            self.prioritySizes[priority] += 1
+            self.notEmpty.notify()
+            self.notEmptyOf[priority].notify()
+            return dropped
+
+    def get(
+            self,
+            priority: MessagePriority = None) -> Tuple[MessageReceived, int]:
+        # Only returns messages of the priority if one is given
+        with self.lock:
+            if priority is None:
+                while not self.size:
+                    self.notEmpty.wait()
+                priority = self.nextPriority()
+            else:
+                while not self.prioritySizes[priority]:
+                    self.notEmptyOf[priority].wait()
+            oldestLane = None
+            for (messageType, _), lane in self.lanes.items():
+                if not len(lane):
+                    continue
+                if self.priorityOf(messageType) is not priority:
+                    continue
+                if oldestLane is not None and oldestLane[0][0] < lane[0][0]:
+                    continue
+                oldestLane = lane
+            _, message, packetSize = oldestLane.popleft()
+            self.size -= 1
+            self.prioritySizes[priority] -= 1
+            if not self.prioritySizes[priority]:
+                self.currentWeights[priority] = 0
+            self.notFull.notify_all()
+            return message, packetSize
+
+    def nextPriority(self) -> MessagePriority:
+        # Smooth weighted round robin over the priorities with messages
+        totalWeight = 0
+        chosen = None
+        for priority in MessagePriority:
+            if not self.prioritySizes[priority]:
+                continue
+            weight = self.weights.get(priority, 1)
+            self.currentWeights[priority] += weight
+            totalWeight += weight
+            if chosen is not None and \
+                    self.currentWeights[chosen] >= \
+                    self.currentWeights[priority]:
+                continue
+            chosen = priority
+        self.currentWeights[chosen] -= totalWeight
+        return chosen
+
+    def qsize(self) -> int:
+        with self.lock:
+            return self.size
+
+    def setWeight(self, priority: MessagePriority, weight: int):
+        with self.lock:
+            self.weights[priority] = weight
+
+    def status(self) -> Dict[str, Dict]:
+        with self.lock:
+            status = {}
+            for (messageType, isDroppable), lane in self.lanes.items():
+                name = 'frames' if isDroppable else messageType.value
+                status[name] = {'depth': len(lane)}
+            if self.framePolicy is not None:
+                status.setdefault('frames', {'depth': 0})
+                status['frames']['dropped'] = self.droppedFrameCount
+            return status
@@ -1,4 +1,5 @@
 from socket import socket
+from time import time
 
 from ..types import Address
 
@@ -8,3 +9,13 @@ class ConnectionRequest:
     def __init__(self, clientSocket: socket, clientAddr: Address):
         self.clientSocket = clientSocket
         self.clientAddr = clientAddr
+        self.lastActiveTime = time()
+
+    def touch(self):
+        self.lastActiveTime = time()
+
+    def close(self):
+        try:
+            self.clientSocket.close()
+        except OSError:
+            pass
@@ -0,0 +1,144 @@
+from collections import deque
+from threading import Condition
+from threading import Lock
+from time import time
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .circuitBreaker import CircuitBreaker
+from .circuitState import CircuitState
+from ..message import MessageToSend
+from ...types import Address
+
+# The message, ignoreSocketError and showFailure
+MessageToSendItem = Tuple[MessageToSend, bool, bool]
+
+
+class DestinationQueue:
+    # Messages waiting for one destination. At most one sender thread works
+    # on a queue at a time, so messages to a peer leave in order and a peer
+    # that is down holds up no more than one thread. Producers wait for a
+    # slow but healthy peer while the queue is full, and the oldest
+    # messages are dropped while the peer is down
+
+    def __init__(
+            self,
+            destAddr: Address,
+            maxSize: int = 128,
+            maxWait: float = 1):
+        self.destAddr = destAddr
+        self.maxSize = maxSize
+        # Longest a producer waits for room, after which its message is
+        # queued anyway rather than lost
+        self.maxWait = maxWait
+        self.messages: Deque[MessageToSendItem] = deque()
+        self.circuitBreaker: CircuitBreaker = CircuitBreaker()
+        self.isScheduled: bool = False
+        self.sentCount: int = 0
+        self.droppedCount: int = 0
+        self.failedCount: int = 0
+        self.overflowCount: int = 0
+        self.lock: Lock = Lock()
+        self.notFull: Condition = Condition(self.lock)
+
+    def put(self, item: MessageToSendItem, block: bool = True) -> bool:
+        # Returns whether the queue has to be handed to a sender thread.
+        # Threads that drain queues must not block
+        with self.lock:
+            if block:
+                self.waitForRoom()
+            if len(self.messages) >= self.maxSize \
+                    and not self.isPeerDown():
+                self.overflowCount += 1
+            self.messages.append(item)
+            self.dropOldest()
+            if self.isScheduled:
+                return False
+            self.isScheduled = True
+            return True
+
+    def waitForRoom(self):
+        deadline = time() + self.maxWait
+        while len(self.messages) >= self.maxSize \
+                and not self.isPeerDown():
+            remaining = deadline - time()
+            if remaining <= 0:
+                return
+            self.notFull.wait(remaining)
+
+    def putBack(self, item: MessageToSendItem):
+        with self.lock:
+            self.messages.appendleft(item)
+            self.dropOldest()
+
+    def dropOldest(self):
+        # The oldest messages are the most likely to be outdated
+        if not self.isPeerDown():
+            return
+        while len(self.messages) > self.maxSize:
+            self.messages.popleft()
+            self.droppedCount += 1
+
+    def takeWithFallback(self) -> List[MessageToSendItem]:
+        # Messages that have somewhere else to go do not wait for the peer
+        with self.lock:
+            taken = []
+            kept = deque()
+            for item in self.messages:
+                if item[0].fallback is None:
+                    kept.append(item)
+                    continue
+                taken.append(item)
+            self.messages = kept
+            self.notFull.notify_all()
+            return taken
+
+    def isPeerDown(self) -> bool:
+        # Messages to a healthy peer are never dropped, only delayed
+        return self.circuitBreaker.state is not CircuitState.CLOSED
+
+    def get(self) -> Optional[MessageToSendItem]:
+        with self.lock:
+            if not len(self.messages):
+                self.isScheduled = False
+                return None
+            self.notFull.notify()
+            return self.messages.popleft()
+
+    def reschedule(self) -> bool:
+        # Called when a sender thread stops working on the queue unexpectedly.
+        # Returns whether the queue has to be handed to a sender thread again
+        with self.lock:
+            if not len(self.messages):
+                self.isScheduled = False
+                return False
+            return True
+
+    def recordSent(self):
+        self.circuitBreaker.recordSuccess()
+        with self.lock:
+            self.sentCount += 1
+
+    def recordFailure(self):
+        self.circuitBreaker.recordFailure()
+        with self.lock:
+            self.failedCount += 1
+            # Producers stop waiting once the peer is down
+            self.notFull.notify_all()
+
+    def recordDropped(self):
+        with self.lock:
+            self.droppedCount += 1
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'depth': len(self.messages),
+                'sent': self.sentCount,
+                'dropped': self.droppedCount,
+                'failed': self.failedCount,
+                'overflow': self.overflowCount,
+                'circuit': self.circuitBreaker.state.value}
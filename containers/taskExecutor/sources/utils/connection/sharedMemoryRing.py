@@ -0,0 +1,84 @@
+from multiprocessing.shared_memory import SharedMemory
+from os import getpid
+from os import posix_fallocate
+from secrets import token_hex as tokenHex
+from threading import Lock
+from time import time
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .codec.sharedMemoryCodec import SLOT_FREE
+from .codec.sharedMemoryCodec import SLOT_IN_USE
+from .codec.sharedMemoryCodec import headerSizeOf
+from .codec.sharedMemoryCodec import segmentNameOf
+
+
+class SharedMemoryRing:
+    # Slots of one segment that a sender fills in turn and the receiver
+    # frees once it has copied the frame out
+
+    def __init__(self, slots: int, slotSize: int):
+        self.slots = slots
+        self.slotSize = slotSize
+        self.headerSize = headerSizeOf(slots)
+        size = self.headerSize + slots * slotSize
+        # Unlinked by the resource tracker if this process exits first
+        self.segment = SharedMemory(
+            name=segmentNameOf(getpid(), tokenHex(4)),
+            create=True,
+            size=size)
+        try:
+            # Writing to pages a full /dev/shm cannot back would kill this
+            # process, so the memory is reserved now
+            posix_fallocate(self.segment._fd, 0, size)
+        except OSError:
+            self.close()
+            raise
+        self.segment.buf[:slots] = bytes([SLOT_FREE]) * slots
+        self.nextSlot: int = 0
+        # Set once the receiver has confirmed it can attach the segment
+        self.isAttached: bool = False
+        self.lastUsedTime: float = time()
+        self.lock: Lock = Lock()
+
+    @property
+    def name(self) -> str:
+        return self.segment.name
+
+    def write(
+            self,
+            views: List[memoryview],
+            size: int) -> Optional[Tuple[int, int]]:
+        # Returns the slot and offset of the frame, or None when the
+        # receiver has not freed the next slot yet
+        if size > self.slotSize:
+            return None
+        with self.lock:
+            slot = self.nextSlot
+            if self.segment.buf[slot] != SLOT_FREE:
+                return None
+            self.segment.buf[slot] = SLOT_IN_USE
+            self.nextSlot = (slot + 1) % self.slots
+            self.lastUsedTime = time()
+        start = self.headerSize + slot * self.slotSize
+        offset = start
+        for view in views:
+            self.segment.buf[offset:offset + view.nbytes] = view
+            offset += view.nbytes
+        return slot, start
+
+    def free(self, slot: int):
+        self.segment.buf[slot] = SLOT_FREE
+
+    def isIdle(self, idleTimeout: float) -> bool:
+        if time() - self.lastUsedTime < idleTimeout:
+            return False
+        flags = self.segment.buf[:self.slots]
+        isIdle = all(flag == SLOT_FREE for flag in flags)
+        flags.release()
+        return isIdle
+
+    def close(self):
+        self.segment.close()
+        self.segment.unlink()
@@ -0,0 +1 @@
+from .inputBatcher import InputBatcher
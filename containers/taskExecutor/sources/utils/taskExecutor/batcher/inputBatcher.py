@@ -0,0 +1,65 @@
+from threading import Condition
+from threading import Thread
+from time import time
+from traceback import print_exc
+from typing import Callable
+from typing import List
+
+from ...connection import MessageReceived
+
+
+class InputBatcher:
+    # Holds received inputs for up to wait seconds, or until there are
+    # maxInputs of them, and hands them to run together
+
+    def __init__(
+            self,
+            run: Callable[[List[MessageReceived]], None],
+            maxInputs: int = 8,
+            wait: float = 0.005):
+        self.run = run
+        self.maxInputs = maxInputs
+        self.wait = wait
+        self.pending: List[MessageReceived] = []
+        self.deadline: float = .0
+        self.condition: Condition = Condition()
+        Thread(
+            target=self.runPeriodically,
+            name='InputBatcher',
+            daemon=True).start()
+
+    def add(self, message: MessageReceived):
+        with self.condition:
+            if not len(self.pending):
+                self.deadline = time() + self.wait
+                self.condition.notify()
+            self.pending.append(message)
+            if len(self.pending) < self.maxInputs:
+                return
+            messages = self.pending
+            self.pending = []
+        self.run(messages)
+
+    def take(self) -> List[MessageReceived]:
+        # Hands out the held inputs at once, e.g. to go with another message
+        with self.condition:
+            messages = self.pending
+            self.pending = []
+            return messages
+
+    def runPeriodically(self):
+        while True:
+            with self.condition:
+                while not len(self.pending):
+                    self.condition.wait()
+                remaining = self.deadline - time()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+                messages = self.pending
+                self.pending = []
+            try:
+                self.run(messages)
+            except Exception:
+                # Later inputs still have to be run
+                print_exc()
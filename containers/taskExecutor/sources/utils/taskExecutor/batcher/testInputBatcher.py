@@ -0,0 +1,46 @@
+import unittest
+from time import sleep
+
+from .inputBatcher import InputBatcher
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+        self.inputBatcher = InputBatcher(
+            run=self.runBatch, maxInputs=4, wait=0.05)
+
+    def runBatch(self, messages):
+        if 'fail' in messages:
+            raise ValueError('Task failed')
+        self.batches.append(messages)
+
+    def testRunsFullBatchAtOnce(self):
+        for i in range(4):
+            self.inputBatcher.add(i)
+        self.assertEqual(self.batches, [[0, 1, 2, 3]])
+
+    def testRunsPartialBatchAfterWait(self):
+        self.inputBatcher.add(0)
+        self.inputBatcher.add(1)
+        self.assertEqual(self.batches, [])
+        sleep(0.2)
+        self.assertEqual(self.batches, [[0, 1]])
+
+    def testKeepsRunningAfterFailedBatch(self):
+        self.inputBatcher.add('fail')
+        sleep(0.2)
+        self.inputBatcher.add(0)
+        sleep(0.2)
+        self.assertEqual(self.batches, [[0]])
+
+    def testTake(self):
+        self.inputBatcher.add(0)
+        self.assertEqual(self.inputBatcher.take(), [0])
+        sleep(0.2)
+        self.assertEqual(self.batches, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,22 @@
 from time import sleep
 from time import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
 
+from ..batcher import InputBatcher
+from ..processPool import TaskProcessPool
 from ..registration.manager import RegistrationManager
+from ..sequencer import FrameSequencer
 from ..tasks.base import BaseTask
 from ...component import BasicComponent
+from ...connection import DropPolicy
 from ...connection.message.received import MessageReceived
+from ...connection.message.toSend import MessageToSend
 from ...container.manager import ContainerManager
+from ...types import Address
 from ...types import Component
 from ...types import ComponentRole
 from ...types import MessageSubType
@@ -18,13 +29,43 @@ class TaskExecutorMessageHandler:
             containerManager: ContainerManager,
             basicComponent: BasicComponent,
             task: BaseTask,
-            registrationManager: RegistrationManager):
+            registrationManager: RegistrationManager,
+            localStages: Dict[Address, BasicComponent] = None,
+            processPoolSize: int = 0):
 
         self.task = task
         self.registrationManager = registrationManager
         self.containerManager = containerManager
         self.basicComponent = basicComponent
         self.basicComponent.handleMessage = self.handleMessage
+        if self.task.isDroppable:
+            self.basicComponent.setReceiveQueueFramePolicy(
+                maxSize=16, dropPolicy=DropPolicy.DROP_OLDEST)
+            self.basicComponent.handleDroppedMessage = self.skipFrame
+        self.frameSequencer = FrameSequencer(
+            run=self.runData, skip=self.skipFrame)
+        # Frames that get no result are reported to the User together, or
+        # along with the next result
+        self.skippedFrames = InputBatcher(
+            run=self.reportSkippedFrames,
+            maxInputs=32,
+            wait=0.05)
+        self.inputBatcher = None
+        if self.task.maxBatchSize > 1:
+            self.inputBatcher = InputBatcher(
+                run=self.runDataBatch,
+                maxInputs=self.task.maxBatchSize,
+                wait=self.task.batchWait)
+        self.droppedCount = 0
+        # Runs exec and execBatch of the task
+        self.taskRunner: Union[BaseTask, TaskProcessPool] = self.task
+        if processPoolSize > 0:
+            self.taskRunner = TaskProcessPool(
+                task=self.task, workers=processPoolSize)
+        # Stages running in this process, by their addresses
+        self.localStages = localStages
+        if self.localStages is None:
+            self.localStages = {}
 
     def handleMessage(self, message: MessageReceived):
         if message.typeIs(
@@ -57,6 +98,11 @@ class TaskExecutorMessageHandler:
         name = data['name']
         nameConsistent = data['nameConsistent']
         nameLogPrinting = data['nameLogPrinting']
+        # Sink TaskExecutors send final results to this User directly
+        self.registrationManager.userAddr = None
+        if 'userAddr' in data:
+            addr = data['userAddr']
+            self.registrationManager.userAddr = addr[0], addr[1]
         self.basicComponent.setName(
             addr=self.basicComponent.addr,
             name=name,
@@ -85,36 +131,158 @@ class TaskExecutorMessageHandler:
             return
 
     def handleData(self, message: MessageReceived):
+        data = message.data
+        if self.task.keepsFrameOrder and 'sequenceNumber' in data:
+            self.frameSequencer.put(
+                streamID=data['userID'],
+                sequenceNumber=data['sequenceNumber'],
+                message=message)
+            return
+        if self.inputBatcher is not None:
+            self.inputBatcher.add(message)
+            return
+        self.runData(message)
+
+    def runData(self, message: MessageReceived):
+        deadline = self.deadlineOf(message)
+        if self.isExpired(deadline):
+            self.skipFrame(message)
+            return
+        result = self.taskRunner.exec(message.data['intermediateData'])
+        self.handleResult(message, result, deadline)
+
+    def runDataBatch(self, messages: List[MessageReceived]):
+        messagesToRun = []
+        deadlines = []
+        for message in messages:
+            deadline = self.deadlineOf(message)
+            if self.isExpired(deadline):
+                self.skipFrame(message)
+                continue
+            messagesToRun.append(message)
+            deadlines.append(deadline)
+        if not len(messagesToRun):
+            return
+        results = self.taskRunner.execBatch(
+            [message.data['intermediateData'] for message in messagesToRun])
+        for message, result, deadline in zip(
+                messagesToRun, results, deadlines):
+            self.handleResult(message, result, deadline)
+
+    @staticmethod
+    def deadlineOf(message: MessageReceived) -> Optional[float]:
+        data = message.data
+        if 'timeBudget' not in data:
+            return None
+        # Clocks of hosts may differ, so the budget is counted from when
+        # this frame arrived
+        return message.receivedAtLocalTimestamp + data['timeBudget']
+
+    def isExpired(self, deadline: Optional[float]) -> bool:
+        if deadline is None or time() * 1000 <= deadline:
+            return False
+        self.droppedCount += 1
+        return True
 
+    def handleResult(
+            self,
+            message: MessageReceived,
+            result: Any,
+            deadline: Optional[float]):
         data = message.data
-        intermediateData = data['intermediateData']
-        result = self.task.exec(intermediateData)
         processingTime = time() * 1000 - message.receivedAtLocalTimestamp
         self.task.updateProcessingTime(processingTime)
         if result is None:
+            self.skipFrame(message)
             return
         # print(self.task.taskName, self.registrationManager.childrenAddresses)
-        if len(self.registrationManager.childrenAddresses.keys()):
+        if deadline is not None:
+            data['timeBudget'] = deadline - time() * 1000
+        childrenAddresses = self.registrationManager.childrenAddresses
+        if len(childrenAddresses.keys()):
             data['intermediateData'] = result
-            for addr in self.registrationManager.childrenAddresses.values():
-                child = Component(addr=addr)
-                self.basicComponent.sendMessage(
-                    messageType=MessageType.DATA,
-                    messageSubType=MessageSubType.INTERMEDIATE_DATA,
-                    data=data,
-                    destination=child)
+            children = []
+            for addr in childrenAddresses.values():
+                if addr in self.localStages:
+                    self.sendToLocalStage(data, self.localStages[addr])
+                    continue
+                children.append(Component(addr=addr))
+            if not len(children):
+                return
+            self.basicComponent.multicastMessage(
+                messageType=MessageType.DATA,
+                messageSubType=MessageSubType.INTERMEDIATE_DATA,
+                data=data,
+                destinations=children)
             return
         del data['intermediateData']
         data['finalResult'] = result
+        self.attachSkippedFrames(data)
+        self.sendFinalResult(data)
+
+    def skipFrame(self, message: MessageReceived):
+        # The User waits for the result of each frame in order, so it is
+        # told about a frame that will get none
+        if 'sequenceNumber' not in message.data:
+            return
+        self.skippedFrames.add(message)
+
+    def attachSkippedFrames(self, data: Dict):
+        skipped = []
+        others = []
+        for message in self.skippedFrames.take():
+            if message.data['userID'] != data['userID']:
+                others.append(message)
+                continue
+            skipped.append(message.data['sequenceNumber'])
+        if len(skipped):
+            data['skippedSequenceNumbers'] = skipped
+        if len(others):
+            self.reportSkippedFrames(others)
+
+    def reportSkippedFrames(self, messages: List[MessageReceived]):
+        skipped: Dict[Any, List[int]] = {}
+        for message in messages:
+            data = message.data
+            skipped.setdefault(data['userID'], []).append(
+                data['sequenceNumber'])
+        for userID, sequenceNumbers in skipped.items():
+            self.sendFinalResult({
+                'userID': userID,
+                'skippedSequenceNumbers': sequenceNumbers})
+
+    def sendFinalResult(self, data: Dict):
+        destination = self.basicComponent.master
+        fallback = None
+        userAddr = self.registrationManager.userAddr
+        if userAddr is not None:
+            # The Master relays it when the User cannot be reached directly
+            fallback = destination
+            destination = Component(role=ComponentRole.USER, addr=userAddr)
         self.basicComponent.sendMessage(
             messageType=MessageType.DATA,
             messageSubType=MessageSubType.FINAL_RESULT,
             data=data,
-            destination=self.basicComponent.master)
-        return
+            destination=destination,
+            fallback=fallback)
+
+    def sendToLocalStage(self, data: Dict, stage: BasicComponent):
+        # The stage owns the copy, so it may change the data while this one
+        # is still sending it to other children
+        messageToSend = MessageToSend(
+            messageType=MessageType.DATA,
+            messageSubType=MessageSubType.INTERMEDIATE_DATA,
+            data=dict(data),
+            destination=stage.me)
+        messageToSend.sentAtSourceTimestamp = time() * 1000
+        messageInDict = messageToSend.toDict()
+        messageInDict['source'] = self.basicComponent.toDict()
+        stage.receiveLocalMessage(messageInDict)
 
     def handleWait(self, message: MessageReceived):
         self.basicComponent.isRegistered.clear()
+        # Late results go to Master, which knows the User has left
+        self.registrationManager.userAddr = None
         self.basicComponent.sendMessage(
             messageType=MessageType.ACKNOWLEDGEMENT,
             messageSubType=MessageSubType.WAITING,
@@ -0,0 +1 @@
+from .taskProcessPool import TaskProcessPool
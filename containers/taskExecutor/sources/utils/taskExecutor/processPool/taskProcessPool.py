@@ -0,0 +1,36 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any
+from typing import List
+
+from .worker import execBatchInWorker
+from .worker import execInWorker
+from .worker import initWorker
+from ..tasks.base import BaseTask
+
+
+class TaskProcessPool:
+    # Runs exec and execBatch of a task in worker processes, so that pure
+    # Python tasks are not serialized by the GIL of the TaskExecutor. A
+    # stateful task gets one worker, which keeps the state between inputs
+
+    def __init__(self, task: BaseTask, workers: int):
+        self.task = task
+        if task.isStateful:
+            workers = 1
+        self.workers = workers
+        # Handler threads are already running, which a forked worker would
+        # inherit in whatever state they are
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context('spawn'),
+            initializer=initWorker,
+            initargs=(task.taskName,))
+
+    def exec(self, inputData: Any) -> Any:
+        return self.executor.submit(execInWorker, inputData).result()
+
+    def execBatch(self, inputDataList: List) -> List:
+        # One worker runs the whole batch, which tasks may handle at once
+        return self.executor.submit(
+            execBatchInWorker, inputDataList).result()
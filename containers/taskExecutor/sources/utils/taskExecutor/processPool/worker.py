@@ -0,0 +1,22 @@
+from typing import Any
+from typing import List
+from typing import Optional
+
+from ..tasks.base import BaseTask
+from ..tools.initTask import initTask
+
+# The task of this worker process
+task: Optional[BaseTask] = None
+
+
+def initWorker(taskName: str):
+    global task
+    task = initTask(taskName)
+
+
+def execInWorker(inputData: Any) -> Any:
+    return task.exec(inputData)
+
+
+def execBatchInWorker(inputDataList: List) -> List:
+    return task.execBatch(inputDataList)
@@ -1,6 +1,7 @@
 from time import sleep
 from typing import Dict
 from typing import List
+from typing import Optional
 
 from ...component import BasicComponent
 from ...types import Address
@@ -29,6 +30,7 @@ class RegistrationManager:
         self.userID = userID
         self.basicComponent = basicComponent
         self.childrenAddresses: Dict[str, tuple] = {}
+        self.userAddr: Optional[Address] = None
         self.totalCPUCores = totalCPUCores
         self.cpuFreq = cpuFreq
 
@@ -0,0 +1 @@
+from .frameSequencer import FrameSequencer
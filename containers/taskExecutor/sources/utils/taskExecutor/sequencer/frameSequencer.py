@@ -0,0 +1,120 @@
+from collections import defaultdict
+from threading import Lock
+from threading import Timer
+from time import time
+from typing import Callable
+from typing import DefaultDict
+from typing import Dict
+from typing import Optional
+from typing import Set
+
+from ...connection import MessageReceived
+
+
+class FrameSequencer:
+    # Runs the frames of every stream one at a time in their sequence
+    # numbers. A missing frame, e.g. one filtered by an upstream task, is
+    # skipped once window frames wait behind it or the oldest of them has
+    # waited maxWait seconds
+
+    def __init__(
+            self,
+            run: Callable[[MessageReceived], None],
+            skip: Callable[[MessageReceived], None] = None,
+            window: int = 8,
+            maxWait: float = 0.2):
+        self.run = run
+        # Called with frames that arrive after their place was skipped
+        self.skip = skip
+        self.window = window
+        self.maxWait = maxWait
+        self.nextSequenceNumbers: Dict[str, int] = {}
+        self.pending: DefaultDict[
+            str, Dict[int, MessageReceived]] = defaultdict(dict)
+        self.draining: Set[str] = set()
+        self.flushScheduled: Set[str] = set()
+        self.lateCount: int = 0
+        self.lock: Lock = Lock()
+
+    def put(
+            self,
+            streamID: str,
+            sequenceNumber: int,
+            message: MessageReceived):
+        with self.lock:
+            isLate = self.queue(streamID, sequenceNumber, message)
+            isDraining = streamID in self.draining
+            if not isLate:
+                self.draining.add(streamID)
+        if isLate:
+            if self.skip is not None:
+                self.skip(message)
+            return
+        if not isDraining:
+            self.drain(streamID)
+
+    def queue(
+            self,
+            streamID: str,
+            sequenceNumber: int,
+            message: MessageReceived) -> bool:
+        # Returns whether the frame is late
+        if streamID not in self.nextSequenceNumbers:
+            self.nextSequenceNumbers[streamID] = sequenceNumber
+        if sequenceNumber < self.nextSequenceNumbers[streamID]:
+            # Its place in the stream has been skipped or taken
+            self.lateCount += 1
+            return True
+        self.pending[streamID][sequenceNumber] = message
+        return False
+
+    def drain(self, streamID: str):
+        # Only the thread that added streamID to draining gets here
+        while True:
+            with self.lock:
+                message = self.popReady(streamID)
+                if message is None:
+                    self.draining.discard(streamID)
+                    self.scheduleFlush(streamID)
+                    return
+            try:
+                self.run(message)
+            except Exception:
+                with self.lock:
+                    self.draining.discard(streamID)
+                raise
+
+    def popReady(self, streamID: str) -> Optional[MessageReceived]:
+        pending = self.pending[streamID]
+        if not len(pending):
+            return None
+        sequenceNumber = self.nextSequenceNumbers[streamID]
+        if sequenceNumber not in pending:
+            oldestReceivedTime = min(
+                message.receivedAtLocalTimestamp
+                for message in pending.values())
+            if len(pending) < self.window \
+                    and time() * 1000 - oldestReceivedTime \
+                    < self.maxWait * 1000:
+                return None
+            sequenceNumber = min(pending.keys())
+        self.nextSequenceNumbers[streamID] = sequenceNumber + 1
+        return pending.pop(sequenceNumber)
+
+    def scheduleFlush(self, streamID: str):
+        if not len(self.pending[streamID]):
+            return
+        if streamID in self.flushScheduled:
+            return
+        self.flushScheduled.add(streamID)
+        timer = Timer(self.maxWait, self.flush, (streamID,))
+        timer.daemon = True
+        timer.start()
+
+    def flush(self, streamID: str):
+        with self.lock:
+            self.flushScheduled.discard(streamID)
+            if streamID in self.draining:
+                return
+            self.draining.add(streamID)
+        self.drain(streamID)
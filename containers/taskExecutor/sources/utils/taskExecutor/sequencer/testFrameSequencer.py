@@ -0,0 +1,60 @@
+import unittest
+from time import sleep
+from time import time
+from types import SimpleNamespace
+
+from .frameSequencer import FrameSequencer
+
+
+def frameOf(sequenceNumber: int):
+    return SimpleNamespace(
+        data={'sequenceNumber': sequenceNumber},
+        receivedAtLocalTimestamp=time() * 1000)
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.ran = []
+        self.skipped = []
+        self.frameSequencer = FrameSequencer(
+            run=lambda message: self.ran.append(
+                message.data['sequenceNumber']),
+            skip=lambda message: self.skipped.append(
+                message.data['sequenceNumber']),
+            window=4,
+            maxWait=0.1)
+
+    def put(self, sequenceNumber: int):
+        self.frameSequencer.put(
+            'user', sequenceNumber, frameOf(sequenceNumber))
+
+    def testRunsInOrder(self):
+        for sequenceNumber in (0, 2, 1, 4, 3):
+            self.put(sequenceNumber)
+        self.assertEqual(self.ran, [0, 1, 2, 3, 4])
+
+    def testSkipsMissingFrameOnceWindowIsFull(self):
+        self.put(0)
+        for sequenceNumber in (2, 3, 4, 5):
+            self.put(sequenceNumber)
+        self.assertEqual(self.ran, [0, 2, 3, 4, 5])
+
+    def testSkipsMissingFrameAfterMaxWait(self):
+        self.put(0)
+        self.put(2)
+        self.assertEqual(self.ran, [0])
+        sleep(0.3)
+        self.assertEqual(self.ran, [0, 2])
+
+    def testLateFrameIsSkipped(self):
+        self.put(0)
+        self.put(2)
+        sleep(0.3)
+        self.put(1)
+        self.assertEqual(self.ran, [0, 2])
+        self.assertEqual(self.skipped, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
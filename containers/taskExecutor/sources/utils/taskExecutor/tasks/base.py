@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from typing import List
 
 from ...types import ProcessingTime
 from ...types import SequenceMedian
@@ -14,11 +15,26 @@ class BaseTask:
         self.medianProcessingTime = ProcessingTime(
             taskExecutorName=taskName)
         self.processedCount = 0
+        # Stateful tasks keep results of previous inputs, so a process pool
+        # runs them on one worker
+        self.isStateful = False
+        # Stateful tasks run the frames of a User in the order they were sent
+        self.keepsFrameOrder = False
+        # Stateless tasks that may skip frames which have a deadline when
+        # frames arrive faster than they run, keeping the newest ones
+        self.isDroppable = False
+        # Stateless tasks may run up to maxBatchSize inputs that arrived
+        # within batchWait seconds with one call of execBatch
+        self.maxBatchSize = 1
+        self.batchWait = 0.005
 
     @abstractmethod
     def exec(self, inputData):
         pass
 
+    def execBatch(self, inputDataList: List) -> List:
+        return [self.exec(inputData) for inputData in inputDataList]
+
     def updateProcessingTime(self, processingTime: float):
         self.processingTime.update(processingTime)
         self.medianProcessingTime.processingTime = self.processingTime.median()
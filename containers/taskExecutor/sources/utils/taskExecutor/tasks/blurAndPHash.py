@@ -14,6 +14,8 @@ class BlurAndPHash(BaseTask):
         self.preStopPHash = None
         self.prePHash = None
         self.n = 0
+        self.isStateful = True
+        self.keepsFrameOrder = True
 
     def exec(self, inputData):
         frame, isLastFrame = inputData
@@ -45,39 +47,29 @@ class BlurAndPHash(BaseTask):
         return frame, isLastFrame
 
     def getPHash(self, img):
-        pHash = None
-        laplacian = cv2.Laplacian(img, cv2.CV_64F).var()
-        if laplacian <= self.thresholdLaplacian:
-            return pHash
+        if self.laplacianVariance(img) <= self.thresholdLaplacian:
+            return None
+        imgGray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
         imgGray = cv2.resize(
-            cv2.cvtColor(img, cv2.COLOR_RGB2GRAY),
+            imgGray,
             (self.hashLen, self.hashLen),
-            cv2.INTER_AREA)
-        height, width = imgGray.shape[:2]
-        matrixOriginal = np.zeros(
-            (height, width),
-            np.float32)
-        matrixOriginal[:height, :width] = imgGray
-
-        matrix = cv2.dct(cv2.dct(matrixOriginal))
-        matrix.resize(self.hashLen, self.hashLen)
-        matrixFlatten = matrix.flatten()
+            interpolation=cv2.INTER_LINEAR)
+        matrix = cv2.dct(cv2.dct(np.float32(imgGray)))
+        # One bit per coefficient, the first coefficient is the highest bit
+        bits = matrix.reshape(-1) >= matrix.mean(dtype=np.float64)
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
 
-        medianValue = sum(matrixFlatten) * 1. / len(matrixFlatten)
-        pHash = 0
-        for i in matrixFlatten:
-            pHash <<= 1
-            if i >= medianValue:
-                pHash += 1
-        return pHash
+    @staticmethod
+    def laplacianVariance(img) -> float:
+        # Variance of the Laplacian over every channel, as thresholdLaplacian
+        # is meant for. The Laplacian of uint8 pixels fits int16 exactly,
+        # and the variance is put together from the mean and variance of
+        # each channel rather than from a float64 copy of the frame
+        mean, stdDev = cv2.meanStdDev(cv2.Laplacian(img, cv2.CV_16S))
+        mean = mean.reshape(-1)
+        return float(np.mean(stdDev.reshape(-1) ** 2 + mean ** 2)
+                     - np.mean(mean) ** 2)
 
     @staticmethod
     def hamDistance(x, y):
-        tmp = x ^ y
-        distance = 0
-
-        while tmp > 0:
-            distance += tmp & 1
-            tmp >>= 1
-
-        return distance
+        return bin(x ^ y).count('1')
@@ -6,6 +6,7 @@ from .base import BaseTask
 class ColorTracking(BaseTask):
     def __init__(self):
         super().__init__(taskID=3, taskName='ColorTracking')
+        self.isDroppable = True
 
     def exec(self, inputData):
         (frame,
@@ -14,6 +14,7 @@ class EyeDetection(BaseTask):
         classifierPath = os.path.join(absDir, '../cascade/haar-eye.xml')
         classifierPath = os.path.abspath(classifierPath)
         self.eye_cascade = cv2.CascadeClassifier(classifierPath)
+        self.isDroppable = True
 
     def exec(self, inputData):
         # print('EyeDetection', str(inputData)[:15])
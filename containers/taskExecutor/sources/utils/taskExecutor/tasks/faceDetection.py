@@ -1,6 +1,7 @@
 import os
 
 import cv2
+import numpy as np
 
 from .base import BaseTask
 
@@ -14,11 +15,27 @@ class FaceDetection(BaseTask):
         classifierPath = os.path.join(absDir, '../cascade/haar-face.xml')
         classifierPath = os.path.abspath(classifierPath)
         self.face_cascade = cv2.CascadeClassifier(classifierPath)
+        self.maxBatchSize = 8
+        self.isDroppable = True
 
     def exec(self, inputData):
         # print('FaceDetection',str(inputData)[:15])
         frame = inputData
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return self.detect(gray)
+
+    def execBatch(self, inputDataList):
+        frames = inputDataList
+        if len(frames) == 1 or len({frame.shape for frame in frames}) != 1:
+            return super().execBatch(frames)
+        # Frames of the same size are stacked and converted with one call
+        height = frames[0].shape[0]
+        grays = cv2.cvtColor(np.concatenate(frames), cv2.COLOR_BGR2GRAY)
+        return [
+            self.detect(grays[i * height:(i + 1) * height])
+            for i in range(len(frames))]
+
+    def detect(self, gray):
         faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
         result = []
         for (x, y, w, h) in faces:
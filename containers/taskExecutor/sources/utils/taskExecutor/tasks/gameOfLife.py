@@ -1,3 +1,7 @@
+from typing import Tuple
+
+import numpy as np
+
 from .base import BaseTask
 
 
@@ -8,80 +12,143 @@ class GameOfLife(BaseTask):
             taskName: str,
             focusArea):
         super().__init__(taskID=taskID, taskName=taskName)
-        self.world = None
+        # The focus area and a halo of one cell around it are kept across
+        # generations, the User only sends the cells flipped in the
+        # previous one
+        self.isStateful = True
+        self.tile = None
+        self.tileOrigin = (0, 0)
         self.height = None
         self.width = None
+        self.generation = None
         self.focusArea = focusArea
+        self.scaledFocusArea = focusArea
 
     def adjustFocusArea(self):
-
-        focusArea = [list(point) for point in self.focusArea]
-        for i in range(2):
-            for j in range(2):
-                focusArea[i][j] *= self.height // 32
-        self.focusArea = focusArea
+        # Scaled from the 32 rows the focus areas are written for, and cut
+        # at the edges of the world
+        scale = self.height // 32
+        (top, left), (bottom, right) = [
+            [coordinate * scale for coordinate in point]
+            for point in self.focusArea]
+        self.scaledFocusArea = [
+            [top, left],
+            [min(bottom, self.height - 1), min(right, self.width - 1)]]
 
     def exec(self, inputData):
-        self.world = inputData[0]
-        self.height = inputData[1]
-        self.width = inputData[2]
-        self.adjustFocusArea()
-        mayChange = inputData[3]
-        newStates = inputData[4]
-        mayChangeInNextRound = inputData[5]
-        for i, j in mayChange:
-            if not self.hitMyFocus(i, j):
-                continue
-            if self.doesChange(i, j):
-                newStates.update([(i, j)])
-                neighbours = self.affectedNeighbours(i, j)
-                mayChangeInNextRound.update(neighbours)
-
-        return self.world, self.height, self.width, mayChange, newStates, mayChangeInNextRound
-
-    def hitMyFocus(self, i, j) -> bool:
-        if i < self.focusArea[0][0]:
-            return False
-        if i > self.focusArea[1][0]:
-            return False
-        if j < self.focusArea[0][1]:
-            return False
-        if j > self.focusArea[1][1]:
-            return False
-        return True
-
-    def affectedNeighbours(self, i, j):
-        neighbours = set([])
+        # Cells are flat indices of the world. world is only sent for the
+        # first generation or when an executor has lost track, otherwise
+        # flipped holds the cells that changed in the previous generation.
+        # newStates gathers the cells that change in this generation, and
+        # is None once a task asks for the whole world
+        generation, height, width, world, flipped, newStates = inputData
+        if newStates is None:
+            return inputData
+        if world is not None:
+            self.height = height
+            self.width = width
+            self.adjustFocusArea()
+            self.keepTile(world.reshape(height, width))
+            rows, cols = self.focusCells()
+        elif self.tile is None or self.generation != generation - 1:
+            return generation, height, width, world, flipped, None
+        else:
+            rows, cols = self.cellsNearFocus(flipped)
+            self.flip(rows, cols)
+            rows, cols = self.affectedNeighbours(rows, cols)
+            rows, cols = self.hitMyFocus(rows, cols)
+        self.generation = generation
+        rows, cols = self.changedCells(rows, cols)
+        changed = (rows * self.width + cols).astype(np.uint32)
+        newStates = np.concatenate((newStates, changed))
+        return generation, height, width, world, flipped, newStates
+
+    @staticmethod
+    def spanAround(
+            first: int,
+            last: int,
+            size: int,
+            before: int,
+            after: int) -> Tuple[int, int]:
+        # Start and length of first..last widened on the torus, or the
+        # whole axis once the span would wrap onto itself
+        length = last - first + 1 + before + after
+        if length >= size:
+            return 0, size
+        return (first - before) % size, length
+
+    def tileSpans(self, before: int, after: int):
+        (top, left), (bottom, right) = self.scaledFocusArea
+        rowSpan = self.spanAround(top, bottom, self.height, before, after)
+        colSpan = self.spanAround(left, right, self.width, before, after)
+        return rowSpan, colSpan
+
+    def keepTile(self, world: np.ndarray):
+        (rowStart, rowLength), (colStart, colLength) = self.tileSpans(1, 1)
+        rows = (rowStart + np.arange(rowLength)) % self.height
+        cols = (colStart + np.arange(colLength)) % self.width
+        self.tile = world[np.ix_(rows, cols)]
+        self.tileOrigin = (rowStart, colStart)
+
+    def toTile(self, rows: np.ndarray, cols: np.ndarray):
+        return (rows - self.tileOrigin[0]) % self.height, \
+               (cols - self.tileOrigin[1]) % self.width
+
+    def cellsNearFocus(self, cells: np.ndarray):
+        # A flipped cell may change the cells from two before to one after
+        # it, so only flips from one before to two after the focus area
+        # matter
+        rows, cols = np.divmod(cells.astype(np.intp), self.width)
+        (rowStart, rowLength), (colStart, colLength) = self.tileSpans(1, 2)
+        isNear = ((rows - rowStart) % self.height < rowLength) \
+            & ((cols - colStart) % self.width < colLength)
+        return rows[isNear], cols[isNear]
+
+    def flip(self, rows: np.ndarray, cols: np.ndarray):
+        tileRows, tileCols = self.toTile(rows, cols)
+        isInTile = (tileRows < self.tile.shape[0]) \
+            & (tileCols < self.tile.shape[1])
+        tileRows = tileRows[isInTile]
+        tileCols = tileCols[isInTile]
+        self.tile[tileRows, tileCols] = np.where(
+            self.tile[tileRows, tileCols] == 0, 255, 0)
+
+    def focusCells(self):
+        (top, left), (bottom, right) = self.scaledFocusArea
+        rows = np.arange(top, bottom + 1)
+        cols = np.arange(left, right + 1)
+        rows, cols = np.meshgrid(rows, cols, indexing='ij')
+        return rows.reshape(-1), cols.reshape(-1)
+
+    def hitMyFocus(self, rows: np.ndarray, cols: np.ndarray):
+        (top, left), (bottom, right) = self.scaledFocusArea
+        hits = (rows >= top) & (rows <= bottom) \
+            & (cols >= left) & (cols <= right)
+        return rows[hits], cols[hits]
+
+    def changedCells(self, rows: np.ndarray, cols: np.ndarray):
+        # Neighbours of the focus area are inside the tile, which only
+        # wraps when it covers a whole axis of the world
+        tileRows, tileCols = self.toTile(rows, cols)
+        tileHeight, tileWidth = self.tile.shape
+        count = np.zeros(rows.shape, dtype=np.uint8)
+        for iOffset in (-1, 0, 1):
+            neighbourRows = (tileRows + iOffset) % tileHeight
+            for jOffset in (-1, 0, 1):
+                if not iOffset and not jOffset:
+                    continue
+                neighbourCols = (tileCols + jOffset) % tileWidth
+                count += self.tile[neighbourRows, neighbourCols] != 0
+        states = self.tile[tileRows, tileCols]
+        changes = np.where(count == 3, states != 255, states != 0)
+        changes &= count != 2
+        return rows[changes], cols[changes]
+
+    def affectedNeighbours(self, rows: np.ndarray, cols: np.ndarray):
+        # The 4x4 block from two cells before to one cell after each change
         wide = 2
-        for iNeighbour in range(i - wide, i + wide):
-            for jNeighbour in range(j - wide, j + wide):
-                neighbours.update(
-                    [(iNeighbour % self.height, jNeighbour % self.width)])
-        return neighbours
-
-    def doesChange(self, i, j) -> bool:
-        count = self.neighboursCount(i, j)
-        if count == 2:
-            return False
-        if count == 3:
-            return not self.world[i][j] == 255
-        return not self.world[i][j] == 0
-
-    def neighboursCount(self, i, j):
-        count = 0
-        neighbours = self.getNeighbours(i, j)
-        for i, j in neighbours:
-            count += 1 if self.world[i][j] else 0
-        return count
-
-    def getNeighbours(self, i, j):
-        neighbours = [
-            (i - 1, j - 1),
-            (i - 1, j),
-            (i - 1, (j + 1) % self.width),
-            (i, j - 1),
-            (i, (j + 1) % self.width),
-            ((i + 1) % self.height, j - 1),
-            ((i + 1) % self.height, j),
-            ((i + 1) % self.height, (j + 1) % self.width)]
-        return neighbours
+        offsets = np.arange(-wide, wide)
+        neighbourRows = (rows[:, None, None] + offsets[:, None]) % self.height
+        neighbourCols = (cols[:, None, None] + offsets) % self.width
+        indices = np.unique(neighbourRows * self.width + neighbourCols)
+        return np.divmod(indices, self.width)
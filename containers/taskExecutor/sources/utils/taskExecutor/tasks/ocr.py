@@ -10,6 +10,8 @@ class OCR(BaseTask):
         self.text = ''
         self.preText = None
         self.thresholdEditDistance = 800
+        self.isStateful = True
+        self.keepsFrameOrder = True
 
     def exec(self, inputData):
         (frame, isLastFrame) = inputData
@@ -30,6 +30,8 @@ class User:
             label: str,
             videoPath: str,
             golInitText: str,
+            inFlightWindow: int = 1,
+            frameDeadline: float = 0,
             containerName: str = '',
             logLevel=DEBUG):
         self.containerName = containerName
@@ -56,7 +58,8 @@ class User:
             videoPath=videoPath,
             showWindow=showWindow,
             basicComponent=self.basicComponent,
-            golInitText=golInitText)
+            golInitText=golInitText,
+            inFlightWindow=inFlightWindow)
         if self.actuator is None:
             self.basicComponent.debugLogger.error(
                 'Application is not supported: %s',
@@ -68,7 +71,8 @@ class User:
             containerManager=self.containerManager,
             basicComponent=self.basicComponent,
             actuator=self.actuator,
-            registrationManager=self.registrationManager)
+            registrationManager=self.registrationManager,
+            frameDeadline=frameDeadline)
         periodicTasks = self.preparePeriodTasks()
         self.periodicTaskRunner = PeriodicTaskRunner(
             basicComponent=self.basicComponent,
@@ -203,6 +207,20 @@ def parseArg():
         default='Qifan Deng',
         type=str,
         help='GameOfLife initial world text')
+    parser.add_argument(
+        '--inFlightWindow',
+        metavar='InFlightWindow',
+        nargs='?',
+        default=1,
+        type=int,
+        help='How many frames can wait for their results at the same time')
+    parser.add_argument(
+        '--frameDeadline',
+        metavar='FrameDeadline',
+        nargs='?',
+        default=0,
+        type=float,
+        help='Milliseconds after which TaskExecutors drop a frame, 0 for never')
     return parser.parse_args()
 
 
@@ -218,5 +236,7 @@ if __name__ == "__main__":
         showWindow=args.showWindow,
         videoPath=args.videoPath,
         golInitText=args.golInitText,
+        inFlightWindow=args.inFlightWindow,
+        frameDeadline=args.frameDeadline,
         logLevel=args.verbose)
     user_.run()
@@ -0,0 +1,54 @@
+from threading import Lock
+from typing import List
+
+
+class BufferPool:
+
+    def __init__(
+            self,
+            maxBuffers: int = 8,
+            maxBufferSize: int = 8 * 1024 * 1024,
+            minBufferSize: int = 4096):
+        self.maxBuffers = maxBuffers
+        self.maxBufferSize = maxBufferSize
+        self.minBufferSize = minBufferSize
+        self.buffers: List[bytearray] = []
+        self.lock: Lock = Lock()
+
+    def acquire(self, size: int) -> bytearray:
+        # The returned buffer may be larger than size
+        with self.lock:
+            bestIndex = None
+            for i, buffer in enumerate(self.buffers):
+                if len(buffer) < size:
+                    continue
+                if bestIndex is not None \
+                        and len(buffer) >= len(self.buffers[bestIndex]):
+                    continue
+                bestIndex = i
+            if bestIndex is not None:
+                return self.buffers.pop(bestIndex)
+        return bytearray(self.capacityOf(size))
+
+    def release(self, buffer: bytearray):
+        if len(buffer) > self.maxBufferSize:
+            return
+        with self.lock:
+            if len(self.buffers) < self.maxBuffers:
+                self.buffers.append(buffer)
+                return
+            # Keep the larger buffers, they can serve any smaller message
+            smallestIndex = min(
+                range(len(self.buffers)),
+                key=lambda i: len(self.buffers[i]))
+            if len(self.buffers[smallestIndex]) < len(buffer):
+                self.buffers[smallestIndex] = buffer
+
+    def capacityOf(self, size: int) -> int:
+        # Rounded up to a power of two so that similar sizes share buffers
+        if size > self.maxBufferSize:
+            return size
+        capacity = self.minBufferSize
+        while capacity < size:
+            capacity <<= 1
+        return capacity
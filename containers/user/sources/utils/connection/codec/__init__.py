@@ -0,0 +1,11 @@
+from .base import Buffer
+from .base import Codec
+from .getCodec import getCodec
+from .header import HEADER_SIZE
+from .header import packHeader
+from .header import unpackHeader
+from .messagePackCodec import MessagePackCodec
+from .pickleCodec import PickleCodec
+from .pickleOutOfBandCodec import PickleOutOfBandCodec
+from .sharedMemoryCodec import SharedMemoryCodec
+from .type import CodecType
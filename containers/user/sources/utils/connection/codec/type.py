@@ -0,0 +1,12 @@
+from enum import Enum
+from enum import unique
+
+
+@unique
+class CodecType(Enum):
+    # Stored in the top bits of the frame header, at most 16 codecs.
+    # 0 is what peers sending plain pickle have always written
+    PICKLE = 0
+    MESSAGE_PACK = 1
+    PICKLE_OUT_OF_BAND = 2
+    SHARED_MEMORY = 3
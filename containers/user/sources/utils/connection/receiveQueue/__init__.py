@@ -0,0 +1,4 @@
+from .dropPolicy import DropPolicy
+from .messagePriority import MessagePriority
+from .receivedMessagesQueue import QueuePolicy
+from .receivedMessagesQueue import ReceivedMessagesQueue
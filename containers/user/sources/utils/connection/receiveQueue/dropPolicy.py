@@ -0,0 +1,12 @@
+from enum import Enum
+from enum import unique
+
+
+@unique
+class DropPolicy(Enum):
+    # Lossless, the receiver stops reading until handlers catch up
+    BLOCK = 'block'
+    # Keep the newest messages, for frames that go stale
+    DROP_OLDEST = 'dropOldest'
+    # Keep the messages that are already queued
+    DROP_NEWEST = 'dropNewest'
@@ -0,0 +1,10 @@
+from enum import Enum
+from enum import unique
+
+
+@unique
+class MessagePriority(Enum):
+    # Registration, placement, acknowledgement, termination and discovery
+    CONTROL = 'control'
+    PROFILING = 'profiling'
+    DATA = 'data'
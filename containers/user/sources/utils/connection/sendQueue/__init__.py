@@ -0,0 +1,4 @@
+from .circuitBreaker import CircuitBreaker
+from .circuitState import CircuitState
+from .destinationQueue import DestinationQueue
+from .destinationQueue import MessageToSendItem
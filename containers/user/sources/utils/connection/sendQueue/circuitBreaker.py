@@ -0,0 +1,58 @@
+from threading import Lock
+from time import time
+
+from .circuitState import CircuitState
+
+
+class CircuitBreaker:
+
+    def __init__(
+            self,
+            failureThreshold: int = 3,
+            openTimeout: float = 0.5,
+            maxOpenTimeout: float = 30):
+        self.failureThreshold = failureThreshold
+        self.openTimeout = openTimeout
+        self.maxOpenTimeout = maxOpenTimeout
+        self.state: CircuitState = CircuitState.CLOSED
+        self.consecutiveFailures: int = 0
+        self.openUntil: float = .0
+        self.lock: Lock = Lock()
+
+    def allowRequest(self) -> bool:
+        with self.lock:
+            if self.state is CircuitState.CLOSED:
+                return True
+            if self.state is CircuitState.HALF_OPEN:
+                return False
+            if time() < self.openUntil:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            return True
+
+    def recordSuccess(self):
+        with self.lock:
+            self.state = CircuitState.CLOSED
+            self.consecutiveFailures = 0
+
+    def recordFailure(self):
+        with self.lock:
+            self.consecutiveFailures += 1
+            if self.state is CircuitState.CLOSED \
+                    and self.consecutiveFailures < self.failureThreshold:
+                return
+            # Backs off exponentially while the destination stays down
+            exponent = self.consecutiveFailures - self.failureThreshold
+            timeout = self.openTimeout * 2 ** min(exponent, 16)
+            self.openUntil = time() + min(timeout, self.maxOpenTimeout)
+            self.state = CircuitState.OPEN
+
+    def remainingOpenTime(self) -> float:
+        with self.lock:
+            if self.state is CircuitState.CLOSED:
+                return .0
+            # The outcome of the trial message is looked at again later
+            # rather than right away
+            if self.state is CircuitState.HALF_OPEN:
+                return self.openTimeout
+            return max(self.openUntil - time(), .0)
@@ -0,0 +1,92 @@
+import unittest
+from threading import Timer
+from time import sleep
+from time import time
+
+from .circuitBreaker import CircuitBreaker
+from .circuitState import CircuitState
+from .destinationQueue import DestinationQueue
+from ..message import MessageToSend
+from ...types import Component
+from ...types import MessageType
+
+
+def itemOf(i: int):
+    messageToSend = MessageToSend(
+        messageType=MessageType.DATA,
+        data={'i': i},
+        destination=Component(addr=('127.0.0.1', 1)))
+    return messageToSend, True, False
+
+
+class MyTestCase(unittest.TestCase):
+
+    def testOpensAfterThreshold(self):
+        circuitBreaker = CircuitBreaker(failureThreshold=3, openTimeout=0.1)
+        for _ in range(2):
+            circuitBreaker.recordFailure()
+            self.assertIs(circuitBreaker.state, CircuitState.CLOSED)
+            self.assertTrue(circuitBreaker.allowRequest())
+        circuitBreaker.recordFailure()
+        self.assertIs(circuitBreaker.state, CircuitState.OPEN)
+        self.assertFalse(circuitBreaker.allowRequest())
+        self.assertGreater(circuitBreaker.remainingOpenTime(), 0)
+
+    def testHalfOpenAllowsOneTrial(self):
+        circuitBreaker = CircuitBreaker(failureThreshold=1, openTimeout=0.05)
+        circuitBreaker.recordFailure()
+        sleep(0.06)
+        self.assertTrue(circuitBreaker.allowRequest())
+        self.assertIs(circuitBreaker.state, CircuitState.HALF_OPEN)
+        self.assertFalse(circuitBreaker.allowRequest())
+        # Looked at again later while the trial is out
+        self.assertGreater(circuitBreaker.remainingOpenTime(), 0)
+        circuitBreaker.recordSuccess()
+        self.assertIs(circuitBreaker.state, CircuitState.CLOSED)
+        self.assertTrue(circuitBreaker.allowRequest())
+
+    def testFailedTrialBacksOff(self):
+        circuitBreaker = CircuitBreaker(
+            failureThreshold=1, openTimeout=0.05, maxOpenTimeout=0.15)
+        circuitBreaker.recordFailure()
+        firstTimeout = circuitBreaker.remainingOpenTime()
+        sleep(0.06)
+        self.assertTrue(circuitBreaker.allowRequest())
+        circuitBreaker.recordFailure()
+        self.assertIs(circuitBreaker.state, CircuitState.OPEN)
+        self.assertGreater(circuitBreaker.remainingOpenTime(), firstTimeout)
+        for _ in range(8):
+            circuitBreaker.recordFailure()
+        self.assertLessEqual(circuitBreaker.remainingOpenTime(), 0.15)
+
+    def testDropsOldestWhilePeerIsDown(self):
+        destinationQueue = DestinationQueue(('127.0.0.1', 1), maxSize=4)
+        for _ in range(3):
+            destinationQueue.recordFailure()
+        for i in range(10):
+            destinationQueue.put(itemOf(i))
+        status = destinationQueue.status()
+        self.assertEqual(status['depth'], 4)
+        self.assertEqual(status['dropped'], 6)
+        self.assertEqual(destinationQueue.get()[0].data['i'], 6)
+
+    def testProducerWaitsForHealthyPeer(self):
+        destinationQueue = DestinationQueue(
+            ('127.0.0.1', 1), maxSize=2, maxWait=1)
+        destinationQueue.put(itemOf(0))
+        destinationQueue.put(itemOf(1))
+        Timer(0.1, destinationQueue.get).start()
+        startTime = time()
+        destinationQueue.put(itemOf(2))
+        self.assertGreaterEqual(time() - startTime, 0.05)
+        self.assertEqual(destinationQueue.status()['overflow'], 0)
+        # Threads that drain queues never wait
+        startTime = time()
+        destinationQueue.put(itemOf(3), block=False)
+        self.assertLess(time() - startTime, 0.05)
+        self.assertEqual(destinationQueue.status()['overflow'], 1)
+        self.assertEqual(destinationQueue.status()['depth'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
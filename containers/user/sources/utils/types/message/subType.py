@@ -45,3 +45,7 @@ class MessageSubType(Enum):
     PROBE = 'probe'
     NO_ACTOR = 'noActor'
     PROFILES = 'profiles'
+    BACKPRESSURE = 'backpressure'
+    ENTRY_TASK_EXECUTORS = 'entryTaskExecutors'
+    SHED_FRAMES = 'shedFrames'
+    SHARED_MEMORY = 'sharedMemory'
@@ -1,9 +1,14 @@
 import threading
 from abc import abstractmethod
+from collections import OrderedDict
+from queue import Empty
 from queue import Queue
 from threading import Event
+from threading import Lock
 from time import time
 from typing import Any
+from typing import Dict
+from typing import Optional
 from typing import Tuple
 
 import cv2
@@ -21,7 +26,8 @@ class ApplicationUserSide:
             videoPath: str = None,
             targetHeight: int = 640,
             showWindow: bool = True,
-            pressSpaceToStart: bool = False):
+            pressSpaceToStart: bool = False,
+            inFlightWindow: int = 1):
         self.pressSpaceToStart = pressSpaceToStart
         self.basicComponent = basicComponent
         self.appName = appName
@@ -49,6 +55,19 @@ class ApplicationUserSide:
         if not self.pressSpaceToStart:
             self.canStart.set()
         self.startTime = time() * 1000
+        self.inFlightWindow = max(inFlightWindow, 1)
+        self.nextSequenceNumber = 0
+        self.sequenceLock: Lock = Lock()
+        # Submitted time of the frames in the window, oldest first
+        self.framesInFlight: OrderedDict[int, float] = OrderedDict()
+        # Results of frames, or None with no response time for frames that
+        # got none
+        self.reorderBuffer: Dict[int, Tuple[Any, Optional[float]]] = {}
+        self.reorderLock: Lock = Lock()
+        self.isFramed: bool = False
+        # Seconds to wait for the result of a frame before skipping it
+        self.resultTimeout: float = 5
+        self.skippedCount: int = 0
 
     def resizeFrame(self, frame):
         width = frame.shape[1]
@@ -56,6 +75,89 @@ class ApplicationUserSide:
         resizedWidth = int(width * self.targetHeight / height)
         return cv2.resize(frame, (resizedWidth, self.targetHeight))
 
+    def submit(self, data: Any, isFrame: bool = False) -> int:
+        # Only frames may be shed once their deadline has passed, other
+        # inputs, e.g. the last one of a stream, always run
+        with self.sequenceLock:
+            sequenceNumber = self.nextSequenceNumber
+            self.nextSequenceNumber += 1
+        self.dataToSubmit.put((sequenceNumber, data, isFrame))
+        return sequenceNumber
+
+    def submitFrame(self, data: Any) -> int:
+        # Apps keep at most inFlightWindow frames in flight and get their
+        # results with nextFrameResult in the submitted order
+        with self.reorderLock:
+            self.isFramed = True
+            sequenceNumber = self.submit(data, isFrame=True)
+            self.framesInFlight[sequenceNumber] = time()
+        return sequenceNumber
+
+    def nextFrameResult(self) -> Any:
+        # None for a frame that got no result, e.g. a TaskExecutor shed it
+        # or it did not come back within resultTimeout
+        while True:
+            try:
+                result, responseTime = self.resultForActuator.get(
+                    timeout=self.timeUntilOverdue())
+                break
+            except Empty:
+                self.skipOverdueFrame()
+        if responseTime is None:
+            return None
+        self.responseTime.update(responseTime)
+        self.responseTimeCount += 1
+        return result
+
+    def timeUntilOverdue(self) -> Optional[float]:
+        with self.reorderLock:
+            if not len(self.framesInFlight):
+                return None
+            submittedTime = next(iter(self.framesInFlight.values()))
+        return max(submittedTime + self.resultTimeout - time(), .0)
+
+    def skipOverdueFrame(self):
+        with self.reorderLock:
+            if not len(self.framesInFlight):
+                return
+            oldest, submittedTime = next(iter(self.framesInFlight.items()))
+            if time() - submittedTime < self.resultTimeout:
+                return
+            self.reorderBuffer.setdefault(oldest, (None, None))
+            self.releaseInOrder()
+
+    def putResult(self, sequenceNumber: Optional[int], result: Any):
+        with self.reorderLock:
+            if sequenceNumber not in self.framesInFlight:
+                if self.isFramed:
+                    # Its frame has been skipped already
+                    return
+                self.resultForActuator.put(result)
+                return
+            submittedTime = self.framesInFlight[sequenceNumber]
+            responseTime = (time() - submittedTime) * 1000
+            self.reorderBuffer[sequenceNumber] = (result, responseTime)
+            self.releaseInOrder()
+
+    def skipResult(self, sequenceNumber: Optional[int]):
+        # Frees the place of a frame that will get no result
+        with self.reorderLock:
+            if sequenceNumber not in self.framesInFlight:
+                return
+            self.reorderBuffer.setdefault(sequenceNumber, (None, None))
+            self.releaseInOrder()
+
+    def releaseInOrder(self):
+        while len(self.framesInFlight):
+            oldest = next(iter(self.framesInFlight))
+            if oldest not in self.reorderBuffer:
+                break
+            del self.framesInFlight[oldest]
+            released = self.reorderBuffer.pop(oldest)
+            if released[1] is None:
+                self.skippedCount += 1
+            self.resultForActuator.put(released)
+
     def start(self):
         threading.Thread(target=self._run).start()
 
@@ -1,5 +1,4 @@
 from random import randint
-from time import time
 
 import cv2
 import numpy as np
@@ -19,13 +18,15 @@ class ColorTracking(ApplicationUserSide):
             videoPath: str,
             targetHeight: int,
             showWindow: bool,
-            basicComponent: BasicComponent):
+            basicComponent: BasicComponent,
+            inFlightWindow: int = 1):
         super().__init__(
             appName='ColorTracking',
             videoPath=videoPath,
             targetHeight=targetHeight,
             showWindow=showWindow,
-            basicComponent=basicComponent)
+            basicComponent=basicComponent,
+            inFlightWindow=inFlightWindow)
 
     def prepare(self):
         if self.showWindow:
@@ -46,6 +47,7 @@ class ColorTracking(ApplicationUserSide):
     def _run(self):
         self.basicComponent.debugLogger.info(
             'Application is running: %s', self.appName)
+        framesInFlight = 0
         while True:
             ret, frame = self.sensor.read()
             if not ret:
@@ -84,16 +86,22 @@ class ColorTracking(ApplicationUserSide):
                          Lv, Uv,
                          l_b, u_b,
                          l_b2, u_b2)
-            self.dataToSubmit.put(inputData)
-            lastDataSentTime = time()
-            resultData = self.resultForActuator.get()
-            responseTime = (time() - lastDataSentTime) * 1000
-            self.responseTime.update(responseTime)
-            self.responseTimeCount += 1
-            (FGmaskComp, frame) = resultData
-
-            if not self.showWindow:
-                return
-            self.windowFrameQueue.put(('FGmaskComp', FGmaskComp))
-            self.windowFrameQueue.put(('nanoCam', frame))
+            self.submitFrame(inputData)
+            framesInFlight += 1
+            if framesInFlight < self.inFlightWindow:
+                continue
+            framesInFlight -= 1
+            self.showResult(self.nextFrameResult())
+        for _ in range(framesInFlight):
+            self.showResult(self.nextFrameResult())
         self.sensor.release()
+
+    def showResult(self, resultData):
+        if resultData is None:
+            # The frame got no result
+            return
+        (FGmaskComp, frame) = resultData
+        if not self.showWindow:
+            return
+        self.windowFrameQueue.put(('FGmaskComp', FGmaskComp))
+        self.windowFrameQueue.put(('nanoCam', frame))
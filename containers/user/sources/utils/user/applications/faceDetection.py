@@ -1,3 +1,4 @@
+from collections import deque
 from time import sleep
 from time import time
 
@@ -14,13 +15,15 @@ class FaceDetection(ApplicationUserSide):
             videoPath: str,
             targetHeight: int,
             showWindow: bool,
-            basicComponent: BasicComponent):
+            basicComponent: BasicComponent,
+            inFlightWindow: int = 1):
         super().__init__(
             appName='FaceDetection',
             videoPath=videoPath,
             targetHeight=targetHeight,
             showWindow=showWindow,
-            basicComponent=basicComponent)
+            basicComponent=basicComponent,
+            inFlightWindow=inFlightWindow)
 
     def prepare(self):
         pass
@@ -29,30 +32,37 @@ class FaceDetection(ApplicationUserSide):
         self.basicComponent.debugLogger.info(
             'Application is running: %s', self.appName)
         lastReadTime = 0
+        framesInFlight = deque()
         while True:
             ret, frame = self.sensor.read()
             if not ret:
                 break
             currentTime = time()
             frame = self.resizeFrame(frame)
-            self.dataToSubmit.put(frame)
-            lastDataSentTime = time()
-            faces = self.resultForActuator.get()
-            responseTime = (time() - lastDataSentTime) * 1000
-            self.responseTime.update(responseTime)
-            self.responseTimeCount += 1
-            for (x, y, w, h, roi_gray) in faces:
-                cv2.rectangle(
-                    frame,
-                    (x, y),
-                    (x + w, y + h),
-                    (255, 0, 0),
-                    2)
+            self.submitFrame(frame)
+            framesInFlight.append(frame)
             toSleep = currentTime - lastReadTime
             lastReadTime = currentTime
             if toSleep < self.interval:
                 sleep(toSleep)
-            if not self.showWindow:
+            if len(framesInFlight) < self.inFlightWindow:
                 continue
-            self.windowFrameQueue.put(('FaceDetection', frame))
+            self.showFaces(framesInFlight.popleft(), self.nextFrameResult())
+        while len(framesInFlight):
+            self.showFaces(framesInFlight.popleft(), self.nextFrameResult())
         self.sensor.release()
+
+    def showFaces(self, frame, faces):
+        if faces is None:
+            # The frame got no result
+            faces = []
+        for (x, y, w, h, roi_gray) in faces:
+            cv2.rectangle(
+                frame,
+                (x, y),
+                (x + w, y + h),
+                (255, 0, 0),
+                2)
+        if not self.showWindow:
+            return
+        self.windowFrameQueue.put(('FaceDetection', frame))
@@ -1,4 +1,5 @@
 from time import time
+from typing import Optional
 
 import cv2
 import numpy as np
@@ -31,25 +32,30 @@ class GameOfLifeSerialized(ApplicationUserSide):
         self.width = t * 2 // self._resizeFactor
         self.generationNumber = None
         self.world = np.zeros((self.height, self.width, 1), np.uint8)
-        self.newStates = set([])
+        # Flat indices of the cells flipped in the previous generation
+        self.flipped = np.empty(0, dtype=np.uint32)
+        self.isWorldSent = False
+        # Which cells the results of this generation have reported, and
+        # a position of each cell in the result being merged
+        self.isReported = np.zeros(self.height * self.width, dtype=bool)
+        self.positionInResult = np.zeros(
+            self.height * self.width, dtype=np.intp)
         self.frameUpdateGap = 1 / 60
-        self.mayChange = set([])
         self.golInitText = golInitText
+        self.resCountThreshold = 1
 
     def prepare(self):
         pass
 
     def show(self, gen: int):
-        if self._resizeFactor != 1:
-            showWorld = cv2.resize(
-                self.world,
-                (self.width * self._resizeFactor,
-                 self.height * self._resizeFactor),
-                interpolation=cv2.INTER_AREA)
-        else:
-            showWorld = self.world
-
         if self.showWindow:
+            showWorld = self.world
+            if self._resizeFactor != 1:
+                showWorld = cv2.resize(
+                    self.world,
+                    (self.width * self._resizeFactor,
+                     self.height * self._resizeFactor),
+                    interpolation=cv2.INTER_AREA)
             self.windowFrameQueue.put((self.appName, showWorld))
         self.basicComponent.debugLogger.info('[*] Generation %d' % gen)
 
@@ -70,22 +76,58 @@ class GameOfLifeSerialized(ApplicationUserSide):
         while True:
             gen += 1
             self.show(gen)
-            inputData = (
-                self.world,
-                self.height,
-                self.width,
-                self.mayChange,
-                set([]),
-                set([]))
-            self.dataToSubmit.put(inputData)
             lastDataSentTime = time()
-            result = self.resultForActuator.get()
+            newStates = self.runGeneration(gen)
+            while newStates is None:
+                # An executor has lost track of the world, so all of them
+                # run this generation again from the whole world
+                self.isWorldSent = False
+                newStates = self.runGeneration(gen)
             responseTime = (time() - lastDataSentTime) * 1000
             self.responseTime.update(responseTime)
             self.responseTimeCount += 1
-            self.newStates.update(result[4])
-            self.mayChange.update(result[5])
-            self.changeStates()
+            self.changeStates(newStates)
+
+    def runGeneration(self, gen: int) -> Optional[np.ndarray]:
+        # Executors keep the world, so it is only sent once
+        world = None
+        if not self.isWorldSent:
+            world = self.world
+            self.isWorldSent = True
+        inputData = (
+            gen,
+            self.height,
+            self.width,
+            world,
+            self.flipped,
+            np.empty(0, dtype=np.uint32))
+        self.submit(inputData)
+        # Results are merged while the others are still on their way
+        newStatesList = [np.empty(0, dtype=np.uint32)]
+        isComplete = True
+        for _ in range(self.resCountThreshold):
+            result = self.resultForActuator.get()
+            if result[5] is None:
+                isComplete = False
+                continue
+            newStatesList.append(self.newlyReported(result[5]))
+        newStates = np.concatenate(newStatesList)
+        self.isReported[newStates] = False
+        if not isComplete:
+            return None
+        return newStates
+
+    def newlyReported(self, cells: np.ndarray) -> np.ndarray:
+        # Overlapping focus areas and pyramid levels report a cell more
+        # than once. Only the copy whose position a cell ends up holding is
+        # kept, which avoids sorting them
+        positions = np.arange(cells.shape[0])
+        self.positionInResult[cells] = positions
+        isNew = self.positionInResult[cells] == positions
+        isNew &= ~self.isReported[cells]
+        cells = cells[isNew]
+        self.isReported[cells] = True
+        return cells
 
     def startWithText(self):
         text = self.golInitText
@@ -103,7 +145,6 @@ class GameOfLifeSerialized(ApplicationUserSide):
             1,
             cv2.LINE_AA)
         _, self.world = cv2.threshold(world, 127, 255, cv2.THRESH_BINARY)
-        self.initMayChange(theWholeWorld=True)
         if self.showWindow:
             frame = cv2.resize(
                 self.world,
@@ -112,58 +153,7 @@ class GameOfLifeSerialized(ApplicationUserSide):
                 interpolation=cv2.INTER_AREA)
             self.windowFrameQueue.put((self.appName, frame))
 
-    def initMayChange(self, theWholeWorld=False):
-        self.mayChange = set([])
-        for i in range(0, self.height):
-            for j in range(0, self.width):
-                if theWholeWorld:
-                    self.mayChange.update([(i, j)])
-                    continue
-                if not self.doesChange(i, j):
-                    continue
-                neighbours = self.affectedNeighbours(i, j)
-                self.mayChange.update(neighbours)
-
-    def doesChange(self, i, j) -> bool:
-        count = self.neighboursCount(i, j)
-        if count == 2:
-            return False
-        if count == 3:
-            return not self.world[i][j] == 255
-        return not self.world[i][j] == 0
-
-    def neighboursCount(self, i, j):
-        count = 0
-        neighbours = self.getNeighbours(i, j)
-        for i, j in neighbours:
-            count += 1 if self.world[i][j] else 0
-        return count
-
-    def getNeighbours(self, i, j):
-        neighbours = [
-            (i - 1, j - 1),
-            (i - 1, j),
-            (i - 1, (j + 1) % self.width),
-            (i, j - 1),
-            (i, (j + 1) % self.width),
-            ((i + 1) % self.height, j - 1),
-            ((i + 1) % self.height, j),
-            ((i + 1) % self.height, (j + 1) % self.width)]
-        return neighbours
-
-    def affectedNeighbours(self, i, j):
-        neighbours = set([])
-        wide = 2
-        for iNeighbour in range(i - wide, i + wide):
-            for jNeighbour in range(j - wide, j + wide):
-                neighbours.update(
-                    [(iNeighbour % self.height, jNeighbour % self.width)])
-        return neighbours
-
-    def changeStates(self):
-        for i, j in self.newStates:
-            if self.world[i][j] == 0:
-                self.world[i][j] = 255
-                continue
-            self.world[i][j] = 0
-        self.newStates = set([])
+    def changeStates(self, newStates: np.ndarray):
+        world = self.world.reshape(-1)
+        world[newStates] = np.where(world[newStates] == 0, 255, 0)
+        self.flipped = newStates
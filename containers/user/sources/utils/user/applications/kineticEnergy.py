@@ -32,7 +32,7 @@ class KineticEnergy(ApplicationUserSide):
             'v0': v0,
             'v1': v1
         }
-        self.dataToSubmit.put(inputData)
+        self.submit(inputData)
         lastDataSentTime = time()
         self.basicComponent.debugLogger.info(
             'Data has sent (m, v0, v1): %f.2, %f.2, %f.2', m, v0, v1)
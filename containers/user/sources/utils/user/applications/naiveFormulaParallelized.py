@@ -41,7 +41,7 @@ class NaiveFormulaParallelized(ApplicationUserSide):
         }
 
         # put it in to data uploading queue
-        self.dataToSubmit.put(inputData)
+        self.submit(inputData)
         lastDataSentTime = time()
         self.basicComponent.debugLogger.info(
             'Data has sent (a, b, c): %.2f, %.2f, %.2f', a, b, c)
@@ -40,9 +40,9 @@ class VideoOCR(ApplicationUserSide):
                 break
             frame = self.resizeFrame(frame)
             inputData = (frame, False)
-            self.dataToSubmit.put(inputData)
+            self.submit(inputData)
         inputData = (None, True)
-        self.dataToSubmit.put(inputData)
+        self.submit(inputData)
         self.basicComponent.debugLogger.info(
             "[*] Sent all the frames and waiting for result ...")
 
@@ -4,6 +4,7 @@ from pprint import pformat
 from threading import Thread
 from time import sleep
 from time import time
+from typing import List
 
 from ..applications.base import ApplicationUserSide
 from ..registration.manager import RegistrationManager
@@ -12,6 +13,7 @@ from ...connection.message.received import MessageReceived
 from ...container.manager import ContainerManager
 from ...resourceDiscovery.resourceDiscovery import ResourcesDiscovery
 from ...tools.terminate import terminate
+from ...types import Component
 from ...types import ComponentRole
 from ...types import MessageSubType
 from ...types import MessageType
@@ -24,7 +26,8 @@ class UserMessageHandler:
             containerManager: ContainerManager,
             basicComponent: BasicComponent,
             actuator: ApplicationUserSide,
-            registrationManager: RegistrationManager):
+            registrationManager: RegistrationManager,
+            frameDeadline: float = 0):
 
         self.resourcesDiscovery = resourcesDiscovery
         self.registrationManager = registrationManager
@@ -34,6 +37,11 @@ class UserMessageHandler:
         self.basicComponent.handleMessage = self.handleMessage
         self.lastDataSentTime = 0
         self.registerTime = 0
+        self.entryTaskExecutors: List[Component] = []
+        # Milliseconds for a frame to get through the TaskExecutors, 0 for
+        # no limit
+        self.frameDeadline = frameDeadline
+        self.isLastFrameThrottled = False
 
     def handleMessage(self, message: MessageReceived):
         if message.typeIs(
@@ -43,7 +51,11 @@ class UserMessageHandler:
         elif message.typeIs(
                 messageType=MessageType.ACKNOWLEDGEMENT,
                 messageSubType=MessageSubType.SERVICE_READY):
-            self.handleReady()
+            self.handleReady(message=message)
+        elif message.typeIs(
+                messageType=MessageType.PLACEMENT,
+                messageSubType=MessageSubType.ENTRY_TASK_EXECUTORS):
+            self.handleEntryTaskExecutors(message=message)
         elif message.typeIs(
                 messageType=MessageType.DATA,
                 messageSubType=MessageSubType.FINAL_RESULT):
@@ -76,7 +88,8 @@ class UserMessageHandler:
             'ResponseTime': '%.2f ms' % self.actuator.responseTime.median(),
             'RanTime': '%d hours, %d mins, %.1f secs' % (
                 hours, minutes, seconds),
-            'PacketSize': int(packetSize)}
+            'PacketSize': int(packetSize),
+            'SkippedFrames': self.actuator.skippedCount}
         self.basicComponent.debugLogger.info(
             '\n========== Application Summary ==========\n'
             '%s'
@@ -116,7 +129,7 @@ class UserMessageHandler:
         f.close()
         terminate()
 
-    def handleReady(self):
+    def handleReady(self, message: MessageReceived):
         # self.basicComponent.debugLogger.info(
         #     'RRT: %f', time() * 1000 - self.registerTime)
         # import os
@@ -128,12 +141,26 @@ class UserMessageHandler:
         #     destination=self.basicComponent.master)
         # sleep(5)
         # os._exit(0)
+        self.handleEntryTaskExecutors(message=message)
         Thread(target=self.ready, name='Actuator').start()
 
+    def handleEntryTaskExecutors(self, message: MessageReceived):
+        # Without any address the sensory data is relayed by the Master
+        addresses = message.data.get('entryTaskExecutors', [])
+        self.entryTaskExecutors = [
+            Component(addr=(addr[0], addr[1])) for addr in addresses]
+
     def handleResult(self, message: MessageReceived):
 
-        result = message.data['finalResult']
-        self.actuator.resultForActuator.put(result)
+        data = message.data
+        # Frames TaskExecutors got no result for
+        for sequenceNumber in data.get('skippedSequenceNumbers', []):
+            self.actuator.skipResult(sequenceNumber)
+        if 'finalResult' not in data:
+            return
+        self.actuator.putResult(
+            sequenceNumber=data.get('sequenceNumber'),
+            result=data['finalResult'])
         # self.saveResponseTime()
 
     def handleActorsCount(self, message: MessageReceived):
@@ -175,16 +202,53 @@ class UserMessageHandler:
         self.actuator.start()
 
         while True:
+            # Results carry the sequence number back whichever path they take
+            sequenceNumber, sensoryData, isFrame = \
+                self.actuator.dataToSubmit.get()
+            entryTaskExecutors = self.entryTaskExecutors
+            if not len(entryTaskExecutors):
+                # Relay through the Master
+                data = {
+                    'userID': self.basicComponent.componentID,
+                    'sequenceNumber': sequenceNumber,
+                    'sensoryData': sensoryData}
+                if isFrame and self.frameDeadline > 0:
+                    data['timeBudget'] = self.frameDeadline
+                self.basicComponent.sendMessage(
+                    messageType=MessageType.DATA,
+                    messageSubType=MessageSubType.SENSORY_DATA,
+                    data=data,
+                    destination=self.basicComponent.master)
+                self.lastDataSentTime = time() * 1000
+                continue
+            if isFrame and self.isThrottled(entryTaskExecutors):
+                self.actuator.skipResult(sequenceNumber)
+                continue
             data = {
                 'userID': self.basicComponent.componentID,
-                'sensoryData': self.actuator.dataToSubmit.get()}
-            self.basicComponent.sendMessage(
+                'sequenceNumber': sequenceNumber,
+                'intermediateData': sensoryData}
+            if isFrame and self.frameDeadline > 0:
+                data['timeBudget'] = self.frameDeadline
+            self.basicComponent.multicastMessage(
                 messageType=MessageType.DATA,
-                messageSubType=MessageSubType.SENSORY_DATA,
+                messageSubType=MessageSubType.INTERMEDIATE_DATA,
                 data=data,
-                destination=self.basicComponent.master)
+                destinations=entryTaskExecutors)
             self.lastDataSentTime = time() * 1000
 
+    def isThrottled(self, destinations: List[Component]) -> bool:
+        # Every other frame is skipped while an entry TaskExecutor drops
+        # frames from this User
+        isBackpressured = any(
+            self.basicComponent.isBackpressured(destination)
+            for destination in destinations)
+        if not isBackpressured:
+            self.isLastFrameThrottled = False
+            return False
+        self.isLastFrameThrottled = not self.isLastFrameThrottled
+        return self.isLastFrameThrottled
+
     def saveResponseTime(self):
         if self.actuator.responseTimeCount < 7:
             return
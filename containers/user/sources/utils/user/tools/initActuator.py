@@ -19,26 +19,30 @@ def initActuator(
         label: str,
         showWindow: bool,
         basicComponent: BasicComponent,
-        golInitText: str) -> Union[ApplicationUserSide, None]:
+        golInitText: str,
+        inFlightWindow: int = 1) -> Union[ApplicationUserSide, None]:
     actuator = None
     if appName == 'FaceDetection':
         actuator = FaceDetection(
             videoPath=videoPath,
             targetHeight=int(label),
             showWindow=showWindow,
-            basicComponent=basicComponent)
+            basicComponent=basicComponent,
+            inFlightWindow=inFlightWindow)
     elif appName == 'FaceAndEyeDetection':
         actuator = FaceAndEyeDetection(
             videoPath=videoPath,
             targetHeight=int(label),
             showWindow=showWindow,
-            basicComponent=basicComponent)
+            basicComponent=basicComponent,
+            inFlightWindow=inFlightWindow)
     elif appName == 'ColorTracking':
         actuator = ColorTracking(
             videoPath=videoPath,
             targetHeight=int(label),
             showWindow=showWindow,
-            basicComponent=basicComponent)
+            basicComponent=basicComponent,
+            inFlightWindow=inFlightWindow)
     elif appName == 'VideoOCR':
         actuator = VideoOCR(
             videoPath=videoPath,